@@ -1,6 +1,7 @@
 """Bootstrap entry point for PyInstaller builds."""
 from __future__ import annotations
 
+import multiprocessing
 import os
 import sys
 
@@ -15,4 +16,6 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    # Batch curriculum import parses files in worker processes.
+    multiprocessing.freeze_support()
     raise SystemExit(main())
@@ -60,6 +60,7 @@ def main() -> int:
         bootstrap_settings.setValue("app/db_path", make_relative_to_app(resolved_db))
         bootstrap_settings.sync()
     database = Database(str(resolved_db) if resolved_db and str(resolved_db) else None)
+    app.aboutToQuit.connect(database.close)
     FileStorageManager().migrate_legacy_materials(database)
     controller = MainController(database)
     window = MainWindow(controller, i18n, settings)
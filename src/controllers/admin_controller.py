@@ -1,5 +1,6 @@
 """Admin controller for managing data and relationships."""
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
 import sqlite3
 from ..models.database import Database
 from ..models.entities import (
@@ -26,6 +27,24 @@ from ..services.file_storage import FileStorageManager, StorageScopeError
 from ..services.auth_service import AuthService
 
 
+CHANGE_CREATED = "created"
+CHANGE_UPDATED = "updated"
+CHANGE_DELETED = "deleted"
+# Child links of the entity were added, removed or reordered.
+CHANGE_CHILDREN = "children"
+# Bulk change that listeners should handle with a full reload.
+CHANGE_RESET = "reset"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A single mutation made through AdminController."""
+
+    entity_type: str
+    entity_id: Optional[int]
+    op: str
+
+
 class AdminController:
     """Coordinates admin operations with repositories and services."""
 
@@ -42,6 +61,32 @@ class AdminController:
         self.material_type_repo = MaterialTypeRepository(database)
         self.file_storage = FileStorageManager()
         self.auth_service = AuthService()
+        self._change_listeners: List[Callable[[ChangeEvent], None]] = []
+
+    def add_change_listener(self, listener: Callable[[ChangeEvent], None]) -> None:
+        """Call ``listener`` with a ChangeEvent after every mutation."""
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[ChangeEvent], None]) -> None:
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _emit(self, entity_type: str, entity_id: Optional[int], op: str) -> None:
+        event = ChangeEvent(entity_type, entity_id, op)
+        for listener in list(self._change_listeners):
+            listener(event)
+
+    def get_structure_entity(self, entity_type: str, entity_id: int):
+        repos = {
+            "program": self.program_repo,
+            "discipline": self.discipline_repo,
+            "topic": self.topic_repo,
+            "lesson": self.lesson_repo,
+            "question": self.question_repo,
+        }
+        repo = repos.get(entity_type)
+        return repo.get_by_id(entity_id) if repo else None
 
     def verify_password(self, password: str) -> bool:
         return self.auth_service.verify_password(password)
@@ -51,22 +96,32 @@ class AdminController:
         return self.teacher_repo.get_all()
 
     def add_teacher(self, teacher: Teacher) -> Teacher:
-        return self.teacher_repo.add(teacher)
+        result = self.teacher_repo.add(teacher)
+        self._emit("teacher", result.id, CHANGE_CREATED)
+        return result
 
     def update_teacher(self, teacher: Teacher) -> Teacher:
-        return self.teacher_repo.update(teacher)
+        result = self.teacher_repo.update(teacher)
+        self._emit("teacher", teacher.id, CHANGE_UPDATED)
+        return result
 
     def delete_teacher(self, teacher_id: int) -> bool:
-        return self.teacher_repo.delete(teacher_id)
+        result = self.teacher_repo.delete(teacher_id)
+        self._emit("teacher", teacher_id, CHANGE_DELETED)
+        return result
 
     def get_teacher_disciplines(self, teacher_id: int):
         return self.teacher_repo.get_disciplines(teacher_id)
 
     def add_discipline_to_teacher(self, teacher_id: int, discipline_id: int) -> bool:
-        return self.teacher_repo.add_discipline(teacher_id, discipline_id)
+        result = self.teacher_repo.add_discipline(teacher_id, discipline_id)
+        self._emit("teacher", teacher_id, CHANGE_CHILDREN)
+        return result
 
     def remove_discipline_from_teacher(self, teacher_id: int, discipline_id: int) -> bool:
-        return self.teacher_repo.remove_discipline(teacher_id, discipline_id)
+        result = self.teacher_repo.remove_discipline(teacher_id, discipline_id)
+        self._emit("teacher", teacher_id, CHANGE_CHILDREN)
+        return result
 
     def get_teachers_for_disciplines(self, discipline_ids: List[int]) -> List[Teacher]:
         return self.teacher_repo.get_teachers_for_disciplines(discipline_ids)
@@ -76,13 +131,19 @@ class AdminController:
         return self.program_repo.get_all()
 
     def add_program(self, program: EducationalProgram) -> EducationalProgram:
-        return self.program_repo.add(program)
+        result = self.program_repo.add(program)
+        self._emit("program", result.id, CHANGE_CREATED)
+        return result
 
     def update_program(self, program: EducationalProgram) -> EducationalProgram:
-        return self.program_repo.update(program)
+        result = self.program_repo.update(program)
+        self._emit("program", program.id, CHANGE_UPDATED)
+        return result
 
     def delete_program(self, program_id: int) -> bool:
-        return self.program_repo.delete(program_id)
+        result = self.program_repo.delete(program_id)
+        self._emit("program", program_id, CHANGE_DELETED)
+        return result
 
     def get_program_topics(self, program_id: int) -> List[Topic]:
         return self.program_repo.get_program_topics(program_id)
@@ -91,41 +152,61 @@ class AdminController:
         return self.program_repo.get_program_disciplines(program_id)
 
     def add_discipline_to_program(self, program_id: int, discipline_id: int, order_index: int = 0) -> bool:
-        return self.program_repo.add_discipline_to_program(program_id, discipline_id, order_index)
+        result = self.program_repo.add_discipline_to_program(program_id, discipline_id, order_index)
+        self._emit("program", program_id, CHANGE_CHILDREN)
+        return result
 
     def remove_discipline_from_program(self, program_id: int, discipline_id: int) -> bool:
-        return self.program_repo.remove_discipline_from_program(program_id, discipline_id)
+        result = self.program_repo.remove_discipline_from_program(program_id, discipline_id)
+        self._emit("program", program_id, CHANGE_CHILDREN)
+        return result
 
     def add_topic_to_program(self, program_id: int, topic_id: int, order_index: int = 0) -> bool:
-        return self.program_repo.add_topic_to_program(program_id, topic_id, order_index)
+        result = self.program_repo.add_topic_to_program(program_id, topic_id, order_index)
+        self._emit("program", program_id, CHANGE_CHILDREN)
+        return result
 
     def remove_topic_from_program(self, program_id: int, topic_id: int) -> bool:
-        return self.program_repo.remove_topic_from_program(program_id, topic_id)
+        result = self.program_repo.remove_topic_from_program(program_id, topic_id)
+        self._emit("program", program_id, CHANGE_CHILDREN)
+        return result
 
     # Topics
     def get_topics(self) -> List[Topic]:
         return self.topic_repo.get_all()
 
     def add_topic(self, topic: Topic) -> Topic:
-        return self.topic_repo.add(topic)
+        result = self.topic_repo.add(topic)
+        self._emit("topic", result.id, CHANGE_CREATED)
+        return result
 
     def update_topic(self, topic: Topic) -> Topic:
-        return self.topic_repo.update(topic)
+        result = self.topic_repo.update(topic)
+        self._emit("topic", topic.id, CHANGE_UPDATED)
+        return result
 
     def delete_topic(self, topic_id: int) -> bool:
-        return self.topic_repo.delete(topic_id)
+        result = self.topic_repo.delete(topic_id)
+        self._emit("topic", topic_id, CHANGE_DELETED)
+        return result
 
     def get_topic_lessons(self, topic_id: int) -> List[Lesson]:
         return self.topic_repo.get_topic_lessons(topic_id)
 
     def add_lesson_to_topic(self, topic_id: int, lesson_id: int, order_index: int = 0) -> bool:
-        return self.topic_repo.add_lesson_to_topic(topic_id, lesson_id, order_index)
+        result = self.topic_repo.add_lesson_to_topic(topic_id, lesson_id, order_index)
+        self._emit("topic", topic_id, CHANGE_CHILDREN)
+        return result
 
     def remove_lesson_from_topic(self, topic_id: int, lesson_id: int) -> bool:
-        return self.topic_repo.remove_lesson_from_topic(topic_id, lesson_id)
+        result = self.topic_repo.remove_lesson_from_topic(topic_id, lesson_id)
+        self._emit("topic", topic_id, CHANGE_CHILDREN)
+        return result
 
     def update_topic_lesson_order(self, topic_id: int, lesson_id: int, order_index: int) -> bool:
-        return self.topic_repo.update_lesson_order(topic_id, lesson_id, order_index)
+        result = self.topic_repo.update_lesson_order(topic_id, lesson_id, order_index)
+        self._emit("topic", topic_id, CHANGE_CHILDREN)
+        return result
 
     def normalize_topic_lesson_order(self, topic_id: int) -> None:
         lessons = self.topic_repo.get_topic_lessons(topic_id)
@@ -137,28 +218,39 @@ class AdminController:
         ordered = sorted(lessons, key=sort_key)
         for idx, lesson in enumerate(ordered, start=1):
             self.topic_repo.update_lesson_order(topic_id, lesson.id, idx)
+        self._emit("topic", topic_id, CHANGE_CHILDREN)
 
     # Disciplines
     def get_disciplines(self) -> List[Discipline]:
         return self.discipline_repo.get_all()
 
     def add_discipline(self, discipline: Discipline) -> Discipline:
-        return self.discipline_repo.add(discipline)
+        result = self.discipline_repo.add(discipline)
+        self._emit("discipline", result.id, CHANGE_CREATED)
+        return result
 
     def update_discipline(self, discipline: Discipline) -> Discipline:
-        return self.discipline_repo.update(discipline)
+        result = self.discipline_repo.update(discipline)
+        self._emit("discipline", discipline.id, CHANGE_UPDATED)
+        return result
 
     def delete_discipline(self, discipline_id: int) -> bool:
-        return self.discipline_repo.delete(discipline_id)
+        result = self.discipline_repo.delete(discipline_id)
+        self._emit("discipline", discipline_id, CHANGE_DELETED)
+        return result
 
     def get_discipline_topics(self, discipline_id: int) -> List[Topic]:
         return self.discipline_repo.get_discipline_topics(discipline_id)
 
     def add_topic_to_discipline(self, discipline_id: int, topic_id: int, order_index: int = 0) -> bool:
-        return self.discipline_repo.add_topic_to_discipline(discipline_id, topic_id, order_index)
+        result = self.discipline_repo.add_topic_to_discipline(discipline_id, topic_id, order_index)
+        self._emit("discipline", discipline_id, CHANGE_CHILDREN)
+        return result
 
     def remove_topic_from_discipline(self, discipline_id: int, topic_id: int) -> bool:
-        return self.discipline_repo.remove_topic_from_discipline(discipline_id, topic_id)
+        result = self.discipline_repo.remove_topic_from_discipline(discipline_id, topic_id)
+        self._emit("discipline", discipline_id, CHANGE_CHILDREN)
+        return result
 
     def get_primary_parent_ids(self, entity_type: str, entity_id: int) -> Tuple[int | None, int | None]:
         return self._resolve_program_discipline_for_entity(entity_type, entity_id)
@@ -169,6 +261,8 @@ class AdminController:
         self.program_repo.remove_discipline_from_program(from_program_id, discipline_id)
         order_index = self._get_next_order_index("program_disciplines", "program_id", to_program_id)
         self.program_repo.add_discipline_to_program(to_program_id, discipline_id, order_index)
+        self._emit("program", from_program_id, CHANGE_CHILDREN)
+        self._emit("program", to_program_id, CHANGE_CHILDREN)
 
     def move_topic_to_discipline(self, topic_id: int, from_discipline_id: int, to_discipline_id: int) -> None:
         if not from_discipline_id or not to_discipline_id or from_discipline_id == to_discipline_id:
@@ -176,6 +270,8 @@ class AdminController:
         self.discipline_repo.remove_topic_from_discipline(from_discipline_id, topic_id)
         order_index = self._get_next_order_index("discipline_topics", "discipline_id", to_discipline_id)
         self.discipline_repo.add_topic_to_discipline(to_discipline_id, topic_id, order_index)
+        self._emit("discipline", from_discipline_id, CHANGE_CHILDREN)
+        self._emit("discipline", to_discipline_id, CHANGE_CHILDREN)
 
     def convert_discipline_to_topic(
         self, discipline: Discipline, from_program_id: int, to_discipline_id: int
@@ -203,8 +299,14 @@ class AdminController:
 
         if from_program_id:
             self.program_repo.remove_discipline_from_program(from_program_id, discipline.id)
+            self._emit("program", from_program_id, CHANGE_CHILDREN)
+        self._emit("topic", new_topic.id, CHANGE_CREATED)
+        self._emit("discipline", to_discipline_id, CHANGE_CHILDREN)
         if not self.program_repo.get_programs_for_discipline(discipline.id):
             self.discipline_repo.delete(discipline.id)
+            self._emit("discipline", discipline.id, CHANGE_DELETED)
+        else:
+            self._emit("discipline", discipline.id, CHANGE_CHILDREN)
         return new_topic
 
     def convert_topic_to_discipline(
@@ -239,8 +341,14 @@ class AdminController:
 
         if from_discipline_id:
             self.discipline_repo.remove_topic_from_discipline(from_discipline_id, topic.id)
+            self._emit("discipline", from_discipline_id, CHANGE_CHILDREN)
+        self._emit("discipline", new_discipline.id, CHANGE_CREATED)
+        self._emit("program", to_program_id, CHANGE_CHILDREN)
         if not self.discipline_repo.get_disciplines_for_topic(topic.id) and not self.program_repo.get_programs_for_topic(topic.id):
             self.topic_repo.delete(topic.id)
+            self._emit("topic", topic.id, CHANGE_DELETED)
+        else:
+            self._emit("topic", topic.id, CHANGE_CHILDREN)
         return new_discipline
 
     # Lessons
@@ -248,93 +356,131 @@ class AdminController:
         return self.lesson_repo.get_all()
 
     def add_lesson(self, lesson: Lesson) -> Lesson:
-        return self.lesson_repo.add(lesson)
+        result = self.lesson_repo.add(lesson)
+        self._emit("lesson", result.id, CHANGE_CREATED)
+        return result
 
     def update_lesson(self, lesson: Lesson) -> Lesson:
-        return self.lesson_repo.update(lesson)
+        result = self.lesson_repo.update(lesson)
+        self._emit("lesson", lesson.id, CHANGE_UPDATED)
+        return result
 
     def delete_lesson(self, lesson_id: int) -> bool:
-        return self.lesson_repo.delete(lesson_id)
+        result = self.lesson_repo.delete(lesson_id)
+        self._emit("lesson", lesson_id, CHANGE_DELETED)
+        return result
 
     # Lesson types
     def get_lesson_types(self) -> List[LessonType]:
         return self.lesson_type_repo.get_all()
 
     def add_lesson_type(self, lesson_type: LessonType) -> LessonType:
-        return self.lesson_type_repo.add(lesson_type)
+        result = self.lesson_type_repo.add(lesson_type)
+        self._emit("lesson_type", result.id, CHANGE_CREATED)
+        return result
 
     def update_lesson_type(self, lesson_type: LessonType) -> LessonType:
-        return self.lesson_type_repo.update(lesson_type)
+        result = self.lesson_type_repo.update(lesson_type)
+        self._emit("lesson_type", lesson_type.id, CHANGE_UPDATED)
+        return result
 
     def delete_lesson_type(self, lesson_type_id: int) -> bool:
-        return self.lesson_type_repo.delete(lesson_type_id)
+        result = self.lesson_type_repo.delete(lesson_type_id)
+        self._emit("lesson_type", lesson_type_id, CHANGE_DELETED)
+        return result
 
     def get_lesson_questions(self, lesson_id: int) -> List[Question]:
         return self.lesson_repo.get_lesson_questions(lesson_id)
 
     def add_question_to_lesson(self, lesson_id: int, question_id: int, order_index: int = 0) -> bool:
-        return self.lesson_repo.add_question_to_lesson(lesson_id, question_id, order_index)
+        result = self.lesson_repo.add_question_to_lesson(lesson_id, question_id, order_index)
+        self._emit("lesson", lesson_id, CHANGE_CHILDREN)
+        return result
 
     def remove_question_from_lesson(self, lesson_id: int, question_id: int) -> bool:
-        return self.lesson_repo.remove_question_from_lesson(lesson_id, question_id)
+        result = self.lesson_repo.remove_question_from_lesson(lesson_id, question_id)
+        self._emit("lesson", lesson_id, CHANGE_CHILDREN)
+        return result
 
     def update_lesson_question_order(self, lesson_id: int, question_id: int, order_index: int) -> bool:
-        return self.lesson_repo.update_question_order(lesson_id, question_id, order_index)
+        result = self.lesson_repo.update_question_order(lesson_id, question_id, order_index)
+        self._emit("lesson", lesson_id, CHANGE_CHILDREN)
+        return result
 
     def get_next_lesson_question_order(self, lesson_id: int) -> int:
         return self.lesson_repo.get_next_question_order(lesson_id)
 
     def normalize_lesson_question_order(self, lesson_id: int) -> None:
         self.lesson_repo.normalize_question_order(lesson_id)
+        self._emit("lesson", lesson_id, CHANGE_CHILDREN)
 
     # Questions
     def get_questions(self) -> List[Question]:
         return self.question_repo.get_all()
 
     def add_question(self, question: Question) -> Question:
-        return self.question_repo.add(question)
+        result = self.question_repo.add(question)
+        self._emit("question", result.id, CHANGE_CREATED)
+        return result
 
     def update_question(self, question: Question) -> Question:
-        return self.question_repo.update(question)
+        result = self.question_repo.update(question)
+        self._emit("question", question.id, CHANGE_UPDATED)
+        return result
 
     def delete_question(self, question_id: int) -> bool:
-        return self.question_repo.delete(question_id)
+        result = self.question_repo.delete(question_id)
+        self._emit("question", question_id, CHANGE_DELETED)
+        return result
 
     # Materials
-    def get_materials(self) -> List[MethodicalMaterial]:
-        return self.material_repo.get_all()
+    def get_materials(self, include_teachers: bool = True) -> List[MethodicalMaterial]:
+        return self.material_repo.get_all(include_teachers)
 
-    def get_materials_for_entity(self, entity_type: str, entity_id: int) -> List[MethodicalMaterial]:
-        return self.material_repo.get_materials_for_entity(entity_type, entity_id)
+    def get_materials_for_entity(
+        self, entity_type: str, entity_id: int, include_teachers: bool = True
+    ) -> List[MethodicalMaterial]:
+        return self.material_repo.get_materials_for_entity(entity_type, entity_id, include_teachers)
 
     def add_material(self, material: MethodicalMaterial) -> MethodicalMaterial:
-        return self.material_repo.add(material)
+        result = self.material_repo.add(material)
+        self._emit("material", result.id, CHANGE_CREATED)
+        return result
 
     def update_material(self, material: MethodicalMaterial) -> MethodicalMaterial:
-        return self.material_repo.update(material)
+        result = self.material_repo.update(material)
+        self._emit("material", material.id, CHANGE_UPDATED)
+        return result
 
     def delete_material(self, material_id: int) -> bool:
         material = self.material_repo.get_by_id(material_id)
         if material and material.relative_path:
             self.file_storage.delete_file(material.relative_path)
-        return self.material_repo.delete(material_id)
+        result = self.material_repo.delete(material_id)
+        self._emit("material", material_id, CHANGE_DELETED)
+        return result
 
     # Material types
     def get_material_types(self) -> List[MaterialType]:
         return self.material_type_repo.get_all()
 
     def add_material_type(self, material_type: MaterialType) -> MaterialType:
-        return self.material_type_repo.add(material_type)
+        result = self.material_type_repo.add(material_type)
+        self._emit("material_type", result.id, CHANGE_CREATED)
+        return result
 
     def update_material_type(self, material_type: MaterialType) -> MaterialType:
         existing = self.material_type_repo.get_by_id(material_type.id) if material_type.id else None
         updated = self.material_type_repo.update(material_type)
         if existing and existing.name != updated.name:
             self.material_repo.update_material_type_name(existing.name, updated.name)
+        self._emit("material_type", updated.id, CHANGE_UPDATED)
         return updated
 
     def delete_material_type(self, material_type_id: int) -> bool:
-        return self.material_type_repo.delete(material_type_id)
+        result = self.material_type_repo.delete(material_type_id)
+        self._emit("material_type", material_type_id, CHANGE_DELETED)
+        return result
 
     def attach_material_file(self, material: MethodicalMaterial, source_path: str) -> MethodicalMaterial:
         associations = self.material_repo.get_material_associations(material.id)
@@ -358,10 +504,12 @@ class AdminController:
         material.file_name = original_filename
         material.file_path = relative_path
         try:
-            return self.material_repo.update(material)
+            updated = self.material_repo.update(material)
         except (sqlite3.Error, OSError, RuntimeError, ValueError, TypeError):
             self.file_storage.delete_file(relative_path)
             raise
+        self._emit("material", material.id, CHANGE_UPDATED)
+        return updated
 
     def attach_existing_material_file(self, material: MethodicalMaterial, source_path: str) -> MethodicalMaterial:
         try:
@@ -379,7 +527,9 @@ class AdminController:
         material.file_type = file_type
         material.file_name = original_filename
         material.file_path = relative_path
-        return self.material_repo.update(material)
+        updated = self.material_repo.update(material)
+        self._emit("material", material.id, CHANGE_UPDATED)
+        return updated
 
     def duplicate_program(self, program_id: int) -> EducationalProgram:
         program = self.program_repo.get_by_id(program_id)
@@ -398,33 +548,36 @@ class AdminController:
             self.program_repo.add_discipline_to_program(new_program.id, discipline.id, order_index)
         for material in self.material_repo.get_materials_for_entity("program", program_id):
             self.material_repo.add_material_to_entity(material.id, "program", new_program.id)
+        self._emit("program", new_program.id, CHANGE_CREATED)
         return new_program
 
     def copy_program(self, program_id: int) -> EducationalProgram:
         program = self.program_repo.get_by_id(program_id)
         if not program:
             raise ValueError("Program not found.")
-        new_program = EducationalProgram(
-            name=self._copy_name(program.name),
-            description=program.description,
-            level=program.level,
-            year=program.year,
-            duration_hours=program.duration_hours,
-        )
-        new_program = self.program_repo.add(new_program)
-        material_map: dict[int, MethodicalMaterial] = {}
-        discipline_map: dict[int, Discipline] = {}
-        for discipline in self.program_repo.get_program_disciplines(program_id):
-            new_discipline = self._copy_discipline_tree(
-                discipline, new_program.id, material_map, discipline.order_index
+        with self.db.deferred_fts():
+            new_program = EducationalProgram(
+                name=self._copy_name(program.name),
+                description=program.description,
+                level=program.level,
+                year=program.year,
+                duration_hours=program.duration_hours,
             )
-            discipline_map[discipline.id] = new_discipline
-        for material in self.material_repo.get_materials_for_entity("program", program_id):
-            discipline_id = next(iter(discipline_map.values())).id if discipline_map else None
-            if discipline_id is None:
-                continue
-            new_material = self._copy_material(material, new_program.id, discipline_id, material_map)
-            self.material_repo.add_material_to_entity(new_material.id, "program", new_program.id)
+            new_program = self.program_repo.add(new_program)
+            material_map: dict[int, MethodicalMaterial] = {}
+            discipline_map: dict[int, Discipline] = {}
+            for discipline in self.program_repo.get_program_disciplines(program_id):
+                new_discipline = self._copy_discipline_tree(
+                    discipline, new_program.id, material_map, discipline.order_index
+                )
+                discipline_map[discipline.id] = new_discipline
+            for material in self.material_repo.get_materials_for_entity("program", program_id):
+                discipline_id = next(iter(discipline_map.values())).id if discipline_map else None
+                if discipline_id is None:
+                    continue
+                new_material = self._copy_material(material, new_program.id, discipline_id, material_map)
+                self.material_repo.add_material_to_entity(new_material.id, "program", new_program.id)
+        self._emit("program", new_program.id, CHANGE_CREATED)
         return new_program
 
     def duplicate_discipline(self, discipline_id: int, program_id: int) -> Discipline:
@@ -434,6 +587,7 @@ class AdminController:
         new_discipline = self._clone_discipline_links(discipline_id, rename=True)
         order_index = self._get_next_order_index("program_disciplines", "program_id", program_id)
         self.program_repo.add_discipline_to_program(program_id, new_discipline.id, order_index)
+        self._emit("program", program_id, CHANGE_CHILDREN)
         return new_discipline
 
     def copy_discipline(self, discipline_id: int, program_id: int) -> Discipline:
@@ -441,12 +595,15 @@ class AdminController:
         if not discipline:
             raise ValueError("Discipline not found.")
         material_map: dict[int, MethodicalMaterial] = {}
-        return self._copy_discipline_tree(discipline, program_id, material_map)
+        new_discipline = self._copy_discipline_tree(discipline, program_id, material_map)
+        self._emit("program", program_id, CHANGE_CHILDREN)
+        return new_discipline
 
     def duplicate_topic(self, topic_id: int, discipline_id: int) -> Topic:
         new_topic = self._clone_topic_links(topic_id, rename=True)
         order_index = self._get_next_order_index("discipline_topics", "discipline_id", discipline_id)
         self.discipline_repo.add_topic_to_discipline(discipline_id, new_topic.id, order_index)
+        self._emit("discipline", discipline_id, CHANGE_CHILDREN)
         return new_topic
 
     def copy_topic(self, topic_id: int, discipline_id: int) -> Topic:
@@ -455,12 +612,15 @@ class AdminController:
         if not topic:
             raise ValueError("Topic not found.")
         program_id, _ = self._resolve_program_discipline_for_entity("discipline", discipline_id)
-        return self._copy_topic_tree(topic, program_id, discipline_id, material_map)
+        new_topic = self._copy_topic_tree(topic, program_id, discipline_id, material_map)
+        self._emit("discipline", discipline_id, CHANGE_CHILDREN)
+        return new_topic
 
     def duplicate_lesson(self, lesson_id: int, topic_id: int) -> Lesson:
         new_lesson = self._clone_lesson_links(lesson_id, rename=True)
         order_index = self._get_next_order_index("topic_lessons", "topic_id", topic_id)
         self.topic_repo.add_lesson_to_topic(topic_id, new_lesson.id, order_index)
+        self._emit("topic", topic_id, CHANGE_CHILDREN)
         return new_lesson
 
     def copy_lesson(self, lesson_id: int, topic_id: int) -> Lesson:
@@ -469,7 +629,9 @@ class AdminController:
         if not lesson:
             raise ValueError("Lesson not found.")
         program_id, discipline_id = self._resolve_program_discipline_for_entity("topic", topic_id)
-        return self._copy_lesson_tree(lesson, topic_id, program_id, discipline_id, material_map)
+        new_lesson = self._copy_lesson_tree(lesson, topic_id, program_id, discipline_id, material_map)
+        self._emit("topic", topic_id, CHANGE_CHILDREN)
+        return new_lesson
 
     def duplicate_question(self, question_id: int, lesson_id: int) -> Question:
         question = self.question_repo.get_by_id(question_id)
@@ -483,6 +645,7 @@ class AdminController:
         new_question = self.question_repo.add(new_question)
         order_index = self._get_next_order_index("lesson_questions", "lesson_id", lesson_id)
         self.lesson_repo.add_question_to_lesson(lesson_id, new_question.id, order_index)
+        self._emit("lesson", lesson_id, CHANGE_CHILDREN)
         return new_question
 
     def copy_question(self, question_id: int, lesson_id: int) -> Question:
@@ -498,6 +661,7 @@ class AdminController:
         self._replace_assoc(
             "program_disciplines", "program_id", "discipline_id", program_id, discipline_id, new_discipline.id, order_index
         )
+        self._emit("program", program_id, CHANGE_CHILDREN)
         return new_discipline
 
     def ensure_topic_for_edit(self, topic_id: int, discipline_id: int) -> Topic:
@@ -510,6 +674,7 @@ class AdminController:
         self._replace_assoc(
             "discipline_topics", "discipline_id", "topic_id", discipline_id, topic_id, new_topic.id, order_index
         )
+        self._emit("discipline", discipline_id, CHANGE_CHILDREN)
         return new_topic
 
     def ensure_lesson_for_edit(self, lesson_id: int, topic_id: int) -> Lesson:
@@ -522,6 +687,7 @@ class AdminController:
         self._replace_assoc(
             "topic_lessons", "topic_id", "lesson_id", topic_id, lesson_id, new_lesson.id, order_index
         )
+        self._emit("topic", topic_id, CHANGE_CHILDREN)
         return new_lesson
 
     def ensure_question_for_edit(self, question_id: int, lesson_id: int) -> Question:
@@ -540,6 +706,7 @@ class AdminController:
         self._replace_assoc(
             "lesson_questions", "lesson_id", "question_id", lesson_id, question_id, new_question.id, order_index
         )
+        self._emit("lesson", lesson_id, CHANGE_CHILDREN)
         return new_question
 
     def ensure_material_for_edit(self, material: MethodicalMaterial, entity_type: str, entity_id: int) -> MethodicalMaterial:
@@ -562,6 +729,8 @@ class AdminController:
             new_material = self.attach_material_file_with_context(new_material, source_path, program_id, discipline_id)
         self.material_repo.add_material_to_entity(new_material.id, entity_type, entity_id)
         self.material_repo.remove_material_from_entity(material.id, entity_type, entity_id)
+        self._emit("material", new_material.id, CHANGE_CREATED)
+        self._emit("material", material.id, CHANGE_UPDATED)
         return new_material
 
     def _copy_discipline_tree(
@@ -936,63 +1105,65 @@ class AdminController:
 
     def cleanup_unused_data(self) -> dict:
         counts = self.get_unused_data_counts()
-        with self.db.get_connection() as conn:
-            conn.execute(
-                """
-                DELETE FROM educational_programs
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM program_disciplines pd WHERE pd.program_id = educational_programs.id
+        with self.db.deferred_fts():
+            with self.db.get_connection() as conn:
+                conn.execute(
+                    """
+                    DELETE FROM educational_programs
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM program_disciplines pd WHERE pd.program_id = educational_programs.id
+                    )
+                    AND NOT EXISTS (
+                        SELECT 1 FROM program_topics pt WHERE pt.program_id = educational_programs.id
+                    )
+                    """
                 )
-                AND NOT EXISTS (
-                    SELECT 1 FROM program_topics pt WHERE pt.program_id = educational_programs.id
+                conn.execute(
+                    """
+                    DELETE FROM disciplines
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM program_disciplines pd WHERE pd.discipline_id = disciplines.id
+                    )
+                    """
                 )
-                """
-            )
-            conn.execute(
-                """
-                DELETE FROM disciplines
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM program_disciplines pd WHERE pd.discipline_id = disciplines.id
-                )
-                """
-            )
-            conn.execute(
-                """
-                DELETE FROM topics
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM discipline_topics dt WHERE dt.topic_id = topics.id
-                )
-                AND NOT EXISTS (
-                    SELECT 1 FROM program_topics pt WHERE pt.topic_id = topics.id
-                )
-                """
-            )
-            conn.execute(
-                """
-                DELETE FROM lessons
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM topic_lessons tl WHERE tl.lesson_id = lessons.id
+                conn.execute(
+                    """
+                    DELETE FROM topics
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM discipline_topics dt WHERE dt.topic_id = topics.id
+                    )
+                    AND NOT EXISTS (
+                        SELECT 1 FROM program_topics pt WHERE pt.topic_id = topics.id
+                    )
+                    """
                 )
-                """
-            )
-            conn.execute(
-                """
-                DELETE FROM questions
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM lesson_questions lq WHERE lq.question_id = questions.id
+                conn.execute(
+                    """
+                    DELETE FROM lessons
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM topic_lessons tl WHERE tl.lesson_id = lessons.id
+                    )
+                    """
                 )
-                """
-            )
-            orphan_materials = conn.execute(
-                """
-                SELECT m.id FROM methodical_materials m
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM material_associations ma WHERE ma.material_id = m.id
+                conn.execute(
+                    """
+                    DELETE FROM questions
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM lesson_questions lq WHERE lq.question_id = questions.id
+                    )
+                    """
                 )
-                """
-            ).fetchall()
-        for row in orphan_materials:
-            self.delete_material(row[0])
+                orphan_materials = conn.execute(
+                    """
+                    SELECT m.id FROM methodical_materials m
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM material_associations ma WHERE ma.material_id = m.id
+                    )
+                    """
+                ).fetchall()
+            for row in orphan_materials:
+                self.delete_material(row[0])
+        self._emit("database", None, CHANGE_RESET)
         return counts
 
     def _resolve_program_discipline(self, associations: List[Tuple[str, int]]) -> Tuple[int, int]:
@@ -1031,16 +1202,24 @@ class AdminController:
         raise ValueError("Unsupported material association.")
 
     def add_material_to_entity(self, material_id: int, entity_type: str, entity_id: int) -> bool:
-        return self.material_repo.add_material_to_entity(material_id, entity_type, entity_id)
+        result = self.material_repo.add_material_to_entity(material_id, entity_type, entity_id)
+        self._emit("material", material_id, CHANGE_UPDATED)
+        return result
 
     def remove_material_from_entity(self, material_id: int, entity_type: str, entity_id: int) -> bool:
-        return self.material_repo.remove_material_from_entity(material_id, entity_type, entity_id)
+        result = self.material_repo.remove_material_from_entity(material_id, entity_type, entity_id)
+        self._emit("material", material_id, CHANGE_UPDATED)
+        return result
 
     def get_material_associations(self, material_id: int) -> List[Tuple[str, int, str]]:
         return self.material_repo.get_material_association_labels(material_id)
 
     def add_teacher_to_material(self, teacher_id: int, material_id: int, role: str = "author") -> bool:
-        return self.material_repo.add_teacher_to_material(teacher_id, material_id, role)
+        result = self.material_repo.add_teacher_to_material(teacher_id, material_id, role)
+        self._emit("material", material_id, CHANGE_UPDATED)
+        return result
 
     def remove_teacher_from_material(self, teacher_id: int, material_id: int) -> bool:
-        return self.material_repo.remove_teacher_from_material(teacher_id, material_id)
+        result = self.material_repo.remove_teacher_from_material(teacher_id, material_id)
+        self._emit("material", material_id, CHANGE_UPDATED)
+        return result
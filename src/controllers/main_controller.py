@@ -1,5 +1,5 @@
 """Main controller for user-mode interactions."""
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from ..models.database import Database
 from ..models.entities import (
     EducationalProgram,
@@ -18,7 +18,11 @@ from ..repositories.lesson_repository import LessonRepository
 from ..repositories.question_repository import QuestionRepository
 from ..repositories.material_repository import MaterialRepository
 from ..repositories.teacher_repository import TeacherRepository
-from ..services.search_service import SearchService
+from ..services.entity_ancestry import breadcrumb, load_ancestry_paths, navigation_target
+from ..services.search_service import SearchCancellation, SearchService
+from ..services.report_service import CoverageReport, ReportService
+from ..services.query_cache import QueryCache
+from ..services.structure_snapshot import StructureSnapshot, load_structure_snapshot
 
 
 class MainController:
@@ -26,32 +30,67 @@ class MainController:
 
     def __init__(self, database: Database):
         self.db = database
-        self.program_repo = ProgramRepository(database)
-        self.discipline_repo = DisciplineRepository(database)
-        self.topic_repo = TopicRepository(database)
-        self.lesson_repo = LessonRepository(database)
-        self.question_repo = QuestionRepository(database)
-        self.material_repo = MaterialRepository(database)
-        self.teacher_repo = TeacherRepository(database)
-        self.search_service = SearchService(database)
+        # User mode only reads; queries go through read-only connections.
+        reader = database.reader()
+        self.program_repo = ProgramRepository(reader)
+        self.discipline_repo = DisciplineRepository(reader)
+        self.topic_repo = TopicRepository(reader)
+        self.lesson_repo = LessonRepository(reader)
+        self.question_repo = QuestionRepository(reader)
+        self.material_repo = MaterialRepository(reader)
+        self.teacher_repo = TeacherRepository(reader)
+        self.search_service = SearchService(reader)
+        self.report_service = ReportService(reader)
+        self.cache = QueryCache(database.data_version)
 
     def get_programs(self) -> List[EducationalProgram]:
         return self.program_repo.get_all()
 
-    def get_program_structure(self, program_id: int) -> List[Discipline]:
-        disciplines = self.program_repo.get_program_disciplines(program_id)
-        for discipline in disciplines:
-            discipline.topics = self.discipline_repo.get_discipline_topics(discipline.id)
-            for topic in discipline.topics:
-                topic.lessons = self.topic_repo.get_topic_lessons(topic.id)
-                for lesson in topic.lessons:
-                    lesson.questions = self.lesson_repo.get_lesson_questions(lesson.id)
-        return disciplines
+    def get_program_outline(self, program_id: int) -> Dict[Tuple[str, int], List[Tuple[int, str, int]]]:
+        """Return the discipline, topic and lesson rows of a program's tree, keyed by parent."""
+        return self.cache.get_or_load(
+            ("program_outline", program_id),
+            lambda: self.program_repo.get_program_outline(program_id),
+        )
+
+    def get_structure_snapshot(self) -> StructureSnapshot:
+        """Load every program with its full hierarchy and materials in a handful of queries."""
+        return load_structure_snapshot(self.db.reader())
 
     def get_program_disciplines(self, program_id: int) -> List[Discipline]:
-        return self.program_repo.get_program_disciplines(program_id)
+        return self.cache.get_or_load(
+            ("program_disciplines", program_id),
+            lambda: self.program_repo.get_program_disciplines(program_id),
+        )
+
+    def get_tree_children(self, entity_type: str, entity_id: int) -> List[Tuple[int, str]]:
+        """Return (id, title) pairs of the direct children shown in the structure tree."""
+        return self.cache.get_or_load(
+            ("tree_children", entity_type, entity_id),
+            lambda: self._load_tree_children(entity_type, entity_id),
+        )
+
+    def _load_tree_children(self, entity_type: str, entity_id: int) -> List[Tuple[int, str]]:
+        if entity_type == "program":
+            return [(d.id, d.name) for d in self.program_repo.get_program_disciplines(entity_id)]
+        if entity_type == "discipline":
+            return [(t.id, t.title) for t in self.discipline_repo.get_discipline_topics(entity_id)]
+        if entity_type == "topic":
+            return [(l.id, l.title) for l in self.topic_repo.get_topic_lessons(entity_id)]
+        if entity_type == "lesson":
+            return [(q.id, q.content) for q in self.lesson_repo.get_lesson_questions(entity_id)]
+        return []
+
+    def get_coverage_report(self, program_id: int, include_all_teachers: bool = False) -> CoverageReport:
+        return self.report_service.build_coverage_report(program_id, include_all_teachers)
 
     def get_entity_details(self, entity_type: str, entity_id: int) -> Dict[str, object]:
+        return self.cache.get_or_load(
+            ("entity_details", entity_type, entity_id),
+            lambda: self._load_entity_details(entity_type, entity_id),
+        )
+
+    def _load_entity_details(self, entity_type: str, entity_id: int) -> Dict[str, object]:
         if entity_type == "program":
             program = self.program_repo.get_by_id(entity_id)
             if not program:
@@ -141,86 +180,56 @@ class MainController:
             }
         return {}
 
-    def get_materials_for_entity(self, entity_type: str, entity_id: int) -> List[MethodicalMaterial]:
+    def get_materials_for_entity(
+        self, entity_type: str, entity_id: int, include_teachers: bool = True
+    ) -> List[MethodicalMaterial]:
         if entity_type not in {"program", "discipline", "topic", "lesson"}:
             return []
-        return self.material_repo.get_materials_for_entity(entity_type, entity_id)
+        return self.cache.get_or_load(
+            ("materials_for_entity", entity_type, entity_id, include_teachers),
+            lambda: self.material_repo.get_materials_for_entity(entity_type, entity_id, include_teachers),
+        )
 
     def get_teachers_for_disciplines(self, discipline_ids: List[int]):
-        return self.teacher_repo.get_teachers_for_disciplines(discipline_ids)
+        key = ("teachers_for_disciplines", tuple(discipline_ids))
+        return self.cache.get_or_load(key, lambda: self.teacher_repo.get_teachers_for_disciplines(discipline_ids))
+
+    def cache_stats(self) -> Dict[str, int]:
+        return self.cache.stats()
 
     def get_teachers(self) -> List[Teacher]:
         return self.teacher_repo.get_all()
 
-    def search(self, keyword: str) -> List[SearchResult]:
-        return self.search_service.search_all(keyword)
+    def search(
+        self,
+        keyword: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cancellation: Optional[SearchCancellation] = None,
+    ) -> List[SearchResult]:
+        return self.search_service.search_all(keyword, limit=limit, offset=offset, cancellation=cancellation)
+
+    def iter_search(
+        self,
+        keyword: str,
+        page_size: int,
+        cancellation: Optional[SearchCancellation] = None,
+    ) -> Iterator[List[SearchResult]]:
+        return self.search_service.iter_search(keyword, page_size, cancellation=cancellation)
+
+    def get_search_context(self, result: SearchResult) -> List[Tuple[str, str]]:
+        """Return (entity_type, name) pairs locating a search result in the curriculum."""
+        return self.get_search_contexts([result])[0]
+
+    def get_search_contexts(self, results: List[SearchResult]) -> List[List[Tuple[str, str]]]:
+        """Return the breadcrumb of every search result, resolved in one lookup."""
+        paths = load_ancestry_paths(self.db.reader(), [(r.entity_type, r.entity_id) for r in results])
+        return [breadcrumb(paths.get((r.entity_type, r.entity_id))) for r in results]
 
     def resolve_search_navigation(self, result: SearchResult) -> Dict[str, Optional[int]]:
-        target = {
-            "program_id": None,
-            "discipline_id": None,
-            "topic_id": None,
-            "lesson_id": None,
-            "question_id": None,
-        }
-        if result.entity_type == "program":
-            target["program_id"] = result.entity_id
-            return target
-        if result.entity_type == "discipline":
-            programs = self.program_repo.get_programs_for_discipline(result.entity_id)
-            target["program_id"] = programs[0].id if programs else None
-            target["discipline_id"] = result.entity_id
-            return target
-        if result.entity_type == "topic":
-            programs = self.program_repo.get_programs_for_topic(result.entity_id)
-            target["program_id"] = programs[0].id if programs else None
-            disciplines = self.discipline_repo.get_disciplines_for_topic(result.entity_id)
-            target["discipline_id"] = disciplines[0].id if disciplines else None
-            target["topic_id"] = result.entity_id
-            return target
-        if result.entity_type == "lesson":
-            programs = self.program_repo.get_programs_for_lesson(result.entity_id)
-            target["program_id"] = programs[0].id if programs else None
-            disciplines = self.discipline_repo.get_disciplines_for_lesson(result.entity_id)
-            target["discipline_id"] = disciplines[0].id if disciplines else None
-            topics = self.topic_repo.get_topics_for_lesson(result.entity_id)
-            target["topic_id"] = topics[0].id if topics else None
-            target["lesson_id"] = result.entity_id
-            return target
-        if result.entity_type == "question":
-            programs = self.program_repo.get_programs_for_question(result.entity_id)
-            target["program_id"] = programs[0].id if programs else None
-            lessons = self.lesson_repo.get_lessons_for_question(result.entity_id)
-            target["lesson_id"] = lessons[0].id if lessons else None
-            disciplines = self.discipline_repo.get_disciplines_for_question(result.entity_id)
-            target["discipline_id"] = disciplines[0].id if disciplines else None
-            topics = self.topic_repo.get_topics_for_question(result.entity_id)
-            target["topic_id"] = topics[0].id if topics else None
-            target["question_id"] = result.entity_id
-            return target
-        if result.entity_type == "material":
-            associations = self.material_repo.get_material_associations(result.entity_id)
-            if associations:
-                entity_type, entity_id = associations[0]
-                if entity_type == "program":
-                    target["program_id"] = entity_id
-                if entity_type == "discipline":
-                    programs = self.program_repo.get_programs_for_discipline(entity_id)
-                    target["program_id"] = programs[0].id if programs else None
-                    target["discipline_id"] = entity_id
-                if entity_type == "topic":
-                    programs = self.program_repo.get_programs_for_topic(entity_id)
-                    target["program_id"] = programs[0].id if programs else None
-                    disciplines = self.discipline_repo.get_disciplines_for_topic(entity_id)
-                    target["discipline_id"] = disciplines[0].id if disciplines else None
-                    target["topic_id"] = entity_id
-                if entity_type == "lesson":
-                    programs = self.program_repo.get_programs_for_lesson(entity_id)
-                    target["program_id"] = programs[0].id if programs else None
-                    disciplines = self.discipline_repo.get_disciplines_for_lesson(entity_id)
-                    target["discipline_id"] = disciplines[0].id if disciplines else None
-                    topics = self.topic_repo.get_topics_for_lesson(entity_id)
-                    target["topic_id"] = topics[0].id if topics else None
-                    target["lesson_id"] = entity_id
-            return target
-        return target
+        return self.resolve_navigation(result.entity_type, result.entity_id)
+
+    def resolve_navigation(self, entity_type: str, entity_id: int) -> Dict[str, Optional[int]]:
+        """Return the program/discipline/topic/lesson/question IDs leading to an entity."""
+        paths = load_ancestry_paths(self.db.reader(), [(entity_type, entity_id)])
+        return navigation_target(paths.get((entity_type, entity_id)))
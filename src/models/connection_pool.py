@@ -0,0 +1,187 @@
+"""Per-thread SQLite connection pool used by Database."""
+
+import sqlite3
+import threading
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """SQLite pragmas applied to every pooled connection when it is opened.
+
+    WAL lets readers and one writer proceed without blocking each other, but
+    it needs shared memory next to the database file; set ``journal_mode``
+    to None (keep the file's current mode) for databases on network shares.
+    """
+
+    journal_mode: Optional[str] = "WAL"
+    synchronous: Optional[str] = "NORMAL"
+    cache_size_kib: int = 16 * 1024
+    mmap_size: int = 256 * 1024 * 1024
+    temp_store: Optional[str] = "MEMORY"
+
+
+DEFAULT_CONNECTION_PROFILE = ConnectionProfile()
+
+
+class _ThreadConnections:
+    """Idle stack of one thread; its connections are closed when the thread's locals go away."""
+
+    __slots__ = ("idle", "__weakref__")
+
+    def __init__(self):
+        self.idle: List[sqlite3.Connection] = []
+
+
+def _close_thread_connections(
+    lock: threading.Lock, open_connections: "set[sqlite3.Connection]", idle: List[sqlite3.Connection]
+) -> None:
+    with lock:
+        connections = [conn for conn in idle if conn in open_connections]
+        open_connections.difference_update(connections)
+    idle.clear()
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+class ConnectionPool:
+    """Reuse warm SQLite connections per thread instead of reopening the file.
+
+    Each thread keeps its own stack of idle connections, so nested
+    ``get_connection()`` blocks still receive separate connections exactly as
+    before, while sequential calls reuse the same connection and its
+    prepared-statement cache.
+    """
+
+    DEFAULT_MAX_IDLE_PER_THREAD = 4
+
+    def __init__(
+        self,
+        db_path: str,
+        max_idle_per_thread: int = DEFAULT_MAX_IDLE_PER_THREAD,
+        profile: Optional[ConnectionProfile] = None,
+        read_only: bool = False,
+    ):
+        self.db_path = db_path
+        self.max_idle_per_thread = max(0, int(max_idle_per_thread))
+        self.profile = profile
+        self.read_only = read_only
+        self._journal_mode_applied = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open: set[sqlite3.Connection] = set()
+        self._closed = False
+        self._opened_count = 0
+        self._reused_count = 0
+
+    def acquire(self) -> sqlite3.Connection:
+        """Return an idle connection for the current thread or open a new one."""
+        idle = self._idle()
+        while idle:
+            conn = idle.pop()
+            with self._lock:
+                if conn in self._open:
+                    self._reused_count += 1
+                    return conn
+        return self._open_connection()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the current thread's idle stack (or close it)."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        idle = self._idle()
+        with self._lock:
+            keep = not self._closed and conn in self._open and len(idle) < self.max_idle_per_thread
+        if keep:
+            idle.append(conn)
+        else:
+            self._discard(conn)
+
+    def close_all(self) -> None:
+        """Close every connection opened by this pool; later acquires reopen lazily."""
+        with self._lock:
+            connections = list(self._open)
+            self._open.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def shutdown(self) -> None:
+        """Close all connections and stop keeping released connections idle."""
+        with self._lock:
+            self._closed = True
+        self.close_all()
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters for opened/reused connections and currently open handles."""
+        with self._lock:
+            return {
+                "opened": self._opened_count,
+                "reused": self._reused_count,
+                "open": len(self._open),
+            }
+
+    def _idle(self) -> List[sqlite3.Connection]:
+        holder = getattr(self._local, "connections", None)
+        if holder is None:
+            holder = _ThreadConnections()
+            self._local.connections = holder
+            # Pool threads come and go (QThreadPool expires idle threads), so
+            # close a thread's idle connections once it has exited.
+            weakref.finalize(holder, _close_thread_connections, self._lock, self._open, holder.idle)
+        return holder.idle
+
+    def _open_connection(self) -> sqlite3.Connection:
+        # Connections never cross threads while in use; check_same_thread is
+        # disabled only so shutdown() can close them from the owning app thread.
+        if self.read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self.profile is not None:
+            self._apply_profile(conn, self.profile)
+        with self._lock:
+            self._open.add(conn)
+            self._opened_count += 1
+        return conn
+
+    def _apply_profile(self, conn: sqlite3.Connection, profile: ConnectionProfile) -> None:
+        if profile.journal_mode and not self.read_only and not self._journal_mode_applied:
+            # The journal mode is stored in the file, so setting it once per pool is enough.
+            try:
+                conn.execute(f"PRAGMA journal_mode = {profile.journal_mode}")
+                self._journal_mode_applied = True
+            except sqlite3.OperationalError:
+                # Another process holds the file; keep its current mode.
+                pass
+        if profile.synchronous and not self.read_only:
+            conn.execute(f"PRAGMA synchronous = {profile.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {-int(profile.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(profile.mmap_size)}")
+        if profile.temp_store:
+            conn.execute(f"PRAGMA temp_store = {profile.temp_store}")
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._open.discard(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
@@ -1,23 +1,47 @@
 """Database management for educational program application."""
 import sqlite3
 import os
+import threading
+import weakref
 from typing import List, Dict, Any, Optional, Tuple
 from contextlib import contextmanager
 from ..services.app_paths import get_app_base_dir, get_database_dir
+from .connection_pool import DEFAULT_CONNECTION_PROFILE, ConnectionPool, ConnectionProfile
 from .database_bootstrap import initialize_database
 from .database_migrations import backup_database_before_migration, ensure_schema_version
-from .schema import SCHEMA_MIGRATIONS
+from .schema import (
+    ANCESTRY_LINKS,
+    FTS_INDEXES,
+    FTS_TABLE_STATEMENTS,
+    LINK_INDEX_STATEMENTS,
+    SCHEMA_MIGRATIONS,
+    SUBTREE_DIGEST_TABLE_STATEMENT,
+    TRIGRAM_FTS_INDEXES,
+    TRIGRAM_FTS_TABLE_STATEMENTS,
+)
 
 class Database:
     """SQLite database manager for educational program data."""
     SCHEMA_MIGRATIONS = SCHEMA_MIGRATIONS
 
-    def __init__(self, db_path: str = None):
+    # Write counters shared by every Database instance opened on the same file,
+    # so caches built on one instance notice writes made through another.
+    _data_versions: Dict[str, int] = {}
+    _data_versions_lock = threading.Lock()
+
+    # Active deferred_fts() depth per database file, shared like the counters above.
+    _fts_deferrals: Dict[str, int] = {}
+    _fts_deferrals_lock = threading.RLock()
+    DEFERRED_FTS_REBUILD_RATIO = 0.5
+
+    def __init__(self, db_path: str = None, profile: Optional[ConnectionProfile] = None):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file. If None, uses default path.
+            profile: Pragmas for every connection (WAL, cache and mmap sizes);
+                ``DEFAULT_CONNECTION_PROFILE`` when omitted
         """
         if db_path is None:
             database_dir = get_database_dir()
@@ -31,6 +55,18 @@ class Database:
         self.db_path = db_path
         self._db_preexisting = os.path.exists(self.db_path) if self.db_path and self.db_path != ":memory:" else False
         self._migration_backup_created = False
+        if self.db_path and self.db_path != ":memory:":
+            self._data_version_key = os.path.normcase(os.path.abspath(self.db_path))
+        else:
+            self._data_version_key = f":memory:{id(self)}"
+        self.profile = profile or DEFAULT_CONNECTION_PROFILE
+        self._pool = ConnectionPool(self.db_path, profile=self.profile)
+        weakref.finalize(self, self._pool.shutdown)
+        self._read_pool: Optional[ConnectionPool] = None
+        if self.db_path and self.db_path != ":memory:":
+            self._read_pool = ConnectionPool(self.db_path, profile=self.profile, read_only=True)
+            weakref.finalize(self, self._read_pool.shutdown)
+        self._reader: Optional["ReadOnlyDatabase"] = None
         self._ensure_database_exists()
 
     @contextmanager
@@ -38,20 +74,147 @@ class Database:
         """
         Context manager for database connections.
 
+        Connections come from a per-thread pool and are returned to it after
+        commit/rollback, so repeated calls reuse a warm connection.
+
         Yields:
             sqlite3.Connection: Active database connection
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
+        conn = self._pool.acquire()
+        changes_before = conn.total_changes
         try:
             yield conn
             conn.commit()
+            if conn.total_changes != changes_before:
+                self.bump_data_version()
         except (sqlite3.Error, OSError, RuntimeError, ValueError, TypeError):
             conn.rollback()
             raise
         finally:
-            conn.close()
+            self._pool.release(conn)
+
+    @contextmanager
+    def get_read_connection(self):
+        """
+        Context manager for read-only connections.
+
+        Connections are opened with ``mode=ro`` from a separate per-thread
+        pool, so queries never take write locks (under WAL they never wait
+        for a writer either) and any write attempt fails. In-memory databases
+        fall back to ``get_connection``.
+
+        Yields:
+            sqlite3.Connection: Read-only database connection
+        """
+        if self._read_pool is None:
+            with self.get_connection() as conn:
+                yield conn
+            return
+        conn = self._read_pool.acquire()
+        try:
+            yield conn
+        finally:
+            self._read_pool.release(conn)
+
+    def reader(self) -> "ReadOnlyDatabase":
+        """Return a view of this database whose ``get_connection`` is read-only."""
+        if self._reader is None:
+            self._reader = ReadOnlyDatabase(self)
+        return self._reader
+
+    def close(self) -> None:
+        """Close all pooled connections (call on shutdown or before replacing the file)."""
+        self._pool.close_all()
+        if self._read_pool is not None:
+            self._read_pool.close_all()
+        # The file may be replaced while closed; cached reads are no longer valid.
+        self.bump_data_version()
+
+    def data_version(self) -> int:
+        """Return a counter that changes after every committed write to this database file."""
+        with self._data_versions_lock:
+            return self._data_versions.get(self._data_version_key, 0)
+
+    def bump_data_version(self) -> None:
+        """Mark cached reads of this database file as stale."""
+        with self._data_versions_lock:
+            self._data_versions[self._data_version_key] = self._data_versions.get(self._data_version_key, 0) + 1
+
+    @contextmanager
+    def deferred_fts(self):
+        """
+        Defer full-text index maintenance for the duration of a bulk write.
+
+        While active, the per-row FTS triggers are off and writes through any
+        connection only journal the touched rows in ``fts_pending``. On exit,
+        also after an error, the journaled rows are re-indexed with one
+        statement per FTS table, or the table is rebuilt when at least
+        ``DEFERRED_FTS_REBUILD_RATIO`` of its rows changed. Nested uses on the
+        same database file share one deferral. Enter it before opening the
+        write connection so the final indexing runs after that commit.
+        """
+        key = self._data_version_key
+        with self._fts_deferrals_lock:
+            depth = self._fts_deferrals.get(key, 0)
+            if depth == 0:
+                with self.get_connection() as conn:
+                    conn.execute("INSERT OR IGNORE INTO fts_deferral (id) VALUES (1)")
+            self._fts_deferrals[key] = depth + 1
+        try:
+            yield
+        finally:
+            with self._fts_deferrals_lock:
+                depth = self._fts_deferrals[key] - 1
+                if depth:
+                    self._fts_deferrals[key] = depth
+                else:
+                    del self._fts_deferrals[key]
+                    with self.get_connection() as conn:
+                        self._apply_deferred_fts(conn.cursor())
+
+    def _fts_deferred(self) -> bool:
+        with self._fts_deferrals_lock:
+            return self._data_version_key in self._fts_deferrals
+
+    def _apply_deferred_fts(self, cursor) -> None:
+        """Index the rows journaled in ``fts_pending`` and end the deferral."""
+        # Trigram tables that were never created have no journal triggers,
+        # so nothing is ever pending for them.
+        for table, fts_table, _prefix, columns in FTS_INDEXES + TRIGRAM_FTS_INDEXES:
+            cursor.execute("SELECT COUNT(*) FROM fts_pending WHERE fts_table = ?", (fts_table,))
+            pending = cursor.fetchone()[0]
+            if not pending:
+                continue
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            if pending >= cursor.fetchone()[0] * self.DEFERRED_FTS_REBUILD_RATIO:
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+                continue
+            column_list = ", ".join(columns)
+            slots = ", ".join(f"c{index}" for index in range(1, len(columns) + 1))
+            cursor.execute(
+                f"""
+                INSERT INTO {fts_table}({fts_table}, rowid, {column_list})
+                SELECT 'delete', row_id, {slots} FROM fts_pending
+                WHERE fts_table = ? AND indexed = 1
+                """,
+                (fts_table,),
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {fts_table}(rowid, {column_list})
+                SELECT t.id, {', '.join(f't.{column}' for column in columns)}
+                FROM fts_pending p
+                JOIN {table} t ON t.id = p.row_id
+                WHERE p.fts_table = ?
+                """,
+                (fts_table,),
+            )
+        cursor.execute("DELETE FROM fts_pending")
+        cursor.execute("DELETE FROM fts_deferral")
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Return pooled connection counters: opened, reused and currently open."""
+        return self._pool.stats()
 
     def _ensure_database_exists(self):
         """Create database and tables if they don't exist."""
@@ -247,6 +410,82 @@ class Database:
             cursor.execute("ALTER TABLE teachers ADD COLUMN order_index INTEGER DEFAULT 0")
         cursor.execute("UPDATE teachers SET order_index = 0 WHERE order_index IS NULL")
 
+    def _migrate_to_fts_delete_triggers(self, cursor) -> None:
+        """Recreate FTS update/delete triggers using the external-content 'delete' command."""
+        for prefix in ("teachers", "programs", "topics", "disciplines", "lessons", "questions", "materials"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {prefix}_ad")
+            cursor.execute(f"DROP TRIGGER IF EXISTS {prefix}_au")
+        self._create_fts_triggers(cursor)
+        # Indexes written by the old triggers may hold stale terms.
+        self._rebuild_all_fts(cursor)
+
+    def _migrate_to_deferrable_fts_triggers(self, cursor) -> None:
+        """Recreate FTS triggers with the guard that lets bulk writes defer them."""
+        for _table, _fts_table, prefix, _columns in FTS_INDEXES:
+            for suffix in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {prefix}_{suffix}")
+        self._create_fts_triggers(cursor)
+
+    def _migrate_to_link_table_indexes(self, cursor) -> None:
+        """Index the reverse direction of the link tables."""
+        for statement in LINK_INDEX_STATEMENTS:
+            cursor.execute(statement)
+
+    def _migrate_to_entity_ancestors(self, cursor) -> None:
+        """Fill the ancestry closure table for existing hierarchies."""
+        self._rebuild_entity_ancestors(cursor)
+
+    def _rebuild_entity_ancestors(self, cursor) -> None:
+        """Recompute entity_ancestors from the link tables, top level first."""
+        cursor.execute("DELETE FROM entity_ancestors")
+        for table, parent_column, parent_type, child_column, child_type in ANCESTRY_LINKS:
+            cursor.execute(f"""
+                INSERT OR IGNORE INTO entity_ancestors (entity_type, entity_id, ancestor_type, ancestor_id)
+                SELECT '{child_type}', {child_column}, '{parent_type}', {parent_column} FROM {table}
+                UNION ALL
+                SELECT '{child_type}', l.{child_column}, a.ancestor_type, a.ancestor_id
+                FROM {table} l
+                JOIN entity_ancestors a ON a.entity_type = '{parent_type}' AND a.entity_id = l.{parent_column}
+            """)
+
+    def _migrate_to_trigram_fts(self, cursor) -> None:
+        """Add trigram FTS tables for substring search where SQLite supports them."""
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(value, tokenize='trigram')")
+        except sqlite3.OperationalError:
+            # SQLite before 3.34: substring search keeps using LIKE.
+            return
+        cursor.execute("DROP TABLE temp.trigram_probe")
+        for statement in TRIGRAM_FTS_TABLE_STATEMENTS:
+            cursor.execute(statement)
+        for _table, fts_table, _prefix, _columns in TRIGRAM_FTS_INDEXES:
+            cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+    def _migrate_to_prefix_fts(self, cursor) -> None:
+        """Recreate the FTS tables with prefix indexes and the apostrophe-folding tokenizer."""
+        for _table, fts_table, _prefix, _columns in FTS_INDEXES:
+            cursor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+        for statement in FTS_TABLE_STATEMENTS:
+            cursor.execute(statement)
+        for _table, fts_table, _prefix, _columns in FTS_INDEXES:
+            cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+            # The rebuilt index already reflects any journaled rows.
+            cursor.execute("DELETE FROM fts_pending WHERE fts_table = ?", (fts_table,))
+
+    def _migrate_to_stamped_subtree_digests(self, cursor) -> None:
+        """Recreate the digest cache keyed by files root and with file stamps."""
+        cursor.execute("DROP TABLE IF EXISTS subtree_digests")
+        cursor.execute(SUBTREE_DIGEST_TABLE_STATEMENT)
+
+    def _trigram_fts_available(self, cursor) -> bool:
+        """Return True when every trigram FTS table exists in this database."""
+        names = [fts_table for _table, fts_table, _prefix, _columns in TRIGRAM_FTS_INDEXES]
+        cursor.execute(
+            f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ({','.join('?' * len(names))})",
+            names,
+        )
+        return cursor.fetchone()[0] == len(names)
+
     def _migrate_to_material_storage(self, cursor) -> None:
         """Add storage metadata fields to methodical materials."""
         cursor.execute("PRAGMA table_info(methodical_materials)")
@@ -376,156 +615,190 @@ class Database:
         """Create triggers to maintain FTS tables."""
         # Teachers triggers
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS teachers_ai AFTER INSERT ON teachers BEGIN
+            CREATE TRIGGER IF NOT EXISTS teachers_ai AFTER INSERT ON teachers
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
                 INSERT INTO teachers_fts(rowid, full_name, military_rank, position, department, email)
                 VALUES (NEW.id, NEW.full_name, NEW.military_rank, NEW.position, NEW.department, NEW.email);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS teachers_ad AFTER DELETE ON teachers BEGIN
-                DELETE FROM teachers_fts WHERE rowid = OLD.id;
+            CREATE TRIGGER IF NOT EXISTS teachers_ad AFTER DELETE ON teachers
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO teachers_fts(teachers_fts, rowid, full_name, military_rank, position, department, email)
+                VALUES ('delete', OLD.id, OLD.full_name, OLD.military_rank, OLD.position, OLD.department, OLD.email);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS teachers_au AFTER UPDATE ON teachers BEGIN
-                UPDATE teachers_fts 
-                SET full_name = NEW.full_name, military_rank = NEW.military_rank,
-                    position = NEW.position, department = NEW.department, email = NEW.email
-                WHERE rowid = NEW.id;
+            CREATE TRIGGER IF NOT EXISTS teachers_au AFTER UPDATE ON teachers
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO teachers_fts(teachers_fts, rowid, full_name, military_rank, position, department, email)
+                VALUES ('delete', OLD.id, OLD.full_name, OLD.military_rank, OLD.position, OLD.department, OLD.email);
+                INSERT INTO teachers_fts(rowid, full_name, military_rank, position, department, email)
+                VALUES (NEW.id, NEW.full_name, NEW.military_rank, NEW.position, NEW.department, NEW.email);
             END
         """)
 
         # Programs triggers
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS programs_ai AFTER INSERT ON educational_programs BEGIN
+            CREATE TRIGGER IF NOT EXISTS programs_ai AFTER INSERT ON educational_programs
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
                 INSERT INTO programs_fts(rowid, name, description, level)
                 VALUES (NEW.id, NEW.name, NEW.description, NEW.level);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS programs_ad AFTER DELETE ON educational_programs BEGIN
-                DELETE FROM programs_fts WHERE rowid = OLD.id;
+            CREATE TRIGGER IF NOT EXISTS programs_ad AFTER DELETE ON educational_programs
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO programs_fts(programs_fts, rowid, name, description, level)
+                VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.level);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS programs_au AFTER UPDATE ON educational_programs BEGIN
-                UPDATE programs_fts 
-                SET name = NEW.name, description = NEW.description, level = NEW.level
-                WHERE rowid = NEW.id;
+            CREATE TRIGGER IF NOT EXISTS programs_au AFTER UPDATE ON educational_programs
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO programs_fts(programs_fts, rowid, name, description, level)
+                VALUES ('delete', OLD.id, OLD.name, OLD.description, OLD.level);
+                INSERT INTO programs_fts(rowid, name, description, level)
+                VALUES (NEW.id, NEW.name, NEW.description, NEW.level);
             END
         """)
 
         # Topics triggers
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS topics_ai AFTER INSERT ON topics BEGIN
+            CREATE TRIGGER IF NOT EXISTS topics_ai AFTER INSERT ON topics
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
                 INSERT INTO topics_fts(rowid, title, description)
                 VALUES (NEW.id, NEW.title, NEW.description);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS topics_ad AFTER DELETE ON topics BEGIN
-                DELETE FROM topics_fts WHERE rowid = OLD.id;
+            CREATE TRIGGER IF NOT EXISTS topics_ad AFTER DELETE ON topics
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO topics_fts(topics_fts, rowid, title, description)
+                VALUES ('delete', OLD.id, OLD.title, OLD.description);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS topics_au AFTER UPDATE ON topics BEGIN
-                UPDATE topics_fts 
-                SET title = NEW.title, description = NEW.description
-                WHERE rowid = NEW.id;
+            CREATE TRIGGER IF NOT EXISTS topics_au AFTER UPDATE ON topics
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO topics_fts(topics_fts, rowid, title, description)
+                VALUES ('delete', OLD.id, OLD.title, OLD.description);
+                INSERT INTO topics_fts(rowid, title, description)
+                VALUES (NEW.id, NEW.title, NEW.description);
             END
         """)
 
         # Disciplines triggers
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS disciplines_ai AFTER INSERT ON disciplines BEGIN
+            CREATE TRIGGER IF NOT EXISTS disciplines_ai AFTER INSERT ON disciplines
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
                 INSERT INTO disciplines_fts(rowid, name, description)
                 VALUES (NEW.id, NEW.name, NEW.description);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS disciplines_ad AFTER DELETE ON disciplines BEGIN
-                DELETE FROM disciplines_fts WHERE rowid = OLD.id;
+            CREATE TRIGGER IF NOT EXISTS disciplines_ad AFTER DELETE ON disciplines
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO disciplines_fts(disciplines_fts, rowid, name, description)
+                VALUES ('delete', OLD.id, OLD.name, OLD.description);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS disciplines_au AFTER UPDATE ON disciplines BEGIN
-                UPDATE disciplines_fts
-                SET name = NEW.name, description = NEW.description
-                WHERE rowid = NEW.id;
+            CREATE TRIGGER IF NOT EXISTS disciplines_au AFTER UPDATE ON disciplines
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO disciplines_fts(disciplines_fts, rowid, name, description)
+                VALUES ('delete', OLD.id, OLD.name, OLD.description);
+                INSERT INTO disciplines_fts(rowid, name, description)
+                VALUES (NEW.id, NEW.name, NEW.description);
             END
         """)
 
         # Lessons triggers
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS lessons_ai AFTER INSERT ON lessons BEGIN
+            CREATE TRIGGER IF NOT EXISTS lessons_ai AFTER INSERT ON lessons
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
                 INSERT INTO lessons_fts(rowid, title, description)
                 VALUES (NEW.id, NEW.title, NEW.description);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS lessons_ad AFTER DELETE ON lessons BEGIN
-                DELETE FROM lessons_fts WHERE rowid = OLD.id;
+            CREATE TRIGGER IF NOT EXISTS lessons_ad AFTER DELETE ON lessons
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO lessons_fts(lessons_fts, rowid, title, description)
+                VALUES ('delete', OLD.id, OLD.title, OLD.description);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS lessons_au AFTER UPDATE ON lessons BEGIN
-                UPDATE lessons_fts 
-                SET title = NEW.title, description = NEW.description
-                WHERE rowid = NEW.id;
+            CREATE TRIGGER IF NOT EXISTS lessons_au AFTER UPDATE ON lessons
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO lessons_fts(lessons_fts, rowid, title, description)
+                VALUES ('delete', OLD.id, OLD.title, OLD.description);
+                INSERT INTO lessons_fts(rowid, title, description)
+                VALUES (NEW.id, NEW.title, NEW.description);
             END
         """)
 
         # Questions triggers
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS questions_ai AFTER INSERT ON questions BEGIN
+            CREATE TRIGGER IF NOT EXISTS questions_ai AFTER INSERT ON questions
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
                 INSERT INTO questions_fts(rowid, content, answer)
                 VALUES (NEW.id, NEW.content, NEW.answer);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS questions_ad AFTER DELETE ON questions BEGIN
-                DELETE FROM questions_fts WHERE rowid = OLD.id;
+            CREATE TRIGGER IF NOT EXISTS questions_ad AFTER DELETE ON questions
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO questions_fts(questions_fts, rowid, content, answer)
+                VALUES ('delete', OLD.id, OLD.content, OLD.answer);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS questions_au AFTER UPDATE ON questions BEGIN
-                UPDATE questions_fts 
-                SET content = NEW.content, answer = NEW.answer
-                WHERE rowid = NEW.id;
+            CREATE TRIGGER IF NOT EXISTS questions_au AFTER UPDATE ON questions
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO questions_fts(questions_fts, rowid, content, answer)
+                VALUES ('delete', OLD.id, OLD.content, OLD.answer);
+                INSERT INTO questions_fts(rowid, content, answer)
+                VALUES (NEW.id, NEW.content, NEW.answer);
             END
         """)
 
         # Materials triggers
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS materials_ai AFTER INSERT ON methodical_materials BEGIN
+            CREATE TRIGGER IF NOT EXISTS materials_ai AFTER INSERT ON methodical_materials
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
                 INSERT INTO materials_fts(rowid, title, description, file_name)
                 VALUES (NEW.id, NEW.title, NEW.description, NEW.file_name);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS materials_ad AFTER DELETE ON methodical_materials BEGIN
-                DELETE FROM materials_fts WHERE rowid = OLD.id;
+            CREATE TRIGGER IF NOT EXISTS materials_ad AFTER DELETE ON methodical_materials
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO materials_fts(materials_fts, rowid, title, description, file_name)
+                VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.file_name);
             END
         """)
 
         cursor.execute("""
-            CREATE TRIGGER IF NOT EXISTS materials_au AFTER UPDATE ON methodical_materials BEGIN
-                UPDATE materials_fts 
-                SET title = NEW.title, description = NEW.description, file_name = NEW.file_name
-                WHERE rowid = NEW.id;
+            CREATE TRIGGER IF NOT EXISTS materials_au AFTER UPDATE ON methodical_materials
+                WHEN NOT EXISTS (SELECT 1 FROM fts_deferral) BEGIN
+                INSERT INTO materials_fts(materials_fts, rowid, title, description, file_name)
+                VALUES ('delete', OLD.id, OLD.title, OLD.description, OLD.file_name);
+                INSERT INTO materials_fts(rowid, title, description, file_name)
+                VALUES (NEW.id, NEW.title, NEW.description, NEW.file_name);
             END
         """)
 
@@ -623,3 +896,24 @@ class Database:
                 results.extend([dict(row) for row in cursor.fetchall()])
 
         return results
+
+
+class ReadOnlyDatabase:
+    """Read-only view of a Database for code that only queries it.
+
+    ``get_connection`` hands out connections from ``get_read_connection``;
+    every other attribute (path, data version, ...) is the wrapped
+    database's, so repositories and services accept it unchanged.
+    """
+
+    def __init__(self, database: Database):
+        self.database = database
+
+    def get_connection(self):
+        return self.database.get_read_connection()
+
+    def reader(self) -> "ReadOnlyDatabase":
+        return self
+
+    def __getattr__(self, name: str):
+        return getattr(self.database, name)
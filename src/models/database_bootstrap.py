@@ -1,6 +1,15 @@
 """Bootstrap helpers for the SQLite schema."""
 
-from .schema import CORE_TABLE_STATEMENTS, FTS_TABLE_STATEMENTS, INDEX_STATEMENTS
+from .schema import (
+    ANCESTRY_TRIGGER_STATEMENTS,
+    CORE_TABLE_STATEMENTS,
+    DEFERRED_FTS_TRIGGER_STATEMENTS,
+    FTS_TABLE_STATEMENTS,
+    INDEX_STATEMENTS,
+    MATERIAL_CONTENT_FTS_STATEMENTS,
+    SUBTREE_DIGEST_TRIGGER_STATEMENTS,
+    TRIGRAM_FTS_TRIGGER_STATEMENTS,
+)
 
 
 def initialize_database(database, conn) -> None:  # noqa: ANN001
@@ -16,6 +25,23 @@ def initialize_database(database, conn) -> None:  # noqa: ANN001
     for statement in FTS_TABLE_STATEMENTS:
         cursor.execute(statement)
 
+    for statement in MATERIAL_CONTENT_FTS_STATEMENTS:
+        cursor.execute(statement)
+
     database._create_fts_triggers(cursor)
     database._ensure_schema_version(cursor)
+    # Migrations may rebuild content tables, which drops their FTS triggers.
+    database._create_fts_triggers(cursor)
+    for statement in DEFERRED_FTS_TRIGGER_STATEMENTS:
+        cursor.execute(statement)
+    if database._trigram_fts_available(cursor):
+        for statement in TRIGRAM_FTS_TRIGGER_STATEMENTS:
+            cursor.execute(statement)
+    if not database._fts_deferred():
+        # A bulk write interrupted by a crash left rows waiting to be indexed.
+        database._apply_deferred_fts(cursor)
+    for statement in SUBTREE_DIGEST_TRIGGER_STATEMENTS:
+        cursor.execute(statement)
+    for statement in ANCESTRY_TRIGGER_STATEMENTS:
+        cursor.execute(statement)
     database._ensure_default_lesson_types(cursor)
@@ -12,8 +12,28 @@ SCHEMA_MIGRATIONS = (
     (10, "_migrate_to_lesson_type_synonyms"),
     (11, "_rebuild_all_fts"),
     (12, "_migrate_to_teacher_order_index"),
+    (13, "_migrate_to_fts_delete_triggers"),
+    (14, "_migrate_to_deferrable_fts_triggers"),
+    (15, "_migrate_to_link_table_indexes"),
+    (16, "_migrate_to_entity_ancestors"),
+    (17, "_migrate_to_trigram_fts"),
+    (18, "_migrate_to_prefix_fts"),
+    (19, "_migrate_to_stamped_subtree_digests"),
 )
 
+# Digests are per files root; file_stamps lists [path, size, mtime_ns] of every
+# material file the subtree covers, so rewritten files invalidate them.
+SUBTREE_DIGEST_TABLE_STATEMENT = """
+    CREATE TABLE IF NOT EXISTS subtree_digests (
+        entity_type TEXT NOT NULL,
+        entity_id INTEGER NOT NULL,
+        files_root TEXT NOT NULL,
+        digest TEXT NOT NULL,
+        file_stamps TEXT NOT NULL,
+        PRIMARY KEY (entity_type, entity_id, files_root)
+    )
+    """
+
 CORE_TABLE_STATEMENTS = (
     """
     CREATE TABLE IF NOT EXISTS teachers (
@@ -121,6 +141,49 @@ CORE_TABLE_STATEMENTS = (
     )
     """,
     """
+    CREATE TABLE IF NOT EXISTS material_contents (
+        material_id INTEGER PRIMARY KEY,
+        path_key TEXT NOT NULL,
+        file_size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        FOREIGN KEY (material_id) REFERENCES methodical_materials(id)
+            ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS entity_ancestors (
+        entity_type TEXT NOT NULL,
+        entity_id INTEGER NOT NULL,
+        ancestor_type TEXT NOT NULL,
+        ancestor_id INTEGER NOT NULL,
+        PRIMARY KEY (entity_type, entity_id, ancestor_type, ancestor_id)
+    ) WITHOUT ROWID
+    """,
+    SUBTREE_DIGEST_TABLE_STATEMENT,
+    """
+    CREATE TABLE IF NOT EXISTS fts_deferral (
+        id INTEGER PRIMARY KEY CHECK (id = 1)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS fts_pending (
+        fts_table TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        indexed INTEGER NOT NULL,
+        c1, c2, c3, c4, c5,
+        PRIMARY KEY (fts_table, row_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS material_file_fingerprints (
+        path_key TEXT PRIMARY KEY,
+        file_size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        crc32 INTEGER NOT NULL
+    )
+    """,
+    """
     CREATE TABLE IF NOT EXISTS program_disciplines (
         program_id INTEGER NOT NULL,
         discipline_id INTEGER NOT NULL,
@@ -224,49 +287,383 @@ INDEX_STATEMENTS = (
     "CREATE INDEX IF NOT EXISTS idx_lessons_title ON lessons(title)",
     "CREATE INDEX IF NOT EXISTS idx_questions_content ON questions(content)",
     "CREATE INDEX IF NOT EXISTS idx_materials_title ON methodical_materials(title)",
+    "CREATE INDEX IF NOT EXISTS idx_entity_ancestors_ancestor "
+    "ON entity_ancestors(ancestor_type, ancestor_id, entity_type, entity_id)",
+)
+
+# Reverse lookups on the link tables (their primary keys only serve the
+# parent -> child direction) and on the columns cascade deletes probe.
+# Chosen from EXPLAIN QUERY PLAN; see test_link_lookups_use_indexes.
+LINK_INDEX_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_program_disciplines_discipline ON program_disciplines(discipline_id, program_id)",
+    "CREATE INDEX IF NOT EXISTS idx_discipline_topics_topic ON discipline_topics(topic_id, discipline_id)",
+    "CREATE INDEX IF NOT EXISTS idx_program_topics_topic ON program_topics(topic_id, program_id)",
+    "CREATE INDEX IF NOT EXISTS idx_topic_lessons_lesson ON topic_lessons(lesson_id, topic_id)",
+    "CREATE INDEX IF NOT EXISTS idx_lesson_questions_question ON lesson_questions(question_id, lesson_id)",
+    "CREATE INDEX IF NOT EXISTS idx_teacher_materials_material ON teacher_materials(material_id, teacher_id)",
+    "CREATE INDEX IF NOT EXISTS idx_teacher_disciplines_discipline ON teacher_disciplines(discipline_id, teacher_id)",
+    "CREATE INDEX IF NOT EXISTS idx_material_associations_entity "
+    "ON material_associations(entity_type, entity_id, material_id)",
+    "CREATE INDEX IF NOT EXISTS idx_materials_relative_path ON methodical_materials(relative_path)",
 )
 
+# Prefix indexes for the 2-4 character prefixes every query term ends in
+# (see SearchService._fts_query). unicode61 folds case and already splits on
+# ASCII and typographic apostrophes; the modifier-letter apostrophes used in
+# Ukrainian spelling are made separators too, so all variants of a word
+# tokenize alike.
+FTS_TOKENIZER = "unicode61 separators '\u02bb\u02bc'"
+FTS_TABLE_OPTIONS = f"prefix='2 3 4', tokenize=\"{FTS_TOKENIZER}\""
+
 FTS_TABLE_STATEMENTS = (
-    """
+    f"""
     CREATE VIRTUAL TABLE IF NOT EXISTS teachers_fts USING fts5(
         full_name, military_rank, position, department, email,
-        content='teachers', content_rowid='id'
+        content='teachers', content_rowid='id',
+        {FTS_TABLE_OPTIONS}
     )
     """,
-    """
+    f"""
     CREATE VIRTUAL TABLE IF NOT EXISTS programs_fts USING fts5(
         name, description, level,
-        content='educational_programs', content_rowid='id'
+        content='educational_programs', content_rowid='id',
+        {FTS_TABLE_OPTIONS}
     )
     """,
-    """
+    f"""
     CREATE VIRTUAL TABLE IF NOT EXISTS topics_fts USING fts5(
         title, description,
-        content='topics', content_rowid='id'
+        content='topics', content_rowid='id',
+        {FTS_TABLE_OPTIONS}
     )
     """,
-    """
+    f"""
     CREATE VIRTUAL TABLE IF NOT EXISTS disciplines_fts USING fts5(
         name, description,
-        content='disciplines', content_rowid='id'
+        content='disciplines', content_rowid='id',
+        {FTS_TABLE_OPTIONS}
     )
     """,
-    """
+    f"""
     CREATE VIRTUAL TABLE IF NOT EXISTS lessons_fts USING fts5(
         title, description,
-        content='lessons', content_rowid='id'
+        content='lessons', content_rowid='id',
+        {FTS_TABLE_OPTIONS}
     )
     """,
-    """
+    f"""
     CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
         content, answer,
-        content='questions', content_rowid='id'
+        content='questions', content_rowid='id',
+        {FTS_TABLE_OPTIONS}
     )
     """,
-    """
+    f"""
     CREATE VIRTUAL TABLE IF NOT EXISTS materials_fts USING fts5(
         title, description, file_name,
-        content='methodical_materials', content_rowid='id'
+        content='methodical_materials', content_rowid='id',
+        {FTS_TABLE_OPTIONS}
+    )
+    """,
+)
+
+# (content table, FTS table, trigger prefix, indexed columns)
+FTS_INDEXES = (
+    ("teachers", "teachers_fts", "teachers", ("full_name", "military_rank", "position", "department", "email")),
+    ("educational_programs", "programs_fts", "programs", ("name", "description", "level")),
+    ("topics", "topics_fts", "topics", ("title", "description")),
+    ("disciplines", "disciplines_fts", "disciplines", ("name", "description")),
+    ("lessons", "lessons_fts", "lessons", ("title", "description")),
+    ("questions", "questions_fts", "questions", ("content", "answer")),
+    ("methodical_materials", "materials_fts", "materials", ("title", "description", "file_name")),
+)
+
+
+def _deferred_fts_trigger_statements(indexes) -> tuple:  # noqa: ANN001
+    statements = []
+    guard = "EXISTS (SELECT 1 FROM fts_deferral)"
+    for table, fts_table, prefix, columns in indexes:
+        slots = ", ".join(f"c{index}" for index in range(1, len(columns) + 1))
+        journal_old = (
+            f"INSERT OR IGNORE INTO fts_pending (fts_table, row_id, indexed, {slots}) "
+            f"VALUES ('{fts_table}', OLD.id, 1, {', '.join(f'OLD.{column}' for column in columns)});"
+        )
+        journal_new = (
+            "INSERT OR IGNORE INTO fts_pending (fts_table, row_id, indexed) "
+            f"VALUES ('{fts_table}', NEW.id, 0);"
+        )
+        # A conflicting INSERT OR REPLACE deletes the old row without firing
+        # delete triggers, so journal what the index holds before it goes.
+        journal_replaced = (
+            f"INSERT OR IGNORE INTO fts_pending (fts_table, row_id, indexed, {slots}) "
+            f"SELECT '{fts_table}', id, 1, {', '.join(columns)} FROM {table} WHERE id = NEW.id;"
+        )
+        for name, event, body in (
+            (f"{prefix}_defer_bi", "BEFORE INSERT", [journal_replaced]),
+            (f"{prefix}_defer_ai", "AFTER INSERT", [journal_new]),
+            (f"{prefix}_defer_au", "AFTER UPDATE", [journal_old, journal_new]),
+            (f"{prefix}_defer_ad", "AFTER DELETE", [journal_old]),
+        ):
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {name} {event} ON {table} WHEN {guard} BEGIN\n    "
+                + "\n    ".join(body)
+                + "\nEND"
+            )
+    return tuple(statements)
+
+
+# While deferred (see Database.deferred_fts) writes only journal the touched
+# rowids, plus the values the index still holds for them, in fts_pending.
+DEFERRED_FTS_TRIGGER_STATEMENTS = _deferred_fts_trigger_statements(FTS_INDEXES)
+
+# Substring indexes over the same columns (tokenize='trigram', SQLite 3.34+).
+# Created by a migration only where the tokenizer exists; see
+# Database._trigram_fts_available.
+TRIGRAM_FTS_INDEXES = tuple(
+    (table, f"{prefix}_trigram", f"{prefix}_trigram", columns)
+    for table, _fts_table, prefix, columns in FTS_INDEXES
+)
+
+TRIGRAM_FTS_TABLE_STATEMENTS = tuple(
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(\n"
+    f"    {', '.join(columns)},\n"
+    f"    content='{table}', content_rowid='id', tokenize='trigram'\n)"
+    for table, fts_table, _prefix, columns in TRIGRAM_FTS_INDEXES
+)
+
+
+def _trigram_fts_trigger_statements() -> tuple:
+    statements = []
+    guard = "NOT EXISTS (SELECT 1 FROM fts_deferral)"
+    for table, fts_table, prefix, columns in TRIGRAM_FTS_INDEXES:
+        column_list = ", ".join(columns)
+        insert_new = (
+            f"INSERT INTO {fts_table}(rowid, {column_list}) "
+            f"VALUES (NEW.id, {', '.join(f'NEW.{column}' for column in columns)});"
+        )
+        delete_old = (
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) "
+            f"VALUES ('delete', OLD.id, {', '.join(f'OLD.{column}' for column in columns)});"
+        )
+        for name, event, body in (
+            (f"{prefix}_ai", "AFTER INSERT", [insert_new]),
+            (f"{prefix}_ad", "AFTER DELETE", [delete_old]),
+            (f"{prefix}_au", "AFTER UPDATE", [delete_old, insert_new]),
+        ):
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {name} {event} ON {table} WHEN {guard} BEGIN\n    "
+                + "\n    ".join(body)
+                + "\nEND"
+            )
+    return tuple(statements) + _deferred_fts_trigger_statements(TRIGRAM_FTS_INDEXES)
+
+
+TRIGRAM_FTS_TRIGGER_STATEMENTS = _trigram_fts_trigger_statements()
+
+# Text extracted from attached material files (see MaterialContentIndexer).
+# Only the indexer writes material_contents, so its triggers ignore deferral.
+MATERIAL_CONTENT_FTS_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS material_contents_fts USING fts5(
+        content,
+        content='material_contents', content_rowid='material_id',
+        {FTS_TABLE_OPTIONS}
     )
     """,
+    """
+    CREATE TRIGGER IF NOT EXISTS material_contents_ai AFTER INSERT ON material_contents BEGIN
+        INSERT INTO material_contents_fts(rowid, content) VALUES (NEW.material_id, NEW.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS material_contents_ad AFTER DELETE ON material_contents BEGIN
+        INSERT INTO material_contents_fts(material_contents_fts, rowid, content)
+        VALUES ('delete', OLD.material_id, OLD.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS material_contents_au AFTER UPDATE ON material_contents BEGIN
+        INSERT INTO material_contents_fts(material_contents_fts, rowid, content)
+        VALUES ('delete', OLD.material_id, OLD.content);
+        INSERT INTO material_contents_fts(rowid, content) VALUES (NEW.material_id, NEW.content);
+    END
+    """,
+)
+
+# (child type, link table, child column, parent column, parent type)
+_DIGEST_PARENT_LINKS = (
+    ("lesson", "topic_lessons", "lesson_id", "topic_id", "topic"),
+    ("topic", "discipline_topics", "topic_id", "discipline_id", "discipline"),
+    ("discipline", "program_disciplines", "discipline_id", "program_id", "program"),
+)
+
+_DIGEST_ENTITY_TYPES = ("program", "discipline", "topic", "lesson")
+
+
+def _digest_invalidation(entity_type: str, ids_sql: str) -> str:
+    """Return a statement dropping the digests of the given nodes and all their ancestors."""
+    clauses = [f"(entity_type = '{entity_type}' AND entity_id IN ({ids_sql}))"]
+    for child_type, link_table, child_column, parent_column, parent_type in _DIGEST_PARENT_LINKS:
+        if child_type != entity_type:
+            continue
+        ids_sql = f"SELECT {parent_column} FROM {link_table} WHERE {child_column} IN ({ids_sql})"
+        entity_type = parent_type
+        clauses.append(f"(entity_type = '{entity_type}' AND entity_id IN ({ids_sql}))")
+    return "DELETE FROM subtree_digests WHERE " + "\n        OR ".join(clauses) + ";"
+
+
+def _digest_trigger(name: str, event: str, table: str, statements, when: str = "") -> str:  # noqa: ANN001
+    # Skip the ancestor lookups entirely while no digest is stored.
+    guard = "EXISTS (SELECT 1 FROM subtree_digests)"
+    condition = f" WHEN {when} AND {guard}" if when else f" WHEN {guard}"
+    body = "\n    ".join(statements)
+    return f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table}{condition} BEGIN\n    {body}\nEND"
+
+
+def _material_invalidation(material_ids_sql: str) -> list:
+    return [
+        _digest_invalidation(
+            entity_type,
+            "SELECT entity_id FROM material_associations "
+            f"WHERE entity_type = '{entity_type}' AND material_id IN ({material_ids_sql})",
+        )
+        for entity_type in _DIGEST_ENTITY_TYPES
+    ]
+
+
+def _subtree_digest_trigger_statements() -> tuple:
+    statements = []
+    for row, event in (("NEW", "INSERT"), ("OLD", "DELETE")):
+        suffix = "ai" if event == "INSERT" else "ad"
+        statements.extend([
+            _digest_trigger(f"digest_lesson_questions_{suffix}", event, "lesson_questions",
+                            [_digest_invalidation("lesson", f"SELECT {row}.lesson_id")]),
+            _digest_trigger(f"digest_topic_lessons_{suffix}", event, "topic_lessons",
+                            [_digest_invalidation("topic", f"SELECT {row}.topic_id")]),
+            _digest_trigger(f"digest_discipline_topics_{suffix}", event, "discipline_topics",
+                            [_digest_invalidation("discipline", f"SELECT {row}.discipline_id")]),
+            _digest_trigger(f"digest_program_disciplines_{suffix}", event, "program_disciplines",
+                            [_digest_invalidation("program", f"SELECT {row}.program_id")]),
+            _digest_trigger(f"digest_teacher_materials_{suffix}", event, "teacher_materials",
+                            _material_invalidation(f"SELECT {row}.material_id")),
+        ])
+        for entity_type in _DIGEST_ENTITY_TYPES:
+            statements.append(
+                _digest_trigger(
+                    f"digest_{entity_type}_materials_{suffix}",
+                    event,
+                    "material_associations",
+                    [_digest_invalidation(entity_type, f"SELECT {row}.entity_id")],
+                    when=f"{row}.entity_type = '{entity_type}'",
+                )
+            )
+    statements.extend([
+        _digest_trigger("digest_questions_au", "UPDATE OF content", "questions",
+                        [_digest_invalidation("lesson", "SELECT lesson_id FROM lesson_questions WHERE question_id = NEW.id")]),
+        _digest_trigger("digest_lessons_au", "UPDATE OF title", "lessons",
+                        [_digest_invalidation("topic", "SELECT topic_id FROM topic_lessons WHERE lesson_id = NEW.id")]),
+        _digest_trigger("digest_topics_au", "UPDATE OF title", "topics",
+                        [_digest_invalidation("discipline", "SELECT discipline_id FROM discipline_topics WHERE topic_id = NEW.id")]),
+        _digest_trigger("digest_disciplines_au", "UPDATE OF name", "disciplines",
+                        [_digest_invalidation("program", "SELECT program_id FROM program_disciplines WHERE discipline_id = NEW.id")]),
+        _digest_trigger("digest_materials_au", "UPDATE OF title, material_type, relative_path, file_path",
+                        "methodical_materials", _material_invalidation("SELECT NEW.id")),
+        _digest_trigger("digest_teachers_au", "UPDATE OF full_name", "teachers",
+                        _material_invalidation("SELECT material_id FROM teacher_materials WHERE teacher_id = NEW.id")),
+    ])
+    return tuple(statements)
+
+
+# Drop cached subtree digests (see SubtreeDigestService) whenever anything a
+# digest covers changes, including the ancestors of the changed node.
+SUBTREE_DIGEST_TRIGGER_STATEMENTS = _subtree_digest_trigger_statements()
+
+# (link table, parent column, parent type, child column, child type), top-down.
+ANCESTRY_LINKS = (
+    ("program_disciplines", "program_id", "program", "discipline_id", "discipline"),
+    ("discipline_topics", "discipline_id", "discipline", "topic_id", "topic"),
+    ("topic_lessons", "topic_id", "topic", "lesson_id", "lesson"),
+    ("lesson_questions", "lesson_id", "lesson", "question_id", "question"),
 )
+
+
+def _ancestry_subtree(row: str, child_type: str, child_column: str) -> str:
+    """Return a subquery of the linked child and every descendant it already has."""
+    return (
+        f"SELECT '{child_type}' AS entity_type, {row}.{child_column} AS entity_id\n"
+        "        UNION ALL\n"
+        "        SELECT entity_type, entity_id FROM entity_ancestors\n"
+        f"        WHERE ancestor_type = '{child_type}' AND ancestor_id = {row}.{child_column}"
+    )
+
+
+def _ancestry_link(row: str, link) -> str:  # noqa: ANN001
+    _table, parent_column, parent_type, child_column, child_type = link
+    return (
+        "INSERT OR IGNORE INTO entity_ancestors (entity_type, entity_id, ancestor_type, ancestor_id)\n"
+        "    SELECT s.entity_type, s.entity_id, a.ancestor_type, a.ancestor_id\n"
+        f"    FROM (\n        {_ancestry_subtree(row, child_type, child_column)}\n    ) s, (\n"
+        f"        SELECT '{parent_type}' AS ancestor_type, {row}.{parent_column} AS ancestor_id\n"
+        "        UNION ALL\n"
+        "        SELECT ancestor_type, ancestor_id FROM entity_ancestors\n"
+        f"        WHERE entity_type = '{parent_type}' AND entity_id = {row}.{parent_column}\n"
+        "    ) a;"
+    )
+
+
+def _ancestry_unlink(row: str, link) -> list:  # noqa: ANN001
+    table, parent_column, parent_type, child_column, child_type = link
+    level = [item[4] for item in ANCESTRY_LINKS].index(child_type)
+    above = ", ".join(f"'{item[2]}'" for item in ANCESTRY_LINKS[:level + 1])
+    # Every remaining path into the subtree from above enters through a
+    # still-linked parent of a child-level node, so re-derive from those.
+    via = (
+        f"SELECT '{child_type}' AS entity_type, {row}.{child_column} AS entity_id, {row}.{child_column} AS via_id\n"
+        "        UNION ALL\n"
+        "        SELECT s.entity_type, s.entity_id, v.ancestor_id\n"
+        "        FROM entity_ancestors s\n"
+        "        JOIN entity_ancestors v ON v.entity_type = s.entity_type AND v.entity_id = s.entity_id\n"
+        f"            AND v.ancestor_type = '{child_type}'\n"
+        f"        WHERE s.ancestor_type = '{child_type}' AND s.ancestor_id = {row}.{child_column}"
+    )
+    return [
+        "DELETE FROM entity_ancestors\n"
+        f"    WHERE ancestor_type IN ({above})\n"
+        "    AND (entity_type, entity_id) IN (\n"
+        f"        {_ancestry_subtree(row, child_type, child_column)}\n    );",
+        "INSERT OR IGNORE INTO entity_ancestors (entity_type, entity_id, ancestor_type, ancestor_id)\n"
+        f"    SELECT s.entity_type, s.entity_id, '{parent_type}', l.{parent_column}\n"
+        f"    FROM (\n        {via}\n    ) s\n"
+        f"    JOIN {table} l ON l.{child_column} = s.via_id\n"
+        "    UNION\n"
+        "    SELECT s.entity_type, s.entity_id, a.ancestor_type, a.ancestor_id\n"
+        f"    FROM (\n        {via}\n    ) s\n"
+        f"    JOIN {table} l ON l.{child_column} = s.via_id\n"
+        f"    JOIN entity_ancestors a ON a.entity_type = '{parent_type}' AND a.entity_id = l.{parent_column};",
+    ]
+
+
+def _ancestry_trigger_statements() -> tuple:
+    statements = []
+    for link in ANCESTRY_LINKS:
+        table, parent_column, _parent_type, child_column, _child_type = link
+        for name, event, body in (
+            (f"ancestry_{table}_ai", "INSERT", [_ancestry_link("NEW", link)]),
+            (f"ancestry_{table}_ad", "DELETE", _ancestry_unlink("OLD", link)),
+            (
+                f"ancestry_{table}_au",
+                f"UPDATE OF {parent_column}, {child_column}",
+                _ancestry_unlink("OLD", link) + [_ancestry_link("NEW", link)],
+            ),
+        ):
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} BEGIN\n    "
+                + "\n    ".join(body)
+                + "\nEND"
+            )
+    return tuple(statements)
+
+
+# Keep entity_ancestors (every program, discipline, topic and lesson above a
+# node, through any of its parents) in step with the link tables.
+ANCESTRY_TRIGGER_STATEMENTS = _ancestry_trigger_statements()
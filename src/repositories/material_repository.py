@@ -1,5 +1,5 @@
 """Methodical material repository for database operations."""
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import sqlite3
 from ..models.entities import MethodicalMaterial, Teacher
@@ -9,6 +9,9 @@ from ..models.database import Database
 class MaterialRepository:
     """Repository for managing methodical material data."""
 
+    # Stay well below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds.
+    TEACHER_LOOKUP_CHUNK_SIZE = 500
+
     def __init__(self, database: Database):
         """
         Initialize material repository.
@@ -148,7 +151,7 @@ class MaterialRepository:
             if row:
                 material = self._row_to_material(row)
                 # Load associated teachers
-                material.teachers = self.get_material_teachers(material_id)
+                self._attach_teachers(cursor, [material])
                 return material
             return None
 
@@ -178,10 +181,13 @@ class MaterialRepository:
             row = cursor.fetchone()
             return row["cnt"] if row else 0
 
-    def get_all(self) -> List[MethodicalMaterial]:
+    def get_all(self, include_teachers: bool = True) -> List[MethodicalMaterial]:
         """
         Get all methodical materials.
 
+        Args:
+            include_teachers: Load associated teachers for every material
+
         Returns:
             List[MethodicalMaterial]: List of all materials
         """
@@ -193,19 +199,18 @@ class MaterialRepository:
                        file_path, file_name, created_at, updated_at
                 FROM methodical_materials ORDER BY title
             """)
-            materials = []
-            for row in cursor.fetchall():
-                material = self._row_to_material(row)
-                material.teachers = self.get_material_teachers(material.id)
-                materials.append(material)
+            materials = [self._row_to_material(row) for row in cursor.fetchall()]
+            if include_teachers:
+                self._attach_teachers(cursor, materials)
             return materials
 
-    def search(self, keyword: str) -> List[MethodicalMaterial]:
+    def search(self, keyword: str, include_teachers: bool = True) -> List[MethodicalMaterial]:
         """
         Search methodical materials by keyword.
 
         Args:
             keyword: Search keyword
+            include_teachers: Load associated teachers for every material
 
         Returns:
             List[MethodicalMaterial]: List of matching materials
@@ -220,20 +225,21 @@ class MaterialRepository:
                 WHERE title LIKE ? OR description LIKE ? OR file_name LIKE ? OR original_filename LIKE ?
                 ORDER BY title
             """, (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"))
-            materials = []
-            for row in cursor.fetchall():
-                material = self._row_to_material(row)
-                material.teachers = self.get_material_teachers(material.id)
-                materials.append(material)
+            materials = [self._row_to_material(row) for row in cursor.fetchall()]
+            if include_teachers:
+                self._attach_teachers(cursor, materials)
             return materials
 
-    def get_materials_for_entity(self, entity_type: str, entity_id: int) -> List[MethodicalMaterial]:
+    def get_materials_for_entity(
+        self, entity_type: str, entity_id: int, include_teachers: bool = True
+    ) -> List[MethodicalMaterial]:
         """
         Get all materials associated with a specific entity.
 
         Args:
             entity_type: Type of entity ('program', 'topic', or 'lesson')
             entity_id: ID of the entity
+            include_teachers: Load associated teachers for every material
 
         Returns:
             List[MethodicalMaterial]: List of materials for the entity
@@ -250,11 +256,9 @@ class MaterialRepository:
                 ORDER BY m.title
             """, (entity_type, entity_id))
 
-            materials = []
-            for row in cursor.fetchall():
-                material = self._row_to_material(row)
-                material.teachers = self.get_material_teachers(material.id)
-                materials.append(material)
+            materials = [self._row_to_material(row) for row in cursor.fetchall()]
+            if include_teachers:
+                self._attach_teachers(cursor, materials)
             return materials
 
     def add_material_to_entity(self, material_id: int, entity_type: str, entity_id: int) -> bool:
@@ -411,24 +415,51 @@ class MaterialRepository:
         Returns:
             List[Teacher]: List of teachers associated with the material
         """
-        from .teacher_repository import TeacherRepository
-
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT t.id, t.full_name, t.order_index, t.military_rank, t.position, t.department, 
-                       t.email, t.phone, t.created_at, t.updated_at
+            return self._load_teachers_by_material(cursor, [material_id]).get(material_id, [])
+
+    def _attach_teachers(self, cursor, materials: List[MethodicalMaterial]) -> None:
+        """Fill ``teachers`` on every material with one lookup per id chunk."""
+        material_ids = [m.id for m in materials if m.id is not None]
+        teachers_by_material = self._load_teachers_by_material(cursor, material_ids)
+        for material in materials:
+            material.teachers = teachers_by_material.get(material.id, [])
+
+    def _load_teachers_by_material(self, cursor, material_ids: List[int]) -> Dict[int, List[Teacher]]:
+        """
+        Load teachers for many materials keyed by material ID.
+
+        Args:
+            cursor: Cursor of an open connection
+            material_ids: IDs of the materials
+
+        Returns:
+            Dict[int, List[Teacher]]: Sorted teachers per material ID
+        """
+        from .teacher_repository import TeacherRepository
+
+        teacher_repo = TeacherRepository(self.db)
+        result: Dict[int, List[Teacher]] = {}
+        unique_ids = list(dict.fromkeys(material_ids))
+        for start in range(0, len(unique_ids), self.TEACHER_LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start:start + self.TEACHER_LOOKUP_CHUNK_SIZE]
+            placeholders = ",".join(["?"] * len(chunk))
+            cursor.execute(f"""
+                SELECT tm.material_id, t.id, t.full_name, t.order_index, t.military_rank, t.position,
+                       t.department, t.email, t.phone, t.created_at, t.updated_at
                 FROM teachers t
                 JOIN teacher_materials tm ON t.id = tm.teacher_id
-                WHERE tm.material_id = ?
+                WHERE tm.material_id IN ({placeholders})
                 ORDER BY
+                    tm.material_id,
                     CASE WHEN COALESCE(t.order_index, 0) > 0 THEN 0 ELSE 1 END,
                     COALESCE(t.order_index, 0),
                     t.full_name
-            """, (material_id,))
-
-            teacher_repo = TeacherRepository(self.db)
-            return [teacher_repo._row_to_teacher(row) for row in cursor.fetchall()]
+            """, chunk)
+            for row in cursor.fetchall():
+                result.setdefault(row["material_id"], []).append(teacher_repo._row_to_teacher(row))
+        return result
 
     def _row_to_material(self, row) -> MethodicalMaterial:
         """
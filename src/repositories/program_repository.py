@@ -1,8 +1,9 @@
 """Educational program repository for database operations."""
-from typing import List, Optional
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import sqlite3
-from ..models.entities import EducationalProgram, Topic, Discipline
+from ..models.entities import EducationalProgram, Topic, Discipline, Lesson
 from ..models.database import Database
 
 
@@ -285,6 +286,177 @@ class ProgramRepository:
             discipline_repo = DisciplineRepository(self.db)
             return [discipline_repo._row_to_discipline(row) for row in cursor.fetchall()]
 
+    def get_program_structure(self, program_id: int) -> List[Discipline]:
+        """
+        Load the full Discipline -> Topic -> Lesson -> Question tree of a program.
+
+        Uses one set-based query per level on a single connection instead of
+        one query per parent node, then assembles the tree in memory. Shared
+        children get a separate entity per link, as with the per-node getters.
+
+        Args:
+            program_id: ID of the program
+
+        Returns:
+            List[Discipline]: Disciplines with nested topics, lessons and questions
+        """
+        from .discipline_repository import DisciplineRepository
+        from .topic_repository import TopicRepository
+        from .lesson_repository import LessonRepository
+        from .question_repository import QuestionRepository
+
+        discipline_repo = DisciplineRepository(self.db)
+        topic_repo = TopicRepository(self.db)
+        lesson_repo = LessonRepository(self.db)
+        question_repo = QuestionRepository(self.db)
+
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT d.id, d.name, d.description, pd.order_index as order_index,
+                       d.created_at, d.updated_at
+                FROM disciplines d
+                JOIN program_disciplines pd ON d.id = pd.discipline_id
+                WHERE pd.program_id = ?
+                ORDER BY pd.order_index, d.id
+            """, (program_id,))
+            disciplines = [discipline_repo._row_to_discipline(row) for row in cursor.fetchall()]
+            if not disciplines:
+                return []
+
+            cursor.execute("""
+                SELECT dt.discipline_id as parent_id,
+                       t.id, t.title, t.description, dt.order_index as order_index,
+                       t.created_at, t.updated_at
+                FROM discipline_topics dt
+                JOIN topics t ON t.id = dt.topic_id
+                WHERE dt.discipline_id IN (
+                    SELECT discipline_id FROM program_disciplines WHERE program_id = ?
+                )
+                ORDER BY dt.discipline_id, dt.order_index, t.id
+            """, (program_id,))
+            topics_by_parent: Dict[int, List[Topic]] = {}
+            for row in cursor.fetchall():
+                topics_by_parent.setdefault(row["parent_id"], []).append(topic_repo._row_to_topic(row))
+
+            cursor.execute("""
+                SELECT tl.topic_id as parent_id,
+                       l.id, l.title, l.description, l.duration_hours,
+                       l.lesson_type_id, lt.name as lesson_type_name,
+                       l.classroom_hours, l.self_study_hours,
+                       l.order_index, l.created_at, l.updated_at
+                FROM topic_lessons tl
+                JOIN lessons l ON l.id = tl.lesson_id
+                LEFT JOIN lesson_types lt ON l.lesson_type_id = lt.id
+                WHERE tl.topic_id IN (
+                    SELECT dt.topic_id
+                    FROM discipline_topics dt
+                    JOIN program_disciplines pd ON pd.discipline_id = dt.discipline_id
+                    WHERE pd.program_id = ?
+                )
+                ORDER BY tl.topic_id, tl.order_index, l.id
+            """, (program_id,))
+            lessons_by_parent: Dict[int, List[Lesson]] = {}
+            for row in cursor.fetchall():
+                lessons_by_parent.setdefault(row["parent_id"], []).append(lesson_repo._row_to_lesson(row))
+
+            cursor.execute("""
+                SELECT lq.lesson_id as parent_id,
+                       q.id, q.content, q.answer,
+                       q.order_index, q.created_at, q.updated_at
+                FROM lesson_questions lq
+                JOIN questions q ON q.id = lq.question_id
+                WHERE lq.lesson_id IN (
+                    SELECT tl.lesson_id
+                    FROM topic_lessons tl
+                    JOIN discipline_topics dt ON dt.topic_id = tl.topic_id
+                    JOIN program_disciplines pd ON pd.discipline_id = dt.discipline_id
+                    WHERE pd.program_id = ?
+                )
+                ORDER BY lq.lesson_id, CASE
+                    WHEN lq.order_index IS NULL OR lq.order_index = 0 THEN q.order_index
+                    ELSE lq.order_index
+                END, q.order_index, q.id
+            """, (program_id,))
+            question_rows: Dict[int, list] = {}
+            for row in cursor.fetchall():
+                question_rows.setdefault(row["parent_id"], []).append(row)
+
+        for discipline in disciplines:
+            discipline.topics = topics_by_parent.get(discipline.id, [])
+            for topic in discipline.topics:
+                topic.lessons = [replace(lesson) for lesson in lessons_by_parent.get(topic.id, [])]
+                for lesson in topic.lessons:
+                    lesson.questions = [
+                        question_repo._row_to_question(row) for row in question_rows.get(lesson.id, [])
+                    ]
+        return disciplines
+
+    def get_program_outline(self, program_id: int) -> Dict[Tuple[str, int], List[Tuple[int, str, int]]]:
+        """
+        Load the discipline, topic and lesson levels of a program for its tree.
+
+        One query per level, as in ``get_program_structure``; questions are
+        only counted.
+
+        Args:
+            program_id: ID of the program
+
+        Returns:
+            Dict[Tuple[str, int], List[Tuple[int, str, int]]]: (id, title, child count)
+            rows in display order, keyed by the (entity_type, id) of their parent
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT d.id, d.name
+                FROM disciplines d
+                JOIN program_disciplines pd ON d.id = pd.discipline_id
+                WHERE pd.program_id = ?
+                ORDER BY pd.order_index, d.id
+            """, (program_id,))
+            disciplines = cursor.fetchall()
+
+            cursor.execute("""
+                SELECT dt.discipline_id as parent_id, t.id, t.title
+                FROM discipline_topics dt
+                JOIN topics t ON t.id = dt.topic_id
+                WHERE dt.discipline_id IN (
+                    SELECT discipline_id FROM program_disciplines WHERE program_id = ?
+                )
+                ORDER BY dt.discipline_id, dt.order_index, t.id
+            """, (program_id,))
+            topics = cursor.fetchall()
+
+            cursor.execute("""
+                SELECT tl.topic_id as parent_id, l.id, l.title,
+                       (SELECT COUNT(*) FROM lesson_questions lq WHERE lq.lesson_id = l.id) as question_count
+                FROM topic_lessons tl
+                JOIN lessons l ON l.id = tl.lesson_id
+                WHERE tl.topic_id IN (
+                    SELECT dt.topic_id
+                    FROM discipline_topics dt
+                    JOIN program_disciplines pd ON pd.discipline_id = dt.discipline_id
+                    WHERE pd.program_id = ?
+                )
+                ORDER BY tl.topic_id, tl.order_index, l.id
+            """, (program_id,))
+            lessons = cursor.fetchall()
+
+        outline: Dict[Tuple[str, int], List[Tuple[int, str, int]]] = {}
+        for row in lessons:
+            outline.setdefault(("topic", row["parent_id"]), []).append(
+                (row["id"], row["title"], row["question_count"])
+            )
+        for row in topics:
+            outline.setdefault(("discipline", row["parent_id"]), []).append(
+                (row["id"], row["title"], len(outline.get(("topic", row["id"]), [])))
+            )
+        outline[("program", program_id)] = [
+            (row["id"], row["name"], len(outline.get(("discipline", row["id"]), []))) for row in disciplines
+        ]
+        return outline
+
     def get_programs_for_topic(self, topic_id: int) -> List[EducationalProgram]:
         """
         Get all programs that include a specific topic.
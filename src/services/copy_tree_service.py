@@ -33,25 +33,26 @@ class CopyTreeService:
         program = self.controller.program_repo.get_by_id(program_id)
         if not program:
             raise ValueError("Program not found.")
-        new_program = EducationalProgram(
-            name=self.controller.copy_name(program.name),
-            description=program.description,
-            level=program.level,
-            year=program.year,
-            duration_hours=program.duration_hours,
-        )
-        new_program = self.controller.program_repo.add(new_program)
-        material_map: dict[int, MethodicalMaterial] = {}
-        discipline_map: dict[int, Discipline] = {}
-        for discipline in self.controller.program_repo.get_program_disciplines(program_id):
-            new_discipline = self.copy_discipline_tree(discipline, new_program.id, material_map, discipline.order_index)
-            discipline_map[discipline.id] = new_discipline
-        for material in self.controller.material_repo.get_materials_for_entity("program", program_id):
-            discipline_id = next(iter(discipline_map.values())).id if discipline_map else None
-            if discipline_id is None:
-                continue
-            new_material = self.copy_material(material, new_program.id, discipline_id, material_map)
-            self.controller.material_repo.add_material_to_entity(new_material.id, "program", new_program.id)
+        with self.controller.db.deferred_fts():
+            new_program = EducationalProgram(
+                name=self.controller.copy_name(program.name),
+                description=program.description,
+                level=program.level,
+                year=program.year,
+                duration_hours=program.duration_hours,
+            )
+            new_program = self.controller.program_repo.add(new_program)
+            material_map: dict[int, MethodicalMaterial] = {}
+            discipline_map: dict[int, Discipline] = {}
+            for discipline in self.controller.program_repo.get_program_disciplines(program_id):
+                new_discipline = self.copy_discipline_tree(discipline, new_program.id, material_map, discipline.order_index)
+                discipline_map[discipline.id] = new_discipline
+            for material in self.controller.material_repo.get_materials_for_entity("program", program_id):
+                discipline_id = next(iter(discipline_map.values())).id if discipline_map else None
+                if discipline_id is None:
+                    continue
+                new_material = self.copy_material(material, new_program.id, discipline_id, material_map)
+                self.controller.material_repo.add_material_to_entity(new_material.id, "program", new_program.id)
         return new_program
 
     def duplicate_discipline(self, discipline_id: int, program_id: int) -> Discipline:
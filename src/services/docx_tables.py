@@ -0,0 +1,163 @@
+"""Streaming reader for paragraphs and table rows of .docx files."""
+from __future__ import annotations
+
+import zipfile
+from typing import Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY = f"{_W}body"
+_TBL = f"{_W}tbl"
+_TR = f"{_W}tr"
+_TC = f"{_W}tc"
+_P = f"{_W}p"
+_T = f"{_W}t"
+_TAB = f"{_W}tab"
+_BR = f"{_W}br"
+_CR = f"{_W}cr"
+_NO_BREAK_HYPHEN = f"{_W}noBreakHyphen"
+_GRID_SPAN = f"{_W}gridSpan"
+_V_MERGE = f"{_W}vMerge"
+_VAL = f"{_W}val"
+_TEXT_BOX = f"{_W}txbxContent"
+_RUN_TEXT = {_TAB: "\t", _BR: "\n", _CR: "\n", _NO_BREAK_HYPHEN: "-"}
+
+
+def iter_docx_blocks(path: str) -> Iterator[Tuple[Optional[int], List[str]]]:
+    """
+    Stream the top-level body content of a .docx file in document order.
+
+    ``word/document.xml`` is read with ``iterparse`` and every finished block
+    is released, so memory stays bounded by the largest row. Cell texts match
+    python-docx: paragraphs joined with newlines, horizontally merged cells
+    repeated for each grid column they span and vertically merged cells
+    repeating the text of the cell the merge started in.
+
+    Args:
+        path: Path to the .docx file
+
+    Yields:
+        Tuple[Optional[int], List[str]]: ``(table index, cell texts)`` per
+            table row, ``(None, [text])`` per body paragraph
+
+    Raises:
+        ValueError: If the file is not a readable .docx document
+    """
+    try:
+        archive = zipfile.ZipFile(path)
+    except (zipfile.BadZipFile, OSError) as exc:
+        raise ValueError("Failed to read .docx file.") from exc
+    with archive:
+        try:
+            stream = archive.open("word/document.xml")
+        except KeyError as exc:
+            raise ValueError("Failed to read .docx file.") from exc
+        with stream:
+            try:
+                yield from _iter_blocks(stream)
+            except ElementTree.ParseError as exc:
+                raise ValueError("Failed to read .docx file.") from exc
+
+
+def iter_docx_rows(path: str) -> Iterator[List[str]]:
+    """
+    Stream the non-empty rows of all tables, or the paragraphs if there are none.
+
+    Mirrors the rows the curriculum importer used to build from
+    ``docx.Document``: stripped cell texts per table row, or one single-cell
+    row per non-empty paragraph for documents without tables.
+    """
+    paragraphs: Optional[List[List[str]]] = []
+    for table_index, cells in iter_docx_blocks(path):
+        if table_index is None:
+            if paragraphs is not None and cells[0].strip():
+                paragraphs.append([cells[0].strip()])
+            continue
+        paragraphs = None
+        cells = [cell.strip() for cell in cells]
+        if any(cells):
+            yield cells
+    if paragraphs:
+        yield from paragraphs
+
+
+def _iter_blocks(stream) -> Iterator[Tuple[Optional[int], List[str]]]:  # noqa: ANN001
+    body = None
+    table_depth = 0
+    table_index = -1
+    text_box_depth = 0
+    paragraph_depth = 0
+    paragraph: List[str] = []
+    cell_paragraphs: List[str] = []
+    row: List[str] = []
+    column = 0
+    column_texts: dict = {}
+
+    for event, elem in ElementTree.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == _BODY:
+                body = elem
+            elif tag == _TBL:
+                table_depth += 1
+                if table_depth == 1:
+                    table_index += 1
+                    column_texts = {}
+            elif tag == _TEXT_BOX:
+                text_box_depth += 1
+            elif tag == _P:
+                paragraph_depth += 1
+                if paragraph_depth == 1:
+                    paragraph = []
+            elif table_depth == 1 and tag == _TR:
+                row = []
+                column = 0
+            elif table_depth == 1 and tag == _TC:
+                cell_paragraphs = []
+            continue
+
+        if tag == _T:
+            if paragraph_depth == 1 and not text_box_depth and elem.text:
+                paragraph.append(elem.text)
+        elif tag in _RUN_TEXT:
+            if paragraph_depth == 1 and not text_box_depth:
+                paragraph.append(_RUN_TEXT[tag])
+        elif tag == _TEXT_BOX:
+            text_box_depth -= 1
+        elif tag == _P:
+            paragraph_depth -= 1
+            if paragraph_depth == 0:
+                text = "".join(paragraph)
+                if table_depth == 0:
+                    yield None, [text]
+                elif table_depth == 1:
+                    cell_paragraphs.append(text)
+        elif table_depth == 1 and tag == _TC:
+            text = "\n".join(cell_paragraphs)
+            span = 1
+            merge = None
+            properties = elem.find(f"{_W}tcPr")
+            if properties is not None:
+                grid_span = properties.find(_GRID_SPAN)
+                if grid_span is not None:
+                    span = max(1, int(grid_span.get(_VAL, "1") or 1))
+                v_merge = properties.find(_V_MERGE)
+                if v_merge is not None:
+                    merge = v_merge.get(_VAL, "continue")
+            if merge == "continue":
+                text = column_texts.get(column, "")
+            for offset in range(span):
+                column_texts[column + offset] = text
+                row.append(text)
+            column += span
+            elem.clear()
+        elif table_depth == 1 and tag == _TR:
+            yield table_index, row
+            elem.clear()
+        elif tag == _TBL:
+            table_depth -= 1
+
+        if body is not None and table_depth == 0 and tag in (_P, _TBL) and paragraph_depth == 0:
+            # Drop finished top-level blocks so the tree never holds the whole document.
+            body.clear()
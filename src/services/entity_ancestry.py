@@ -0,0 +1,106 @@
+"""Batch breadcrumb lookups backed by the ``entity_ancestors`` closure table."""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.database import Database
+
+# Levels that can appear in a navigation path, top-down.
+NAVIGATION_LEVELS = ("program", "discipline", "topic", "lesson", "question")
+
+# (entity type, entity id) -> level -> (id, label); labels only exist for
+# programs, disciplines, topics and lessons.
+AncestryPaths = Dict[Tuple[str, int], Dict[str, Tuple[int, Optional[str]]]]
+
+ANCESTRY_LOOKUP_CHUNK_SIZE = 400
+
+
+def load_ancestry_paths(database: Database, entities: Iterable[Tuple[str, int]]) -> AncestryPaths:
+    """
+    Resolve the navigation path of many entities with one query per chunk.
+
+    Each entity maps to itself plus the first ancestor (by name) on every
+    level above it, matching the ``get_*_for_*`` repository lookups. A
+    material resolves through its first association, like
+    ``MaterialRepository.get_material_associations``.
+
+    Args:
+        database: Database to read
+        entities: (entity_type, entity_id) pairs, e.g. search hits
+
+    Returns:
+        AncestryPaths: Path per requested entity; entities without any
+            resolvable level are missing
+    """
+    unique = list(dict.fromkeys((entity_type, int(entity_id)) for entity_type, entity_id in entities))
+    paths: AncestryPaths = {}
+    if not unique:
+        return paths
+    with database.get_connection() as conn:
+        cursor = conn.cursor()
+        for start in range(0, len(unique), ANCESTRY_LOOKUP_CHUNK_SIZE):
+            chunk = unique[start:start + ANCESTRY_LOOKUP_CHUNK_SIZE]
+            values = ", ".join(["(?, ?)"] * len(chunk))
+            cursor.execute(f"""
+                WITH targets(entity_type, entity_id) AS (VALUES {values}),
+                anchors AS (
+                    SELECT entity_type, entity_id, entity_type AS anchor_type, entity_id AS anchor_id
+                    FROM targets
+                    WHERE entity_type != 'material'
+                    UNION ALL
+                    SELECT t.entity_type, t.entity_id, ma.entity_type, ma.entity_id
+                    FROM targets t
+                    JOIN material_associations ma ON ma.material_id = t.entity_id
+                    WHERE t.entity_type = 'material'
+                      AND (ma.entity_type, ma.entity_id) = (
+                          SELECT entity_type, entity_id FROM material_associations
+                          WHERE material_id = t.entity_id
+                          ORDER BY entity_type, entity_id
+                          LIMIT 1
+                      )
+                ),
+                path AS (
+                    SELECT entity_type, entity_id, anchor_type AS level, anchor_id AS level_id
+                    FROM anchors
+                    UNION ALL
+                    SELECT an.entity_type, an.entity_id, ea.ancestor_type, ea.ancestor_id
+                    FROM anchors an
+                    JOIN entity_ancestors ea
+                        ON ea.entity_type = an.anchor_type AND ea.entity_id = an.anchor_id
+                )
+                SELECT path.entity_type, path.entity_id, path.level, path.level_id,
+                       COALESCE(p.name, d.name, t.title, l.title) AS label
+                FROM path
+                LEFT JOIN educational_programs p ON path.level = 'program' AND p.id = path.level_id
+                LEFT JOIN disciplines d ON path.level = 'discipline' AND d.id = path.level_id
+                LEFT JOIN topics t ON path.level = 'topic' AND t.id = path.level_id
+                LEFT JOIN lessons l ON path.level = 'lesson' AND l.id = path.level_id
+            """, [value for pair in chunk for value in pair])
+            for row in cursor.fetchall():
+                path = paths.setdefault((row["entity_type"], row["entity_id"]), {})
+                level = row["level"]
+                candidate = (row["level_id"], row["label"])
+                current = path.get(level)
+                if current is None or _sort_key(candidate) < _sort_key(current):
+                    path[level] = candidate
+    return paths
+
+
+def navigation_target(path: Optional[Dict[str, Tuple[int, Optional[str]]]]) -> Dict[str, Optional[int]]:
+    """Return the ``{level}_id`` mapping used to select a node in the content tree."""
+    path = path or {}
+    return {f"{level}_id": path[level][0] if level in path else None for level in NAVIGATION_LEVELS}
+
+
+def breadcrumb(path: Optional[Dict[str, Tuple[int, Optional[str]]]]) -> List[Tuple[str, str]]:
+    """Return (entity_type, name) pairs from the program down to the lesson."""
+    path = path or {}
+    return [
+        (level, path[level][1])
+        for level in NAVIGATION_LEVELS
+        if level in path and path[level][1] is not None
+    ]
+
+
+def _sort_key(entry: Tuple[int, Optional[str]]) -> Tuple[str, int]:
+    return entry[1] or "", entry[0]
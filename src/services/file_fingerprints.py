@@ -0,0 +1,176 @@
+"""Persistent CRC32 fingerprints of material files."""
+from __future__ import annotations
+
+import os
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.database import Database
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_crc32(path: Path) -> int:
+    """Return the CRC32 of a file read in 1 MB chunks."""
+    checksum = 0
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            checksum = zlib.crc32(chunk, checksum)
+    return checksum & 0xFFFFFFFF
+
+
+def material_file_location(
+    relative_path: Optional[str], file_path: Optional[str], files_root: Path
+) -> Optional[Tuple[str, Path]]:
+    """Return (fingerprint key, absolute path) of a material file, if it has one."""
+    if relative_path:
+        return relative_path.replace("\\", "/"), files_root / relative_path
+    if file_path:
+        path = Path(file_path)
+        if not path.is_absolute():
+            path = files_root / file_path
+        return str(path), path
+    return None
+
+
+class FileFingerprintCache:
+    """CRC32 of material files keyed by (path key, size, mtime_ns).
+
+    Fingerprints are stored in the ``material_file_fingerprints`` table of
+    the database the files belong to, so a file is hashed again only after
+    its size or modification time changes. ``prefetch`` hashes unknown files
+    on a thread pool; ``crc32`` picks up those results or hashes inline.
+    """
+
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(self, database: Database, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Initialize fingerprint cache.
+
+        Args:
+            database: Database holding the fingerprint table
+            max_workers: Size of the background hashing pool
+        """
+        self.db = database
+        self.max_workers = max(1, int(max_workers))
+        self._known: Optional[Dict[str, Tuple[int, int, int]]] = None
+        self._pending: Dict[Tuple[str, int, int], Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def crc32(self, key: str, path: Path) -> int:
+        """
+        Return the CRC32 of ``path``, reusing the stored value when unchanged.
+
+        Args:
+            key: Stable identifier of the file (relative path under the files root)
+            path: Absolute location of the file
+
+        Returns:
+            int: CRC32 of the file contents, or 0 if it cannot be read
+        """
+        stamp = self._stat(path)
+        if stamp is None:
+            return 0
+        size, mtime_ns = stamp
+        known = self._load_known().get(key)
+        if known is not None and known[:2] == stamp:
+            return known[2]
+        with self._lock:
+            future = self._pending.pop((key, size, mtime_ns), None)
+        try:
+            crc = future.result() if future is not None else file_crc32(path)
+        except OSError:
+            return 0
+        self._store([(key, size, mtime_ns, crc)])
+        return crc
+
+    def prefetch(self, files: Iterable[Tuple[str, Path]]) -> int:
+        """
+        Start hashing files without a valid stored fingerprint in the background.
+
+        Args:
+            files: (key, absolute path) pairs
+
+        Returns:
+            int: Number of files queued for hashing
+        """
+        known = self._load_known()
+        queued = 0
+        for key, path in files:
+            stamp = self._stat(path)
+            if stamp is None:
+                continue
+            entry = known.get(key)
+            if entry is not None and entry[:2] == stamp:
+                continue
+            pending_key = (key, stamp[0], stamp[1])
+            with self._lock:
+                if pending_key in self._pending:
+                    continue
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="file-fingerprint",
+                    )
+                self._pending[pending_key] = self._executor.submit(file_crc32, path)
+            queued += 1
+        return queued
+
+    def flush(self) -> int:
+        """Persist fingerprints of finished background hashes; return how many were stored."""
+        with self._lock:
+            done = [(key, future) for key, future in self._pending.items() if future.done()]
+            for key, _future in done:
+                del self._pending[key]
+        rows = []
+        for (key, size, mtime_ns), future in done:
+            if future.exception() is None:
+                rows.append((key, size, mtime_ns, future.result()))
+        self._store(rows)
+        return len(rows)
+
+    def shutdown(self) -> None:
+        """Drop queued work and stop the hashing pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load_known(self) -> Dict[str, Tuple[int, int, int]]:
+        if self._known is None:
+            with self.db.get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT path_key, file_size, mtime_ns, crc32 FROM material_file_fingerprints"
+                ).fetchall()
+            self._known = {row[0]: (row[1], row[2], row[3]) for row in rows}
+        return self._known
+
+    def _store(self, rows: List[Tuple[str, int, int, int]]) -> None:
+        if not rows:
+            return
+        with self.db.get_connection() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO material_file_fingerprints (path_key, file_size, mtime_ns, crc32)
+                VALUES (?, ?, ?, ?)
+                """,
+                rows,
+            )
+        known = self._load_known()
+        for key, size, mtime_ns, crc in rows:
+            known[key] = (size, mtime_ns, crc)
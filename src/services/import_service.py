@@ -1,17 +1,20 @@
 """Curriculum import parsing and insertion logic."""
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
+import os
 import re
 import shutil
 import subprocess
 import locale
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..models.database import Database
 from ..models.entities import Teacher
+from .docx_tables import iter_docx_blocks, iter_docx_rows
 
 
 @dataclass
@@ -60,6 +63,8 @@ class BatchImportPlanItem:
     summary: CurriculumPreviewSummary
 
 
+BATCH_PARSE_MAX_WORKERS = 8
+
 LESSON_TYPE_KEYWORDS = [
     ("контрольне заняття", "Контрольне заняття"),
     ("групове заняття", "Групове заняття"),
@@ -86,10 +91,37 @@ def parse_curriculum_text(text: str) -> List[CurriculumTopic]:
 
     delimiter = _detect_delimiter(lines)
     rows = [_split_row(line, delimiter) for line in lines]
+    return _parse_curriculum_rows(rows, text)
+
+
+def parse_curriculum_rows(rows: Iterable[List[str]]) -> List[CurriculumTopic]:
+    """
+    Parse curriculum table rows given as lists of cell texts.
+
+    Same rules as ``parse_curriculum_text``, but cells may span several
+    lines (lesson title followed by its numbered questions), as they do in
+    Word tables.
+    """
+    rows = [[cell.strip() for cell in row] for row in rows]
+    rows = [row for row in rows if any(row)]
+    if not rows:
+        raise ValueError("Empty input.")
+    return _parse_curriculum_rows(rows, None)
+
 
+def parse_curriculum_file(path: str) -> List[CurriculumTopic]:
+    """Parse a curriculum file; .docx tables are streamed row by row into the parser."""
+    if Path(path).suffix.lower() == ".docx":
+        return parse_curriculum_rows(iter_docx_rows(path))
+    return parse_curriculum_text(extract_text_from_file(path))
+
+
+def _parse_curriculum_rows(rows: List[List[str]], text: Optional[str]) -> List[CurriculumTopic]:
     header_idx = _find_header_row(rows)
     if header_idx is None:
         # Fallback: parse free-form text with "Тема X. Назва" and "Заняття X. Назва"
+        if text is None:
+            text = "\n".join("\t".join(row) for row in rows)
         return _parse_freeform_curriculum(text)
 
     headers = [_normalize_header(cell) for cell in rows[header_idx]]
@@ -195,31 +227,97 @@ def preview_curriculum_text(text: str) -> Tuple[List[CurriculumTopic], Curriculu
     return topics, summarize_curriculum_topics(topics)
 
 
-def build_batch_import_plan(paths: List[str]) -> List[BatchImportPlanItem]:
-    """Parse files and derive batch import targets from filenames before writing to DB."""
+def build_batch_import_plan(
+    paths: List[str],
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+    errors: Optional[List[str]] = None,
+) -> List[BatchImportPlanItem]:
+    """
+    Parse files and derive batch import targets from filenames before writing to DB.
+
+    Files are parsed in worker processes when there is more than one; the
+    plan keeps the order of ``paths`` regardless of completion order.
+
+    Args:
+        paths: Curriculum files to parse
+        max_workers: Parser process count (defaults to the CPU count, capped
+            at ``BATCH_PARSE_MAX_WORKERS``); 1 parses in this process
+        progress: Called as ``progress(done, total, path)`` after each file
+        errors: When given, receives one message per failing file and the
+            plan holds the remaining files instead of raising
+
+    Returns:
+        List[BatchImportPlanItem]: One item per parsed path, in input order
+
+    Raises:
+        ValueError: If no paths are given, or any file fails to parse and
+            ``errors`` is omitted; the message lists every failing file
+    """
     if not paths:
         raise ValueError("No files selected for batch import.")
-    plan: List[BatchImportPlanItem] = []
-    for path in paths:
-        content = extract_text_from_file(path)
-        topics = parse_curriculum_text(content)
-        program_name, discipline_name = program_discipline_from_filename(path)
-        if not discipline_name:
-            discipline_name = program_name
-        program_name = (program_name or "").strip()
-        discipline_name = (discipline_name or "").strip()
-        if not program_name or not discipline_name:
-            raise ValueError(f"Could not derive program/discipline names from filename: {Path(path).name}")
-        plan.append(
-            BatchImportPlanItem(
-                path=path,
-                program_name=program_name,
-                discipline_name=discipline_name,
-                topics=topics,
-                summary=summarize_curriculum_topics(topics),
-            )
-        )
-    return plan
+    total = len(paths)
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, BATCH_PARSE_MAX_WORKERS)
+    max_workers = max(1, min(int(max_workers), total))
+
+    items: List[Optional[BatchImportPlanItem]] = [None] * total
+    failures: Dict[int, str] = {}
+    outcomes = _parse_batch_import_files(paths, max_workers)
+    for done, (index, item, error) in enumerate(outcomes, start=1):
+        if error is None:
+            items[index] = item
+        else:
+            failures[index] = f"{Path(paths[index]).name}: {error}"
+        if progress is not None:
+            progress(done, total, paths[index])
+
+    messages = [failures[index] for index in sorted(failures)]
+    if errors is not None:
+        errors.extend(messages)
+    elif messages:
+        raise ValueError("\n".join(messages))
+    return [item for item in items if item is not None]
+
+
+def _parse_batch_import_files(
+    paths: List[str], max_workers: int
+) -> Iterator[Tuple[int, Optional[BatchImportPlanItem], Optional[str]]]:
+    """Yield (path index, plan item, error) per file in completion order."""
+    if max_workers == 1:
+        for index, path in enumerate(paths):
+            yield (index, *_try_parse_batch_import_file(path))
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_try_parse_batch_import_file, path): index for index, path in enumerate(paths)}
+        for future in as_completed(futures):
+            yield (futures[future], *future.result())
+
+
+def _try_parse_batch_import_file(path: str) -> Tuple[Optional[BatchImportPlanItem], Optional[str]]:
+    """Parse one file, returning the error text instead of raising (runs in a worker process)."""
+    try:
+        return _parse_batch_import_file(path), None
+    except (ValueError, OSError) as exc:
+        return None, str(exc)
+
+
+def _parse_batch_import_file(path: str) -> BatchImportPlanItem:
+    topics = parse_curriculum_file(path)
+    program_name, discipline_name = program_discipline_from_filename(path)
+    if not discipline_name:
+        discipline_name = program_name
+    program_name = (program_name or "").strip()
+    discipline_name = (discipline_name or "").strip()
+    if not program_name or not discipline_name:
+        raise ValueError(f"Could not derive program/discipline names from filename: {Path(path).name}")
+    return BatchImportPlanItem(
+        path=path,
+        program_name=program_name,
+        discipline_name=discipline_name,
+        topics=topics,
+        summary=summarize_curriculum_topics(topics),
+    )
 
 
 def _parse_freeform_curriculum(text: str) -> List[CurriculumTopic]:
@@ -286,17 +384,18 @@ def extract_text_from_file(path: str) -> str:
 
 
 def parse_teachers_from_docx(path: str) -> List[Teacher]:
-    try:
-        from docx import Document
-    except ImportError as exc:
-        raise ValueError("python-docx is required to import .docx files.") from exc
-
-    doc = Document(path)
-    if not doc.tables:
+    rows: List[List[str]] = []
+    has_table = False
+    for table_index, cells in iter_docx_blocks(path):
+        if table_index is None:
+            continue
+        if table_index > 0:
+            break
+        has_table = True
+        rows.append([cell.strip() for cell in cells])
+    if not has_table:
         raise ValueError("No tables found in .docx file.")
 
-    table = doc.tables[0]
-    rows = [[cell.text.strip() for cell in row.cells] for row in table.rows]
     rows = [row for row in rows if any(cell for cell in row)]
     if not rows:
         raise ValueError("Empty table in .docx file.")
@@ -395,8 +494,9 @@ def import_curriculum_structure(
         raise ValueError("No topics to import.")
     _validate_curriculum_topics(topics)
 
-    with database.get_connection() as conn:
+    with database.deferred_fts(), database.get_connection() as conn:
         cursor = conn.cursor()
+        _begin_immediate(cursor)
         discipline_id = _ensure_discipline(cursor, program_id, discipline_id, new_discipline_name)
         return _import_with_cursor(cursor, discipline_id, topics)
 
@@ -412,8 +512,9 @@ def import_curriculum_structure_by_names(
     if not discipline_name:
         raise ValueError("Discipline name is required.")
     _validate_curriculum_topics(topics)
-    with database.get_connection() as conn:
+    with database.deferred_fts(), database.get_connection() as conn:
         cursor = conn.cursor()
+        _begin_immediate(cursor)
         program_id = _ensure_program(cursor, program_name)
         discipline_id = _ensure_discipline_by_name(cursor, program_id, discipline_name)
         return _import_with_cursor(cursor, discipline_id, topics)
@@ -428,11 +529,23 @@ def program_discipline_from_filename(path: str) -> Tuple[str, Optional[str]]:
 
 
 def _import_with_cursor(cursor, discipline_id: int, topics: List[CurriculumTopic]) -> Tuple[int, int, int]:
+    """
+    Import topics into a discipline as one set-based write.
+
+    Existing topics, lessons, question keys and lesson order indexes of the
+    discipline are loaded once; new rows get explicit IDs in memory and are
+    written with ``executemany``. Callers run it under
+    ``Database.deferred_fts`` so the new rows are indexed in one pass.
+    """
     lesson_type_map = _ensure_lesson_types(cursor)
 
     existing_topics = _load_existing_topics(cursor, discipline_id)
     existing_lessons = _load_existing_lessons(cursor, discipline_id)
+    existing_questions = _load_existing_question_keys(cursor, discipline_id)
+    max_lesson_orders = _load_max_lesson_orders(cursor, discipline_id)
 
+    batch = _ImportBatch(cursor)
+    pending_lessons: Dict[int, list] = {}
     topics_added = 0
     lessons_added = 0
     questions_added = 0
@@ -442,49 +555,41 @@ def _import_with_cursor(cursor, discipline_id: int, topics: List[CurriculumTopic
         if topic_key in existing_topics:
             topic_id = existing_topics[topic_key]
         else:
-            cursor.execute(
-                "INSERT INTO topics (title, description, order_index) VALUES (?, ?, ?)",
-                (topic.title, "", topic_index),
-            )
-            topic_id = cursor.lastrowid
-            cursor.execute(
-                "INSERT OR IGNORE INTO discipline_topics (discipline_id, topic_id, order_index) VALUES (?, ?, ?)",
-                (discipline_id, topic_id, topic_index),
-            )
+            topic_id = batch.add("topics", [topic.title, "", topic_index])
+            batch.link("discipline_topics", (discipline_id, topic_id, topic_index))
             existing_topics[topic_key] = topic_id
             topics_added += 1
 
-        lesson_order = _get_next_order_index(cursor, "topic_lessons", "topic_id", topic_id)
+        lesson_order = max_lesson_orders.get(topic_id, 0) + 1
         for lesson in topic.lessons:
             lesson_key = (topic_id, _key(lesson.title))
             if lesson_key in existing_lessons:
                 lesson_id, lesson_data = existing_lessons[lesson_key]
-                _update_lesson_if_missing(cursor, lesson_id, lesson, lesson_type_map, lesson_data)
+                updates = _missing_lesson_fields(lesson, lesson_type_map, lesson_data)
+                if updates and lesson_id in pending_lessons:
+                    # Not written yet: fill the gaps in the queued row (index 0 is the ID).
+                    row = pending_lessons[lesson_id]
+                    for column, value in updates.items():
+                        row[1 + _LESSON_COLUMNS.index(column)] = value
+                elif updates:
+                    set_clause = ", ".join(f"{column} = ?" for column in updates)
+                    cursor.execute(f"UPDATE lessons SET {set_clause} WHERE id = ?", [*updates.values(), lesson_id])
             else:
                 lesson_type_id = lesson_type_map.get(lesson.lesson_type_name)
-                cursor.execute(
-                    """
-                    INSERT INTO lessons (
-                        title, description, duration_hours, lesson_type_id,
-                        classroom_hours, self_study_hours, order_index
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        lesson.title,
-                        "",
-                        lesson.total_hours or 0.0,
-                        lesson_type_id,
-                        lesson.classroom_hours,
-                        lesson.self_study_hours,
-                        lesson.number or lesson_order,
-                    ),
-                )
-                lesson_id = cursor.lastrowid
-                cursor.execute(
-                    "INSERT OR IGNORE INTO topic_lessons (topic_id, lesson_id, order_index) VALUES (?, ?, ?)",
-                    (topic_id, lesson_id, lesson.number or lesson_order),
-                )
+                order_index = lesson.number or lesson_order
+                row = [
+                    lesson.title,
+                    "",
+                    lesson.total_hours or 0.0,
+                    lesson_type_id,
+                    lesson.classroom_hours,
+                    lesson.self_study_hours,
+                    order_index,
+                ]
+                lesson_id = batch.add("lessons", row)
+                pending_lessons[lesson_id] = batch.rows["lessons"][-1]
+                batch.link("topic_lessons", (topic_id, lesson_id, order_index))
+                max_lesson_orders[topic_id] = max(max_lesson_orders.get(topic_id, 0), order_index)
                 existing_lessons[lesson_key] = (
                     lesson_id,
                     {
@@ -497,11 +602,102 @@ def _import_with_cursor(cursor, discipline_id: int, topics: List[CurriculumTopic
                 lessons_added += 1
             lesson_order += 1
 
-            questions_added += _insert_questions(cursor, lesson_id, lesson.questions)
-
+            question_keys = existing_questions.setdefault(lesson_id, set())
+            added = 0
+            for question in lesson.questions:
+                content = _normalize_text(question.text)
+                if _key(content) in question_keys:
+                    continue
+                order_index = question.number or added + 1
+                question_id = batch.add("questions", [content, "", order_index])
+                batch.link("lesson_questions", (lesson_id, question_id, order_index))
+                question_keys.add(_key(content))
+                added += 1
+            questions_added += added
+
+    batch.write()
     return topics_added, lessons_added, questions_added
 
 
+_LESSON_COLUMNS = (
+    "title",
+    "description",
+    "duration_hours",
+    "lesson_type_id",
+    "classroom_hours",
+    "self_study_hours",
+    "order_index",
+)
+
+# table -> columns written by the import (besides the explicit ID)
+_IMPORT_TABLES = {
+    "topics": ("title", "description", "order_index"),
+    "lessons": _LESSON_COLUMNS,
+    "questions": ("content", "answer", "order_index"),
+}
+
+_IMPORT_LINK_TABLES = {
+    "discipline_topics": ("discipline_id", "topic_id", "order_index"),
+    "topic_lessons": ("topic_id", "lesson_id", "order_index"),
+    "lesson_questions": ("lesson_id", "question_id", "order_index"),
+}
+
+
+class _ImportBatch:
+    """New entity and link rows of one import, written in a single pass."""
+
+    def __init__(self, cursor):  # noqa: ANN001
+        self.cursor = cursor
+        self.rows: Dict[str, List[list]] = {table: [] for table in _IMPORT_TABLES}
+        self.links: Dict[str, List[tuple]] = {table: [] for table in _IMPORT_LINK_TABLES}
+        self._next_ids: Dict[str, int] = {}
+
+    def add(self, table: str, values: list) -> int:
+        if table not in self._next_ids:
+            self._next_ids[table] = _next_row_id(self.cursor, table)
+        row_id = self._next_ids[table]
+        self._next_ids[table] = row_id + 1
+        self.rows[table].append([row_id, *values])
+        return row_id
+
+    def link(self, table: str, values: tuple) -> None:
+        self.links[table].append(values)
+
+    def write(self) -> None:
+        for table in ("topics", "discipline_topics", "lessons", "topic_lessons", "questions", "lesson_questions"):
+            if table in _IMPORT_TABLES:
+                columns = ("id", *_IMPORT_TABLES[table])
+                rows = self.rows[table]
+                verb = "INSERT"
+            else:
+                columns = _IMPORT_LINK_TABLES[table]
+                rows = self.links[table]
+                verb = "INSERT OR IGNORE"
+            if rows:
+                placeholders = ", ".join("?" * len(columns))
+                self.cursor.executemany(
+                    f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                    rows,
+                )
+
+
+def _begin_immediate(cursor) -> None:  # noqa: ANN001
+    """Take the write lock before reading, so the IDs an import allocates stay free until it commits."""
+    if not cursor.connection.in_transaction:
+        cursor.execute("BEGIN IMMEDIATE")
+
+
+def _next_row_id(cursor, table: str) -> int:
+    """Return the ID AUTOINCREMENT would assign next in ``table``; see ``_begin_immediate``."""
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    row = cursor.fetchone()
+    seq = row["seq"] if row and row["seq"] is not None else 0
+    cursor.execute(f"SELECT MAX(id) as max_id FROM {table}")
+    row = cursor.fetchone()
+    max_id = row["max_id"] if row and row["max_id"] is not None else 0
+    return max(seq, max_id) + 1
+
+
 def _detect_delimiter(lines: List[str]) -> str:
     if any("\t" in line for line in lines):
         return "\t"
@@ -534,25 +730,7 @@ def _read_text_file(path: str) -> str:
 
 
 def _extract_from_docx(path: str) -> str:
-    try:
-        from docx import Document
-    except ImportError as exc:
-        raise ValueError("python-docx is required to import .docx files.") from exc
-
-    doc = Document(path)
-    lines: List[str] = []
-    if doc.tables:
-        for table in doc.tables:
-            for row in table.rows:
-                cells = [cell.text.strip() for cell in row.cells]
-                if any(cells):
-                    lines.append("\t".join(cells))
-    else:
-        for para in doc.paragraphs:
-            text = para.text.strip()
-            if text:
-                lines.append(text)
-    return "\n".join(lines)
+    return "\n".join("\t".join(cells) for cells in iter_docx_rows(path))
 
 
 def _extract_from_doc(path: str) -> str:
@@ -927,7 +1105,39 @@ def _load_existing_lessons(cursor, discipline_id: int) -> Dict[Tuple[int, str],
     return results
 
 
-def _update_lesson_if_missing(cursor, lesson_id: int, lesson: CurriculumLesson, lesson_types, existing):
+def _load_existing_question_keys(cursor, discipline_id: int) -> Dict[int, set]:
+    cursor.execute(
+        """
+        SELECT DISTINCT lq.lesson_id, q.content
+        FROM questions q
+        JOIN lesson_questions lq ON q.id = lq.question_id
+        JOIN topic_lessons tl ON tl.lesson_id = lq.lesson_id
+        JOIN discipline_topics dt ON tl.topic_id = dt.topic_id
+        WHERE dt.discipline_id = ?
+        """,
+        (discipline_id,),
+    )
+    results: Dict[int, set] = {}
+    for row in cursor.fetchall():
+        results.setdefault(row["lesson_id"], set()).add(_key(row["content"]))
+    return results
+
+
+def _load_max_lesson_orders(cursor, discipline_id: int) -> Dict[int, int]:
+    cursor.execute(
+        """
+        SELECT tl.topic_id, MAX(tl.order_index) as max_order
+        FROM topic_lessons tl
+        JOIN discipline_topics dt ON tl.topic_id = dt.topic_id
+        WHERE dt.discipline_id = ?
+        GROUP BY tl.topic_id
+        """,
+        (discipline_id,),
+    )
+    return {row["topic_id"]: row["max_order"] or 0 for row in cursor.fetchall()}
+
+
+def _missing_lesson_fields(lesson: CurriculumLesson, lesson_types, existing) -> Dict[str, object]:
     updates = {}
     if lesson.lesson_type_name and not existing.get("lesson_type_id"):
         updates["lesson_type_id"] = lesson_types.get(lesson.lesson_type_name)
@@ -937,47 +1147,7 @@ def _update_lesson_if_missing(cursor, lesson_id: int, lesson: CurriculumLesson,
         updates["classroom_hours"] = lesson.classroom_hours
     if lesson.self_study_hours is not None and not existing.get("self_study_hours"):
         updates["self_study_hours"] = lesson.self_study_hours
-    if not updates:
-        return
-    set_clause = ", ".join(f"{key} = ?" for key in updates.keys())
-    values = list(updates.values())
-    values.append(lesson_id)
-    cursor.execute(f"UPDATE lessons SET {set_clause} WHERE id = ?", values)
-
-
-def _insert_questions(cursor, lesson_id: int, questions: List[CurriculumQuestion]) -> int:
-    if not questions:
-        return 0
-    cursor.execute(
-        """
-        SELECT q.content
-        FROM questions q
-        JOIN lesson_questions lq ON q.id = lq.question_id
-        WHERE lq.lesson_id = ?
-        """,
-        (lesson_id,),
-    )
-    existing = {_key(row["content"]) for row in cursor.fetchall()}
-    added = 0
-    for question in questions:
-        content = _normalize_text(question.text)
-        if _key(content) in existing:
-            continue
-        cursor.execute(
-            """
-            INSERT INTO questions (content, answer, order_index)
-            VALUES (?, ?, ?)
-            """,
-            (content, "", question.number or added + 1),
-        )
-        question_id = cursor.lastrowid
-        cursor.execute(
-            "INSERT OR IGNORE INTO lesson_questions (lesson_id, question_id, order_index) VALUES (?, ?, ?)",
-            (lesson_id, question_id, question.number or added + 1),
-        )
-        existing.add(_key(content))
-        added += 1
-    return added
+    return updates
 
 
 def _get_next_order_index(cursor, table: str, column: str, value: int) -> int:
@@ -4,12 +4,34 @@ from __future__ import annotations
 import json
 import re
 from datetime import datetime
-from typing import Callable
+from typing import Callable, Iterator
 from uuid import uuid4
 
 from .internet_sync_schema import ENTITY_TABLES, LINK_TABLES, MYSQL_SYNC_SCHEMA_DDL
 
 
+class _PendingRows:
+    """Rows buffered until a batch is large enough for one executemany."""
+
+    def __init__(self, write: Callable[[list[dict]], int | None], batch_size: int):
+        self._write = write
+        self.batch_size = batch_size
+        self.rows: list[dict] = []
+        self.written = 0
+
+    def add(self, row: dict) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        rows, self.rows = self.rows, []
+        written = self._write(rows)
+        self.written += len(rows) if written is None else written
+
+
 class InternetSyncService:
     """Encapsulates SQLite <-> MySQL synchronization logic."""
 
@@ -18,6 +40,48 @@ class InternetSyncService:
     ENTITY_TABLES = ENTITY_TABLES
     LINK_TABLES = LINK_TABLES
 
+    # Rows fetched per page on each side of the entity merge-join.
+    SYNC_CHUNK_SIZE = 500
+    # Rows written per executemany batch.
+    SYNC_BATCH_SIZE = 1000
+
+    def __init__(self):
+        # (side, kind, table) -> column names; reset at the start of each sync phase.
+        self._metadata: dict[tuple[str, str, str], list[str]] = {}
+
+    def reset_metadata_cache(self) -> None:
+        self._metadata.clear()
+
+    def _forget_metadata(self, table: str) -> None:
+        for key in [key for key in self._metadata if key[2] == table]:
+            del self._metadata[key]
+
+    def _cached_metadata(self, side: str, kind: str, table: str, loader: Callable[[], list[str]]) -> list[str]:
+        key = (side, kind, table)
+        if key not in self._metadata:
+            self._metadata[key] = loader()
+        return list(self._metadata[key])
+
+    def cached_sqlite_table_columns(self, sqlite_conn, table: str) -> list[str]:  # noqa: ANN001
+        return self._cached_metadata(
+            "sqlite", "columns", table, lambda: self.sqlite_table_columns(sqlite_conn, table)
+        )
+
+    def cached_mysql_table_columns(self, mysql_conn, table: str) -> list[str]:  # noqa: ANN001
+        return self._cached_metadata(
+            "mysql", "columns", table, lambda: self.mysql_table_columns(mysql_conn, table)
+        )
+
+    def cached_sqlite_primary_keys(self, sqlite_conn, table: str) -> list[str]:  # noqa: ANN001
+        return self._cached_metadata(
+            "sqlite", "primary_keys", table, lambda: self.sqlite_primary_keys(sqlite_conn, table)
+        )
+
+    def cached_mysql_primary_keys(self, mysql_conn, table: str) -> list[str]:  # noqa: ANN001
+        return self._cached_metadata(
+            "mysql", "primary_keys", table, lambda: self.mysql_primary_keys(mysql_conn, table)
+        )
+
     def internet_sync_tables(self) -> list[str]:
         return self.ENTITY_TABLES + self.LINK_TABLES
 
@@ -72,6 +136,95 @@ class InternetSyncService:
             columns = list(rows[0].keys())
         return columns, rows
 
+    def iter_sqlite_rows_by_uuid(self, sqlite_conn, table: str, chunk_size: int) -> Iterator[list[dict]]:  # noqa: ANN001
+        """Yield pages of rows with a sync_uuid in ascending sync_uuid order."""
+        table_sql = self._sqlite_ident(table)
+        last_uuid = ""
+        while True:
+            cursor = sqlite_conn.cursor()
+            cursor.execute(
+                f"SELECT * FROM {table_sql} WHERE sync_uuid IS NOT NULL AND sync_uuid > ? "
+                "ORDER BY sync_uuid LIMIT ?",
+                (last_uuid, chunk_size),
+            )
+            rows = [dict(row) for row in cursor.fetchall()]
+            if not rows:
+                return
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            last_uuid = rows[-1]["sync_uuid"]
+
+    def iter_mysql_rows_by_uuid(self, mysql_conn, table: str, chunk_size: int) -> Iterator[list[dict]]:  # noqa: ANN001
+        """Yield pages of rows with a sync_uuid in ascending sync_uuid order.
+
+        Each page is streamed through an unbuffered cursor and fully drained
+        before it is yielded, so the connection is free for writes between
+        pages.
+        """
+        from pymysql.cursors import SSDictCursor
+
+        table_sql = self._mysql_ident(table)
+        last_uuid = ""
+        while True:
+            with mysql_conn.cursor(SSDictCursor) as cursor:
+                cursor.execute(
+                    f"SELECT * FROM {table_sql} WHERE sync_uuid IS NOT NULL AND sync_uuid > %s "
+                    "ORDER BY sync_uuid LIMIT %s",
+                    (last_uuid, chunk_size),
+                )
+                rows = list(cursor.fetchall_unbuffered())
+            if not rows:
+                return
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            last_uuid = rows[-1]["sync_uuid"]
+
+    def merge_rows_by_uuid(
+        self,
+        local_pages: Iterator[list[dict]],
+        remote_pages: Iterator[list[dict]],
+    ) -> Iterator[tuple[str, dict | None, dict | None]]:
+        """
+        Merge-join two page streams sorted by sync_uuid.
+
+        Yields ``(sync_uuid, local_row, remote_row)`` with ``None`` on the side
+        that lacks the row. A page is only requested once every row of the
+        previous page has been matched, so at most one page per side is held
+        in memory.
+
+        Raises:
+            ValueError: If either stream is not sorted by sync_uuid
+        """
+        local_rows = self._iter_ordered_rows(local_pages, "local")
+        remote_rows = self._iter_ordered_rows(remote_pages, "remote")
+        local_row = next(local_rows, None)
+        remote_row = next(remote_rows, None)
+        while local_row is not None or remote_row is not None:
+            local_uuid = local_row["sync_uuid"] if local_row is not None else None
+            remote_uuid = remote_row["sync_uuid"] if remote_row is not None else None
+            if remote_row is None or (local_row is not None and local_uuid < remote_uuid):
+                yield local_uuid, local_row, None
+                local_row = next(local_rows, None)
+            elif local_row is None or remote_uuid < local_uuid:
+                yield remote_uuid, None, remote_row
+                remote_row = next(remote_rows, None)
+            else:
+                yield local_uuid, local_row, remote_row
+                local_row = next(local_rows, None)
+                remote_row = next(remote_rows, None)
+
+    def _iter_ordered_rows(self, pages: Iterator[list[dict]], side: str) -> Iterator[dict]:
+        previous = None
+        for page in pages:
+            for row in page:
+                sync_uuid = row["sync_uuid"]
+                if previous is not None and sync_uuid <= previous:
+                    raise ValueError(f"{side.capitalize()} rows are not ordered by sync_uuid near {sync_uuid}")
+                previous = sync_uuid
+                yield row
+
     def mysql_table_exists(self, mysql_conn, table: str) -> bool:  # noqa: ANN001
         self._validate_sync_table(table)
         with mysql_conn.cursor() as cursor:
@@ -130,6 +283,7 @@ class InternetSyncService:
                 col_type = self.map_sqlite_type_to_mysql(col["type"] or "")
                 cursor.execute(f"ALTER TABLE {table_sql_mysql} ADD COLUMN {mysql_col_name} {col_type} NULL")
         mysql_conn.commit()
+        self._forget_metadata(table)
 
     def ensure_mysql_sync_schema(self, mysql_conn) -> None:  # noqa: ANN001
         with mysql_conn.cursor() as cursor:
@@ -147,11 +301,11 @@ class InternetSyncService:
         )
         cursor = sqlite_conn.cursor()
         cursor.execute(f'SELECT id FROM {table_sql} WHERE sync_uuid IS NULL OR sync_uuid = ""')
-        for row in cursor.fetchall():
-            sqlite_conn.execute(
-                f"UPDATE {table_sql} SET sync_uuid = ? WHERE id = ?",
-                (str(uuid4()), row["id"]),
-            )
+        sqlite_conn.executemany(
+            f"UPDATE {table_sql} SET sync_uuid = ? WHERE id = ?",
+            [(str(uuid4()), row["id"]) for row in cursor.fetchall()],
+        )
+        self._forget_metadata(table)
 
     def ensure_mysql_sync_uuid(self, mysql_conn, table: str) -> None:  # noqa: ANN001
         table_sql = self._mysql_ident(table)
@@ -166,6 +320,7 @@ class InternetSyncService:
             if cursor.fetchone() is None:
                 cursor.execute(f"CREATE UNIQUE INDEX idx_{table}_sync_uuid ON {table_sql}(sync_uuid)")
         mysql_conn.commit()
+        self._forget_metadata(table)
 
     def normalize_sync_value(self, value):  # noqa: ANN001
         if value is None:
@@ -191,53 +346,76 @@ class InternetSyncService:
         return json.dumps(payload, ensure_ascii=False, indent=2, default=str)
 
     def mysql_insert_entity(self, mysql_conn, table: str, row: dict, common_columns: list[str]) -> None:  # noqa: ANN001
+        self.mysql_insert_entities(mysql_conn, table, [row], common_columns)
+
+    def mysql_insert_entities(self, mysql_conn, table: str, rows: list[dict], common_columns: list[str]) -> None:  # noqa: ANN001
         table_sql = self._mysql_ident(table)
         insert_columns = self._validated_sync_columns([col for col in common_columns if col != "id"])
-        if not insert_columns:
+        if not insert_columns or not rows:
             return
+        cols_sql = ", ".join(self._mysql_column_ident(col) for col in insert_columns)
+        placeholders = ", ".join(["%s"] * len(insert_columns))
+        # PyMySQL rewrites executemany INSERTs into multi-row statements.
         with mysql_conn.cursor() as cursor:
-            cols_sql = ", ".join(self._mysql_column_ident(col) for col in insert_columns)
-            placeholders = ", ".join(["%s"] * len(insert_columns))
-            sql = f"INSERT INTO {table_sql} ({cols_sql}) VALUES ({placeholders})"
-            cursor.execute(sql, tuple(row.get(col) for col in insert_columns))
+            cursor.executemany(
+                f"INSERT INTO {table_sql} ({cols_sql}) VALUES ({placeholders})",
+                [tuple(row.get(col) for col in insert_columns) for row in rows],
+            )
 
     def mysql_update_entity_by_uuid(self, mysql_conn, table: str, row: dict, common_columns: list[str]) -> None:  # noqa: ANN001
+        self.mysql_update_entities_by_uuid(mysql_conn, table, [row], common_columns)
+
+    def mysql_update_entities_by_uuid(
+        self,
+        mysql_conn,
+        table: str,
+        rows: list[dict],
+        common_columns: list[str],
+    ) -> None:  # noqa: ANN001
         table_sql = self._mysql_ident(table)
         update_columns = self._validated_sync_columns([col for col in common_columns if col not in {"id", "sync_uuid"}])
-        if not update_columns:
+        if not update_columns or not rows:
             return
         set_clause = ", ".join(f"{self._mysql_column_ident(col)} = %s" for col in update_columns)
-        values = [row.get(col) for col in update_columns]
-        values.append(row.get("sync_uuid"))
         with mysql_conn.cursor() as cursor:
-            cursor.execute(
+            cursor.executemany(
                 f"UPDATE {table_sql} SET {set_clause} WHERE sync_uuid = %s",
-                tuple(values),
+                [tuple(row.get(col) for col in update_columns) + (row.get("sync_uuid"),) for row in rows],
             )
 
     def sqlite_insert_entity(self, sqlite_conn, table: str, row: dict, common_columns: list[str]) -> None:  # noqa: ANN001
+        self.sqlite_insert_entities(sqlite_conn, table, [row], common_columns)
+
+    def sqlite_insert_entities(self, sqlite_conn, table: str, rows: list[dict], common_columns: list[str]) -> None:  # noqa: ANN001
         table_sql = self._sqlite_ident(table)
         insert_columns = self._validated_sync_columns([col for col in common_columns if col != "id"])
-        if not insert_columns:
+        if not insert_columns or not rows:
             return
         cols_sql = ", ".join(self._sqlite_column_ident(col) for col in insert_columns)
         placeholders = ", ".join(["?"] * len(insert_columns))
-        sqlite_conn.execute(
+        sqlite_conn.executemany(
             f"INSERT INTO {table_sql} ({cols_sql}) VALUES ({placeholders})",
-            tuple(row.get(col) for col in insert_columns),
+            [tuple(row.get(col) for col in insert_columns) for row in rows],
         )
 
     def sqlite_update_entity_by_uuid(self, sqlite_conn, table: str, row: dict, common_columns: list[str]) -> None:  # noqa: ANN001
+        self.sqlite_update_entities_by_uuid(sqlite_conn, table, [row], common_columns)
+
+    def sqlite_update_entities_by_uuid(
+        self,
+        sqlite_conn,
+        table: str,
+        rows: list[dict],
+        common_columns: list[str],
+    ) -> None:  # noqa: ANN001
         table_sql = self._sqlite_ident(table)
         update_columns = self._validated_sync_columns([col for col in common_columns if col not in {"id", "sync_uuid"}])
-        if not update_columns:
+        if not update_columns or not rows:
             return
         set_clause = ", ".join(f"{self._sqlite_column_ident(col)} = ?" for col in update_columns)
-        values = [row.get(col) for col in update_columns]
-        values.append(row.get("sync_uuid"))
-        sqlite_conn.execute(
+        sqlite_conn.executemany(
             f"UPDATE {table_sql} SET {set_clause} WHERE sync_uuid = ?",
-            tuple(values),
+            [tuple(row.get(col) for col in update_columns) + (row.get("sync_uuid"),) for row in rows],
         )
 
     def uuid_maps_sqlite(self, sqlite_conn, table: str) -> tuple[dict[int, str], dict[str, int]]:  # noqa: ANN001
@@ -285,11 +463,17 @@ class InternetSyncService:
         return mapping.get(entity_type)
 
     def upsert_mysql_link_row(self, mysql_conn, table: str, row: dict) -> bool:  # noqa: ANN001
+        return self.upsert_mysql_link_rows(mysql_conn, table, [row]) > 0
+
+    def upsert_mysql_link_rows(self, mysql_conn, table: str, rows: list[dict]) -> int:  # noqa: ANN001
+        """Upsert link rows sharing the same keys in one batch; return the number written."""
+        if not rows:
+            return 0
         table_sql = self._mysql_ident(table)
-        columns = [col for col in self.mysql_table_columns(mysql_conn, table) if col in row]
+        columns = [col for col in self.cached_mysql_table_columns(mysql_conn, table) if col in rows[0]]
         if not columns:
-            return False
-        pk_columns = self.mysql_primary_keys(mysql_conn, table)
+            return 0
+        pk_columns = self.cached_mysql_primary_keys(mysql_conn, table)
         non_pk_columns = [col for col in columns if col not in pk_columns]
         cols_sql = ", ".join(self._mysql_column_ident(col) for col in columns)
         placeholders = ", ".join(["%s"] * len(columns))
@@ -305,16 +489,22 @@ class InternetSyncService:
         else:
             sql = f"INSERT IGNORE INTO {table_sql} ({cols_sql}) VALUES ({placeholders})"
         with mysql_conn.cursor() as cursor:
-            cursor.execute(sql, tuple(row.get(col) for col in columns))
-        return True
+            cursor.executemany(sql, [tuple(row.get(col) for col in columns) for row in rows])
+        return len(rows)
 
     def upsert_sqlite_link_row(self, sqlite_conn, table: str, row: dict) -> bool:  # noqa: ANN001
+        return self.upsert_sqlite_link_rows(sqlite_conn, table, [row]) > 0
+
+    def upsert_sqlite_link_rows(self, sqlite_conn, table: str, rows: list[dict]) -> int:  # noqa: ANN001
+        """Upsert link rows sharing the same keys in one batch; return the number written."""
+        if not rows:
+            return 0
         table_sql = self._sqlite_ident(table)
-        sqlite_columns = set(self.sqlite_table_columns(sqlite_conn, table))
-        columns = [col for col in row if col in sqlite_columns]
+        sqlite_columns = set(self.cached_sqlite_table_columns(sqlite_conn, table))
+        columns = [col for col in rows[0] if col in sqlite_columns]
         if not columns:
-            return False
-        pk_columns = self.sqlite_primary_keys(sqlite_conn, table)
+            return 0
+        pk_columns = self.cached_sqlite_primary_keys(sqlite_conn, table)
         non_pk_columns = [col for col in columns if col not in pk_columns]
         cols_sql = ", ".join(self._sqlite_column_ident(col) for col in columns)
         placeholders = ", ".join(["?"] * len(columns))
@@ -332,8 +522,8 @@ class InternetSyncService:
             sql = f"INSERT OR IGNORE INTO {table_sql} ({cols_sql}) VALUES ({placeholders})"
         else:
             sql = f"INSERT INTO {table_sql} ({cols_sql}) VALUES ({placeholders})"
-        sqlite_conn.execute(sql, tuple(row.get(col) for col in columns))
-        return True
+        sqlite_conn.executemany(sql, [tuple(row.get(col) for col in columns) for row in rows])
+        return len(rows)
 
     def sync_entity_tables(
         self,
@@ -341,7 +531,22 @@ class InternetSyncService:
         mysql_conn,
         direction: str,
         conflict_resolver: Callable[[str, str, dict, dict, list[str]], str],
+        progress: Callable[[str, int], None] | None = None,
+        chunk_size: int | None = None,
+        batch_size: int | None = None,
     ) -> list[str]:  # noqa: ANN001
+        """
+        Merge entity tables between SQLite and MySQL by sync_uuid.
+
+        Both sides are read in sync_uuid order one page at a time and
+        merge-joined, so memory use is bounded by ``chunk_size`` rather than
+        table size. ``progress(table, rows_processed)`` is called after every
+        page of source rows and once more when a table is done. Inserts and
+        updates are buffered and written in ``batch_size`` executemany calls.
+        """
+        chunk_size = max(1, int(chunk_size or self.SYNC_CHUNK_SIZE))
+        batch_size = max(1, int(batch_size or self.SYNC_BATCH_SIZE))
+        self.reset_metadata_cache()
         stats: list[str] = []
         for table in self.ENTITY_TABLES:
             if not self.mysql_table_exists(mysql_conn, table):
@@ -349,57 +554,74 @@ class InternetSyncService:
             self.ensure_mysql_table_columns(mysql_conn, sqlite_conn, table)
             self.ensure_sqlite_sync_uuid(sqlite_conn, table)
             self.ensure_mysql_sync_uuid(mysql_conn, table)
-            sqlite_columns = self.sqlite_table_columns(sqlite_conn, table)
-            mysql_columns = self.mysql_table_columns(mysql_conn, table)
+            sqlite_columns = self.cached_sqlite_table_columns(sqlite_conn, table)
+            mysql_columns = self.cached_mysql_table_columns(mysql_conn, table)
             common_columns = [col for col in sqlite_columns if col in set(mysql_columns)]
             compare_columns = self.conflict_compare_columns(common_columns)
-
-            _, local_rows = self.fetch_sqlite_table(sqlite_conn, table)
-            _, remote_rows = self.fetch_mysql_table(mysql_conn, table)
-            local_by_uuid = {row.get("sync_uuid"): row for row in local_rows if row.get("sync_uuid")}
-            remote_by_uuid = {row.get("sync_uuid"): row for row in remote_rows if row.get("sync_uuid")}
+            mysql_inserts = _PendingRows(
+                lambda rows: self.mysql_insert_entities(mysql_conn, table, rows, common_columns), batch_size
+            )
+            mysql_updates = _PendingRows(
+                lambda rows: self.mysql_update_entities_by_uuid(mysql_conn, table, rows, common_columns), batch_size
+            )
+            sqlite_inserts = _PendingRows(
+                lambda rows: self.sqlite_insert_entities(sqlite_conn, table, rows, common_columns), batch_size
+            )
+            sqlite_updates = _PendingRows(
+                lambda rows: self.sqlite_update_entities_by_uuid(sqlite_conn, table, rows, common_columns), batch_size
+            )
 
             inserted = 0
             updated = 0
             conflicts = 0
+            processed = 0
 
-            if direction == "push":
-                for sync_uuid, local_row in local_by_uuid.items():
-                    remote_row = remote_by_uuid.get(sync_uuid)
-                    if remote_row is None:
-                        self.mysql_insert_entity(mysql_conn, table, local_row, common_columns)
-                        inserted += 1
-                        continue
-                    if self.rows_differ(local_row, remote_row, compare_columns):
-                        conflicts += 1
-                        choice = conflict_resolver(table, sync_uuid, local_row, remote_row, compare_columns)
-                        if choice == "local":
-                            self.mysql_update_entity_by_uuid(mysql_conn, table, local_row, common_columns)
-                            updated += 1
-                        elif choice == "remote":
-                            self.sqlite_update_entity_by_uuid(sqlite_conn, table, remote_row, common_columns)
-                            updated += 1
-            else:
-                for sync_uuid, remote_row in remote_by_uuid.items():
-                    local_row = local_by_uuid.get(sync_uuid)
-                    if local_row is None:
-                        self.sqlite_insert_entity(sqlite_conn, table, remote_row, common_columns)
-                        inserted += 1
-                        continue
-                    if self.rows_differ(local_row, remote_row, compare_columns):
-                        conflicts += 1
-                        choice = conflict_resolver(table, sync_uuid, local_row, remote_row, compare_columns)
-                        if choice == "remote":
-                            self.sqlite_update_entity_by_uuid(sqlite_conn, table, remote_row, common_columns)
-                            updated += 1
-                        elif choice == "local":
-                            self.mysql_update_entity_by_uuid(mysql_conn, table, local_row, common_columns)
-                            updated += 1
+            pairs = self.merge_rows_by_uuid(
+                self.iter_sqlite_rows_by_uuid(sqlite_conn, table, chunk_size),
+                self.iter_mysql_rows_by_uuid(mysql_conn, table, chunk_size),
+            )
+            for sync_uuid, local_row, remote_row in pairs:
+                source_row = local_row if direction == "push" else remote_row
+                if source_row is None:
+                    continue
+                processed += 1
+                if progress is not None and processed % chunk_size == 0:
+                    progress(table, processed)
+                if direction == "push" and remote_row is None:
+                    mysql_inserts.add(local_row)
+                    inserted += 1
+                    continue
+                if direction != "push" and local_row is None:
+                    sqlite_inserts.add(remote_row)
+                    inserted += 1
+                    continue
+                if self.rows_differ(local_row, remote_row, compare_columns):
+                    conflicts += 1
+                    choice = conflict_resolver(table, sync_uuid, local_row, remote_row, compare_columns)
+                    if choice == "local":
+                        mysql_updates.add(local_row)
+                        updated += 1
+                    elif choice == "remote":
+                        sqlite_updates.add(remote_row)
+                        updated += 1
+            for pending in (mysql_inserts, mysql_updates, sqlite_inserts, sqlite_updates):
+                pending.flush()
+            if progress is not None:
+                progress(table, processed)
 
             stats.append(f"{table}: inserted={inserted}, updated={updated}, conflicts={conflicts}")
         return stats
 
-    def sync_link_tables(self, sqlite_conn, mysql_conn, direction: str) -> list[str]:  # noqa: ANN001
+    def sync_link_tables(
+        self,
+        sqlite_conn,
+        mysql_conn,
+        direction: str,
+        batch_size: int | None = None,
+    ) -> list[str]:  # noqa: ANN001
+        """Merge link tables, remapping foreign keys by sync_uuid and upserting in batches."""
+        batch_size = max(1, int(batch_size or self.SYNC_BATCH_SIZE))
+        self.reset_metadata_cache()
         stats: list[str] = []
         local_maps: dict[str, dict[str, dict]] = {}
         remote_maps: dict[str, dict[str, dict]] = {}
@@ -411,8 +633,10 @@ class InternetSyncService:
 
         fk_map = self.link_fk_table_map()
         for table in self.LINK_TABLES:
-            processed = 0
             if direction == "push":
+                pending = _PendingRows(
+                    lambda batch, table=table: self.upsert_mysql_link_rows(mysql_conn, table, batch), batch_size
+                )
                 columns, rows = self.fetch_sqlite_table(sqlite_conn, table)
                 if not self.mysql_table_exists(mysql_conn, table):
                     raise ValueError(f"Internet DB is missing table: {table}")
@@ -437,9 +661,11 @@ class InternetSyncService:
                         new_row[fk_col] = target_id
                     if skip_row:
                         continue
-                    if self.upsert_mysql_link_row(mysql_conn, table, new_row):
-                        processed += 1
+                    pending.add(new_row)
             else:
+                pending = _PendingRows(
+                    lambda batch, table=table: self.upsert_sqlite_link_rows(sqlite_conn, table, batch), batch_size
+                )
                 columns, rows = self.fetch_mysql_table(mysql_conn, table)
                 for row in rows:
                     new_row = {col: row.get(col) for col in columns}
@@ -462,7 +688,7 @@ class InternetSyncService:
                         new_row[fk_col] = target_id
                     if skip_row:
                         continue
-                    if self.upsert_sqlite_link_row(sqlite_conn, table, new_row):
-                        processed += 1
-            stats.append(f"{table}: merged={processed}")
+                    pending.add(new_row)
+            pending.flush()
+            stats.append(f"{table}: merged={pending.written}")
         return stats
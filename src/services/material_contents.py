@@ -0,0 +1,268 @@
+"""Background full-text indexing of attached material files."""
+from __future__ import annotations
+
+import importlib.util
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+from xml.etree import ElementTree
+
+from ..models.database import Database
+from .docx_tables import iter_docx_blocks
+from .file_fingerprints import material_file_location
+from .import_service import extract_text_from_file
+
+
+# Longer texts are truncated; the index is for finding a file, not storing it.
+MAX_CONTENT_CHARS = 2_000_000
+
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_SLIDE_NAME = re.compile(r"ppt/slides/slide(\d+)\.xml")
+
+
+def content_extractable(path: Path) -> bool:
+    """Return True if text can be extracted from ``path`` in this environment."""
+    ext = path.suffix.lower()
+    if ext in {".txt", ".csv", ".tsv", ".docx", ".pptx"}:
+        return True
+    if ext == ".doc":
+        return bool(shutil.which("antiword") or shutil.which("catdoc"))
+    if ext == ".pdf":
+        return importlib.util.find_spec("pypdf") is not None
+    return False
+
+
+def extract_material_text(path: Path) -> str:
+    """
+    Extract the plain text of a material file.
+
+    Text files and .doc go through the importer's ``extract_text_from_file``;
+    .docx keeps every paragraph and table cell, .pptx the text of each slide
+    in order, and .pdf needs the optional ``pypdf`` package.
+
+    Args:
+        path: Absolute path of the file
+
+    Returns:
+        str: Extracted text
+
+    Raises:
+        ValueError: If the file type is unsupported or the file cannot be parsed
+    """
+    ext = path.suffix.lower()
+    try:
+        if ext == ".docx":
+            return "\n".join("\t".join(cells) for _table, cells in iter_docx_blocks(str(path)))
+        if ext == ".pptx":
+            return _extract_from_pptx(path)
+        if ext == ".pdf":
+            return _extract_from_pdf(path)
+    except (zipfile.BadZipFile, ElementTree.ParseError, KeyError) as exc:
+        raise ValueError(f"Failed to extract text from {path.name}.") from exc
+    return extract_text_from_file(str(path))
+
+
+def _extract_from_pptx(path: Path) -> str:
+    lines: List[str] = []
+    with zipfile.ZipFile(path) as archive:
+        slides = []
+        for name in archive.namelist():
+            match = _SLIDE_NAME.fullmatch(name)
+            if match:
+                slides.append((int(match.group(1)), name))
+        for _number, name in sorted(slides):
+            with archive.open(name) as stream:
+                paragraph: List[str] = []
+                for _event, elem in ElementTree.iterparse(stream):
+                    if elem.tag == f"{_A}t":
+                        paragraph.append(elem.text or "")
+                    elif elem.tag == f"{_A}p":
+                        if paragraph:
+                            lines.append("".join(paragraph))
+                        paragraph = []
+                        elem.clear()
+    return "\n".join(lines)
+
+
+def _extract_from_pdf(path: Path) -> str:
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PyPdfError
+    except ImportError as exc:
+        raise ValueError("Indexing .pdf requires the 'pypdf' package to be installed.") from exc
+    try:
+        return "\n".join(page.extract_text() or "" for page in PdfReader(str(path)).pages)
+    except PyPdfError as exc:
+        raise ValueError(f"Failed to extract text from {path.name}.") from exc
+
+
+@dataclass(frozen=True)
+class PendingContent:
+    """A material file whose indexed text is missing or out of date."""
+
+    material_id: int
+    path_key: str
+    path: Path
+    file_size: int
+    mtime_ns: int
+
+
+class MaterialContentIndexer:
+    """Keeps ``material_contents`` (and its FTS table) in step with material files.
+
+    A file is extracted again only after its path, size or modification time
+    changes, and rows are committed in small batches, so an interrupted run
+    resumes where it stopped on the next ``start()``. Files that cannot be
+    parsed are stored with empty text until they change; file types whose
+    extractor is missing (antiword/catdoc, pypdf) are retried on every run.
+    """
+
+    BATCH_SIZE = 20
+
+    def __init__(self, database: Database, files_root: Path):
+        """
+        Initialize content indexer.
+
+        Args:
+            database: Database holding the materials and their contents
+            files_root: Root directory of stored material files
+        """
+        self.db = database
+        self.files_root = files_root
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._running = False
+        self._rescan = False
+
+    def start(self) -> None:
+        """Index changed files on a background thread; a running pass rescans when done."""
+        with self._lock:
+            self._rescan = True
+            if self._running:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="material-content-index")
+            self._stop.clear()
+            self._running = True
+            self._executor.submit(self._run)
+
+    def shutdown(self) -> None:
+        """Stop after the file being extracted; unfinished work is picked up by the next run."""
+        self._stop.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def pending(self) -> List[PendingContent]:
+        """
+        Return files to (re-)extract and drop rows whose file is gone.
+
+        Returns:
+            List[PendingContent]: Files without up-to-date text, by material id
+        """
+        with self.db.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT m.id, m.relative_path, m.file_path, c.path_key, c.file_size, c.mtime_ns
+                FROM methodical_materials m
+                LEFT JOIN material_contents c ON c.material_id = m.id
+                ORDER BY m.id
+            """).fetchall()
+        pending: List[PendingContent] = []
+        stale: List[int] = []
+        for row in rows:
+            location = material_file_location(row["relative_path"], row["file_path"], self.files_root)
+            stamp = None
+            if location is not None and content_extractable(location[1]):
+                try:
+                    stat = os.stat(location[1])
+                    stamp = (location[0], stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    pass
+            if stamp is None:
+                if row["path_key"] is not None:
+                    stale.append(row["id"])
+                continue
+            if (row["path_key"], row["file_size"], row["mtime_ns"]) != stamp:
+                pending.append(PendingContent(row["id"], stamp[0], location[1], stamp[1], stamp[2]))
+        if stale:
+            with self.db.get_connection() as conn:
+                conn.executemany("DELETE FROM material_contents WHERE material_id = ?", [(i,) for i in stale])
+        return pending
+
+    def index_pending(self, stop: Optional[threading.Event] = None) -> int:
+        """
+        Extract and store the text of every pending file.
+
+        Args:
+            stop: Checked between files; set it to end the run early
+
+        Returns:
+            int: Number of files indexed
+        """
+        indexed = 0
+        batch = []
+        for item in self.pending():
+            if stop is not None and stop.is_set():
+                break
+            try:
+                text = extract_material_text(item.path)
+            except (OSError, ValueError):
+                text = ""
+            batch.append((item.material_id, item.path_key, item.file_size, item.mtime_ns, text[:MAX_CONTENT_CHARS]))
+            if len(batch) >= self.BATCH_SIZE:
+                indexed += self._store(batch)
+                batch = []
+        return indexed + self._store(batch)
+
+    def _run(self) -> None:
+        finished = False
+        try:
+            while not finished:
+                # Checked and cleared under the lock so a start() racing the
+                # last pass either sees it running or submits a new one.
+                with self._lock:
+                    finished = self._stop.is_set() or not self._rescan
+                    self._rescan = False
+                    if finished:
+                        self._running = False
+                if not finished:
+                    self.index_pending(self._stop)
+        except sqlite3.Error:
+            # The database was closed or replaced; the next start() retries.
+            pass
+        finally:
+            if not finished:
+                with self._lock:
+                    self._running = False
+
+    def _store(self, rows) -> int:  # noqa: ANN001
+        stored = 0
+        with self.db.get_connection() as conn:
+            for row in rows:
+                try:
+                    conn.execute(
+                        """
+                        INSERT INTO material_contents (material_id, path_key, file_size, mtime_ns, content)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(material_id) DO UPDATE SET
+                            path_key = excluded.path_key,
+                            file_size = excluded.file_size,
+                            mtime_ns = excluded.mtime_ns,
+                            content = excluded.content
+                        """,
+                        row,
+                    )
+                except sqlite3.IntegrityError:
+                    # The material was deleted while its file was being read.
+                    continue
+                stored += 1
+        return stored
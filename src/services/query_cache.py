@@ -0,0 +1,74 @@
+"""Bounded LRU cache for read-mostly query results."""
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class QueryCache:
+    """LRU cache of query results invalidated by a data version counter.
+
+    Every lookup compares ``version_source()`` with the version the cached
+    entries were loaded under; any committed write bumps the counter and the
+    whole cache is dropped. Values are deep-copied on the way in and out so
+    callers may freely mutate what they receive.
+    """
+
+    DEFAULT_MAX_ENTRIES = 512
+
+    def __init__(self, version_source: Callable[[], int], max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._version_source = version_source
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version = version_source()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` or load, store and return it."""
+        version = self._version_source()
+        with self._lock:
+            self._sync_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.deepcopy(self._entries[key])
+            self._misses += 1
+
+        value = loader()
+
+        with self._lock:
+            # Skip storing if a write landed while the loader was running.
+            if self._version_source() == version == self._version:
+                self._entries[key] = copy.deepcopy(value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction/invalidation counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "size": len(self._entries),
+            }
+
+    def _sync_version(self, version: int) -> None:
+        if version != self._version:
+            if self._entries:
+                self._invalidations += 1
+            self._entries.clear()
+            self._version = version
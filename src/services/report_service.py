@@ -0,0 +1,245 @@
+"""Lesson x teacher coverage report computation."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..models.database import Database
+from ..models.entities import Teacher
+from ..repositories.teacher_repository import TeacherRepository
+from .teacher_sorting import teacher_sort_key
+
+
+STATUS_COMPLETE = "complete"
+STATUS_PARTIAL = "partial"
+STATUS_MISSING = "missing"
+
+_STATUS_PRIORITY = (STATUS_COMPLETE, STATUS_PARTIAL, STATUS_MISSING)
+
+
+@dataclass
+class CoverageReportCell:
+    """Materials of one teacher for one lesson row."""
+
+    titles: List[str] = field(default_factory=list)
+    material_types: Set[str] = field(default_factory=set)
+    status: str = STATUS_MISSING
+
+
+@dataclass
+class CoverageReportRow:
+    """One lesson row of the coverage report."""
+
+    lesson_id: int
+    code: str
+    discipline_name: str
+    topic_title: str
+    lesson_title: str
+    is_self_study: bool
+    status: Optional[str] = None
+
+
+@dataclass
+class CoverageReport:
+    """Compact lesson x teacher matrix ready for rendering."""
+
+    rows: List[CoverageReportRow] = field(default_factory=list)
+    teachers: List[Teacher] = field(default_factory=list)
+    cells: Dict[Tuple[int, int], CoverageReportCell] = field(default_factory=dict)
+
+    def cell(self, row_index: int, teacher_id: int) -> CoverageReportCell:
+        return self.cells.get((row_index, teacher_id)) or CoverageReportCell()
+
+
+def normalize_report_material_type(material_type: str) -> str:
+    raw = (material_type or "").strip().casefold()
+    if not raw:
+        return ""
+    if raw == "metod":
+        return "guide"
+
+    plan_markers = ("plan", "план", "план-конспект", "конспект")
+    guide_markers = ("guide", "method", "метод", "методич", "посібник", "рекомендац", "настанова")
+    presentation_markers = ("presentation", "презентац", "слайд")
+    attachment_markers = ("attachment", "додат", "appendix", "файл")
+
+    if any(marker in raw for marker in plan_markers):
+        return "plan"
+    if any(marker in raw for marker in guide_markers):
+        return "guide"
+    if any(marker in raw for marker in presentation_markers):
+        return "presentation"
+    if any(marker in raw for marker in attachment_markers):
+        return "attachment"
+    return raw
+
+
+def is_self_study_lesson_type(lesson_type_name: Optional[str]) -> bool:
+    lesson_type = (lesson_type_name or "").strip().lower()
+    return "самостійна" in lesson_type or "self-study" in lesson_type or "self study" in lesson_type
+
+
+class ReportService:
+    """Builds the program coverage report with aggregated queries."""
+
+    def __init__(self, database: Database):
+        """
+        Initialize report service.
+
+        Args:
+            database: Database instance
+        """
+        self.db = database
+        self.teacher_repo = TeacherRepository(database)
+
+    def build_coverage_report(self, program_id: int, include_all_teachers: bool = False) -> CoverageReport:
+        """
+        Compute the lesson x teacher coverage matrix for a program.
+
+        Args:
+            program_id: ID of the program
+            include_all_teachers: Use every teacher that has lesson materials instead
+                of teachers assigned to the program disciplines
+
+        Returns:
+            CoverageReport: Rows, sorted teacher columns and per-cell materials
+        """
+        report = CoverageReport()
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT d.id as discipline_id, d.name as discipline_name,
+                       t.id as topic_id, t.title as topic_title,
+                       l.id as lesson_id, l.title as lesson_title,
+                       lt.name as lesson_type_name,
+                       m.title as material_title, m.material_type,
+                       tm.teacher_id
+                FROM program_disciplines pd
+                JOIN disciplines d ON d.id = pd.discipline_id
+                JOIN discipline_topics dt ON dt.discipline_id = d.id
+                JOIN topics t ON t.id = dt.topic_id
+                LEFT JOIN topic_lessons tl ON tl.topic_id = t.id
+                LEFT JOIN lessons l ON l.id = tl.lesson_id
+                LEFT JOIN lesson_types lt ON lt.id = l.lesson_type_id
+                LEFT JOIN material_associations ma
+                    ON ma.entity_type = 'lesson' AND ma.entity_id = l.id
+                LEFT JOIN methodical_materials m ON m.id = ma.material_id
+                LEFT JOIN teacher_materials tm ON tm.material_id = m.id
+                WHERE pd.program_id = ?
+                ORDER BY pd.order_index, d.id, dt.order_index, t.id,
+                         tl.order_index, l.id, m.title, m.id
+            """, (program_id,))
+            rows = cursor.fetchall()
+
+            material_teacher_ids = self._fill_matrix(report, rows)
+            if include_all_teachers:
+                teachers = self._load_teachers_by_id(cursor, material_teacher_ids)
+            else:
+                teachers = self._load_program_teachers(cursor, program_id)
+
+        report.teachers = sorted(teachers, key=teacher_sort_key)
+        self._apply_statuses(report)
+        return report
+
+    def _fill_matrix(self, report: CoverageReport, rows) -> List[int]:  # noqa: ANN001
+        material_teacher_ids: List[int] = []
+        seen_teachers: Set[int] = set()
+        row_key = None
+        current_discipline = None
+        current_topic = None
+        topic_index = 0
+        lesson_index = 1
+        for row in rows:
+            key = (row["discipline_id"], row["topic_id"], row["lesson_id"])
+            if key != row_key:
+                row_key = key
+                if row["discipline_id"] != current_discipline:
+                    current_discipline = row["discipline_id"]
+                    current_topic = None
+                    topic_index = 0
+                if row["topic_id"] != current_topic:
+                    # Topics without lessons still consume a topic number.
+                    current_topic = row["topic_id"]
+                    topic_index += 1
+                    lesson_index = 1
+                if row["lesson_id"] is None:
+                    continue
+                is_self_study = is_self_study_lesson_type(row["lesson_type_name"])
+                if is_self_study:
+                    code = f"т.{topic_index}.ср"
+                else:
+                    code = f"т.{topic_index}.з.{lesson_index}"
+                    lesson_index += 1
+                report.rows.append(
+                    CoverageReportRow(
+                        lesson_id=row["lesson_id"],
+                        code=code,
+                        discipline_name=row["discipline_name"],
+                        topic_title=row["topic_title"],
+                        lesson_title=row["lesson_title"],
+                        is_self_study=is_self_study,
+                    )
+                )
+            teacher_id = row["teacher_id"]
+            if teacher_id is None:
+                continue
+            if teacher_id not in seen_teachers:
+                seen_teachers.add(teacher_id)
+                material_teacher_ids.append(teacher_id)
+            cell = report.cells.setdefault((len(report.rows) - 1, teacher_id), CoverageReportCell())
+            cell.titles.append(row["material_title"])
+            cell.material_types.add(normalize_report_material_type(row["material_type"] or ""))
+        return material_teacher_ids
+
+    def _load_teachers_by_id(self, cursor, teacher_ids: List[int]) -> List[Teacher]:  # noqa: ANN001
+        if not teacher_ids:
+            return []
+        placeholders = ",".join(["?"] * len(teacher_ids))
+        cursor.execute(f"""
+            SELECT id, full_name, order_index, military_rank, position, department, email, phone,
+                   created_at, updated_at
+            FROM teachers
+            WHERE id IN ({placeholders})
+        """, teacher_ids)
+        return [self.teacher_repo._row_to_teacher(row) for row in cursor.fetchall()]
+
+    def _load_program_teachers(self, cursor, program_id: int) -> List[Teacher]:  # noqa: ANN001
+        cursor.execute("""
+            SELECT DISTINCT t.id, t.full_name, t.order_index, t.military_rank, t.position, t.department,
+                            t.email, t.phone, t.created_at, t.updated_at
+            FROM teachers t
+            JOIN teacher_disciplines td ON t.id = td.teacher_id
+            JOIN program_disciplines pd ON pd.discipline_id = td.discipline_id
+            WHERE pd.program_id = ?
+        """, (program_id,))
+        return [self.teacher_repo._row_to_teacher(row) for row in cursor.fetchall()]
+
+    def _apply_statuses(self, report: CoverageReport) -> None:
+        for row_index, row in enumerate(report.rows):
+            statuses = set()
+            for teacher in report.teachers:
+                cell = report.cells.get((row_index, teacher.id))
+                if cell is None:
+                    cell = CoverageReportCell()
+                    report.cells[(row_index, teacher.id)] = cell
+                cell.status = self._cell_status(row, cell)
+                statuses.add(cell.status)
+            row.status = next((status for status in _STATUS_PRIORITY if status in statuses), None)
+
+    @staticmethod
+    def _cell_status(row: CoverageReportRow, cell: CoverageReportCell) -> str:
+        if row.is_self_study:
+            normalized = [title.lower() for title in cell.titles]
+            has_cadets = any(("курсант" in t) or ("слухач" in t) for t in normalized)
+            has_teachers = any("викладач" in t for t in normalized)
+            if len(cell.titles) >= 2 and has_cadets and has_teachers:
+                return STATUS_COMPLETE
+            if cell.titles:
+                return STATUS_PARTIAL
+            return STATUS_MISSING
+        types = cell.material_types
+        if "plan" in types and "guide" in types and "presentation" in types:
+            return STATUS_COMPLETE
+        if types:
+            return STATUS_PARTIAL
+        return STATUS_MISSING
@@ -1,6 +1,11 @@
 """Search service for full-text search across all entities."""
-from typing import List, Dict, Any
+from contextlib import closing, contextmanager, nullcontext
+from dataclasses import dataclass, replace
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import re
+import sqlite3
+import threading
+import unicodedata
 from ..models.entities import SearchResult
 from ..models.database import Database
 from ..repositories.teacher_repository import TeacherRepository
@@ -12,9 +17,174 @@ from ..repositories.question_repository import QuestionRepository
 from ..repositories.material_repository import MaterialRepository
 
 
+class SearchCancelled(RuntimeError):
+    """Raised when a running search is cancelled through its SearchCancellation."""
+
+
+class SearchCancellation:
+    """Thread-safe cancellation token for a single search run.
+
+    The worker thread binds the connection that executes the statement;
+    ``cancel()`` may be called from any thread and interrupts that statement
+    via ``sqlite3.Connection.interrupt``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            if self._conn is not None:
+                self._conn.interrupt()
+
+    def raise_if_cancelled(self) -> None:
+        if self._cancelled:
+            raise SearchCancelled()
+
+    @contextmanager
+    def bind(self, conn: sqlite3.Connection):
+        """Make ``conn`` interruptible by ``cancel()`` for the duration of the block."""
+        with self._lock:
+            self.raise_if_cancelled()
+            self._conn = conn
+        try:
+            yield conn
+        except sqlite3.OperationalError as exc:
+            if self._cancelled:
+                raise SearchCancelled() from exc
+            raise
+        finally:
+            # Unbind before the connection goes back to the pool so a late
+            # cancel() cannot interrupt an unrelated statement.
+            with self._lock:
+                self._conn = None
+
+
+@dataclass(frozen=True)
+class _RefineCandidates:
+    """Complete result set of the last search, kept to refine extended queries."""
+
+    data_version: int
+    query: str
+    mode: str  # 'word' or 'trigram': the index that produced the results
+    results: Tuple[SearchResult, ...]
+    texts: Tuple[str, ...]  # Folded search_text per result, in the same order
+
+
 class SearchService:
     """Service for performing full-text searches across all entities."""
 
+    # Every branch projects the same columns so the seven FTS tables can be
+    # merged by a single ORDER BY. Column meaning per entity is decoded in
+    # _row_to_search_result; search_text joins the indexed columns for
+    # in-memory refinement.
+    _FTS_BRANCHES = (
+        """
+            SELECT 'teacher' AS entity_type, 0 AS entity_rank, t.id AS id,
+                   t.full_name AS title, NULL AS description,
+                   t.military_rank AS extra1, t.position AS extra2, t.department AS extra3,
+                   t.email AS extra4, t.phone AS extra5, bm25(teachers_fts) AS score,
+                   printf('%s %s %s %s %s', t.full_name, t.military_rank, t.position, t.department, t.email) AS search_text
+            FROM teachers_fts
+            JOIN teachers t ON t.id = teachers_fts.rowid
+            WHERE teachers_fts MATCH ?
+        """,
+        """
+            SELECT 'program', 1, p.id, p.name, p.description,
+                   p.level, NULL, NULL, NULL, NULL, bm25(programs_fts),
+                   printf('%s %s %s', p.name, p.description, p.level)
+            FROM programs_fts
+            JOIN educational_programs p ON p.id = programs_fts.rowid
+            WHERE programs_fts MATCH ?
+        """,
+        """
+            SELECT 'discipline', 2, d.id, d.name, d.description,
+                   NULL, NULL, NULL, NULL, NULL, bm25(disciplines_fts),
+                   printf('%s %s', d.name, d.description)
+            FROM disciplines_fts
+            JOIN disciplines d ON d.id = disciplines_fts.rowid
+            WHERE disciplines_fts MATCH ?
+        """,
+        """
+            SELECT 'topic', 3, t.id, t.title, t.description,
+                   NULL, NULL, NULL, NULL, NULL, bm25(topics_fts),
+                   printf('%s %s', t.title, t.description)
+            FROM topics_fts
+            JOIN topics t ON t.id = topics_fts.rowid
+            WHERE topics_fts MATCH ?
+        """,
+        """
+            SELECT 'lesson', 4, l.id, l.title, l.description,
+                   lt.name, l.duration_hours, NULL, NULL, NULL, bm25(lessons_fts),
+                   printf('%s %s', l.title, l.description)
+            FROM lessons_fts
+            JOIN lessons l ON l.id = lessons_fts.rowid
+            LEFT JOIN lesson_types lt ON l.lesson_type_id = lt.id
+            WHERE lessons_fts MATCH ?
+        """,
+        """
+            SELECT 'question', 5, q.id, q.content, NULL,
+                   NULL, NULL, NULL, NULL, NULL, bm25(questions_fts),
+                   printf('%s %s', q.content, q.answer)
+            FROM questions_fts
+            JOIN questions q ON q.id = questions_fts.rowid
+            WHERE questions_fts MATCH ?
+        """,
+        # Materials also match on the text of their attached file and keep
+        # their better score. Text of file hits is not kept for refinement.
+        """
+            SELECT 'material', 6, m.id, m.title, m.description,
+                   m.material_type, m.file_name, NULL, NULL, NULL, MIN(hits.score),
+                   CASE WHEN MAX(hits.in_file) THEN NULL
+                        ELSE printf('%s %s %s', m.title, m.description, m.file_name) END
+            FROM (
+                SELECT rowid AS id, bm25(materials_fts) AS score, 0 AS in_file
+                FROM materials_fts
+                WHERE materials_fts MATCH ?
+                UNION ALL
+                SELECT rowid, bm25(material_contents_fts), 1
+                FROM material_contents_fts
+                WHERE material_contents_fts MATCH ?
+            ) hits
+            JOIN methodical_materials m ON m.id = hits.id
+            GROUP BY m.id
+        """,
+    )
+
+    # The same statement over the trigram tables, used for substring matches.
+    # File contents have no trigram index.
+    _TRIGRAM_BRANCHES = tuple(branch.replace("_fts", "_trigram") for branch in _FTS_BRANCHES[:-1]) + (
+        """
+            SELECT 'material', 6, m.id, m.title, m.description,
+                   m.material_type, m.file_name, NULL, NULL, NULL, bm25(materials_trigram),
+                   printf('%s %s %s', m.title, m.description, m.file_name)
+            FROM materials_trigram
+            JOIN methodical_materials m ON m.id = materials_trigram.rowid
+            WHERE materials_trigram MATCH ?
+        """,
+    )
+
+    # Apostrophe variants in Ukrainian spelling; the FTS tokenizer splits on all of them.
+    _APOSTROPHES = re.compile("['`\u00b4\u02bb\u02bc\u2018\u2019]")
+
+    # Trigrams cannot match shorter terms.
+    TRIGRAM_MIN_TERM_LENGTH = 3
+
+    # Result sets up to this size are kept so that a query extending the
+    # previous one is filtered in memory instead of hitting the indexes again.
+    REFINE_CANDIDATE_LIMIT = 2000
+
+    # Token characters of the unicode61 tokenizer, and the Latin diacritics it drops.
+    _WORD = re.compile(r"[^\W_]+")
+    _LATIN_MARKS = re.compile("(?<=[a-z])[\u0300-\u036f]+")
+
     def __init__(self, database: Database):
         """
         Initialize search service.
@@ -30,9 +200,13 @@ class SearchService:
         self.lesson_repo = LessonRepository(database)
         self.question_repo = QuestionRepository(database)
         self.material_repo = MaterialRepository(database)
+        self._trigram_available: Optional[bool] = None
+        self._refine_lock = threading.Lock()
+        self._refine_candidates: Optional[_RefineCandidates] = None
 
     def _fts_query(self, keyword: str) -> str:
-        raw_tokens = re.findall(r'"[^"]+"|[\w]+', keyword.strip(), flags=re.UNICODE)
+        keyword = self._APOSTROPHES.sub("'", keyword.strip())
+        raw_tokens = re.findall(r'"[^"]+"|\w+(?:\'\w+)*', keyword, flags=re.UNICODE)
         terms = []
         for raw_token in raw_tokens:
             if raw_token.startswith('"') and raw_token.endswith('"'):
@@ -41,282 +215,372 @@ class SearchService:
                     terms.append(f'"{phrase.replace(chr(34), chr(34) * 2)}"*')
                 continue
             token = raw_token.strip("_")
-            if token:
+            if "'" in token:
+                # Tokenized like the index: adjacent parts, the last one a prefix.
+                terms.append(f'"{token}"*')
+            elif token:
                 terms.append(f"{token}*")
         return " ".join(terms)
 
-    def search_all(self, keyword: str) -> List[SearchResult]:
+    def _trigram_query(self, keyword: str) -> str:
+        """Build a trigram MATCH query requiring every term as a substring."""
+        return " ".join(f'"{term.replace(chr(34), chr(34) * 2)}"' for term in self._trigram_terms(keyword))
+
+    def _trigram_terms(self, keyword: str) -> List[str]:
+        terms = []
+        for raw_token in re.findall(r'"[^"]+"|\S+', keyword.strip()):
+            if len(raw_token) > 1 and raw_token.startswith('"') and raw_token.endswith('"'):
+                raw_token = raw_token[1:-1].strip()
+            if len(raw_token) >= self.TRIGRAM_MIN_TERM_LENGTH:
+                terms.append(raw_token)
+        return terms
+
+    def _has_trigram_index(self, conn: sqlite3.Connection) -> bool:
+        if self._trigram_available is None:
+            with closing(conn.cursor()) as cursor:
+                self._trigram_available = self.db._trigram_fts_available(cursor)
+        return self._trigram_available
+
+    def search_all(
+        self,
+        keyword: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cancellation: Optional[SearchCancellation] = None,
+    ) -> List[SearchResult]:
         """
         Perform full-text search across all entities.
 
+        All FTS tables are queried by one statement on a single connection and
+        merged by bm25 score. When the word index has no match at all (infix
+        or partial-word queries), the trigram tables are searched the same way
+        for the keyword's substrings. LIKE fallbacks run only when neither index
+        can take the keyword, or SQLite lacks the trigram tokenizer.
+
+        The last complete result set (up to ``REFINE_CANDIDATE_LIMIT`` rows) is
+        kept with the database's data version. A query that extends it, as
+        when typing "лек", "лекц", "лекці", is answered by filtering that set
+        in memory; the results keep the order of the broader query. Repeating
+        the query, e.g. to read the next page, reuses the set as is.
+
         Args:
             keyword: Search keyword or phrase
+            limit: Maximum number of results to return (all when None)
+            offset: Number of leading results to skip
+            cancellation: Optional token that interrupts the running statement
 
         Returns:
             List[SearchResult]: List of search results with relevance scores
+
+        Raises:
+            SearchCancelled: If ``cancellation`` was cancelled before or during the query
         """
         if not keyword or not keyword.strip():
             return []
+        offset = max(0, int(offset or 0))
+        end = None if limit is None else offset + max(0, int(limit))
 
-        results = []
+        normalized = self._refine_key(keyword)
+        data_version = self.db.data_version()
+        refined = self._refine(normalized, data_version)
+        if refined is not None:
+            return refined[offset:end]
+
+        fts_query = self._fts_query(keyword)
+        trigram_query = self._trigram_query(keyword)
+        # Pages within the candidate limit are cut from the complete result set,
+        # which is then kept for refinement.
+        collect = end is None or end <= self.REFINE_CANDIDATE_LIMIT
+        if collect:
+            fetch_limit = -1 if end is None else self.REFINE_CANDIDATE_LIMIT + 1
+            fetch_offset = 0
+        else:
+            fetch_limit = end - offset
+            fetch_offset = offset
+        with self.db.get_connection() as conn:
+            mode = None
+            rows = []
+            if fts_query:
+                rows = self._run_branches(
+                    conn, self._FTS_BRANCHES, fts_query, fetch_limit, fetch_offset, cancellation
+                )
+                if rows or (
+                    fetch_offset and self._run_branches(conn, self._FTS_BRANCHES, fts_query, 1, 0, cancellation)
+                ):
+                    mode = "word"
+            if mode is None and trigram_query and self._has_trigram_index(conn):
+                rows = self._run_branches(
+                    conn, self._TRIGRAM_BRANCHES, trigram_query, fetch_limit, fetch_offset, cancellation
+                )
+                mode = "trigram"
+        if mode is not None:
+            results = [self._row_to_search_result(row) for row in rows]
+            if not collect:
+                return results
+            # A keyword without word terms never reached the word index, so
+            # its trigram matches say nothing about an extension that has some.
+            # Hits on file contents carry no text to filter.
+            if (
+                len(results) <= self.REFINE_CANDIDATE_LIMIT
+                and fts_query
+                and all(row["search_text"] is not None for row in rows)
+            ):
+                texts = [self._refine_text(mode, row["search_text"]) for row in rows]
+                self._store_refine_candidates(normalized, data_version, mode, results, texts)
+            return results[offset:end]
+        if fts_query:
+            return []
+        if cancellation is not None:
+            cancellation.raise_if_cancelled()
+        return self._fallback_search(keyword)[offset:end]
+
+    def iter_search(
+        self,
+        keyword: str,
+        page_size: int,
+        cancellation: Optional[SearchCancellation] = None,
+    ) -> Iterator[List[SearchResult]]:
+        """
+        Yield every result of ``keyword`` in pages of ``page_size``.
 
-        # Search in teachers
-        results.extend(self._search_teachers(keyword))
+        Results come in the order of ``search_all``, but the merged statement
+        runs once and its cursor is read page by page, so streaming a large
+        result set costs a single query. LIKE fallbacks also run once. A set
+        small enough is kept for refinement, as by ``search_all``.
 
-        # Search in educational programs
-        results.extend(self._search_programs(keyword))
+        Args:
+            keyword: Search keyword or phrase
+            page_size: Number of results per yielded page
+            cancellation: Optional token that interrupts the running statement
 
-        # Search in disciplines
-        results.extend(self._search_disciplines(keyword))
+        Yields:
+            List[SearchResult]: The next page of results
 
-        # Search in topics
-        results.extend(self._search_topics(keyword))
+        Raises:
+            SearchCancelled: If ``cancellation`` was cancelled before or during the query
+        """
+        if not keyword or not keyword.strip():
+            return
+        page_size = max(1, int(page_size))
 
-        # Search in lessons
-        results.extend(self._search_lessons(keyword))
+        normalized = self._refine_key(keyword)
+        data_version = self.db.data_version()
+        refined = self._refine(normalized, data_version)
+        if refined is not None:
+            for start in range(0, len(refined), page_size):
+                yield refined[start:start + page_size]
+            return
 
-        # Search in questions
-        results.extend(self._search_questions(keyword))
+        fts_query = self._fts_query(keyword)
+        trigram_query = self._trigram_query(keyword)
+        with self.db.get_connection() as conn:
+            with cancellation.bind(conn) if cancellation is not None else nullcontext(conn):
+                mode = None
+                cursor = None
+                rows = []
+                if fts_query:
+                    cursor = self._branch_cursor(conn, self._FTS_BRANCHES, fts_query, -1, 0)
+                    rows = cursor.fetchmany(page_size)
+                    if rows:
+                        mode = "word"
+                    else:
+                        cursor.close()
+                if mode is None and trigram_query and self._has_trigram_index(conn):
+                    cursor = self._branch_cursor(conn, self._TRIGRAM_BRANCHES, trigram_query, -1, 0)
+                    rows = cursor.fetchmany(page_size)
+                    mode = "trigram"
+                if mode is not None:
+                    # Same conditions as search_all for keeping the set.
+                    kept: Optional[list] = [] if fts_query else None
+                    with closing(cursor):
+                        while rows:
+                            results = [self._row_to_search_result(row) for row in rows]
+                            if kept is not None:
+                                kept.extend(zip(results, rows))
+                                if len(kept) > self.REFINE_CANDIDATE_LIMIT or any(
+                                    row["search_text"] is None for row in rows
+                                ):
+                                    kept = None
+                            yield results
+                            rows = cursor.fetchmany(page_size)
+                    if kept is not None:
+                        self._store_refine_candidates(
+                            normalized,
+                            data_version,
+                            mode,
+                            [result for result, _row in kept],
+                            [self._refine_text(mode, row["search_text"]) for _result, row in kept],
+                        )
+                    return
+        if fts_query:
+            return
+        if cancellation is not None:
+            cancellation.raise_if_cancelled()
+        results = self._fallback_search(keyword)
+        for start in range(0, len(results), page_size):
+            yield results[start:start + page_size]
+
+    def _refine_key(self, keyword: str) -> str:
+        return " ".join(self._APOSTROPHES.sub("'", keyword).lower().split())
+
+    def _fold_words(self, text: str) -> List[str]:
+        """Split and fold text like the unicode61 tokenizer (case, Latin diacritics)."""
+        text = unicodedata.normalize("NFD", text.lower())
+        return self._WORD.findall(unicodedata.normalize("NFC", self._LATIN_MARKS.sub("", text)))
+
+    def _refine_text(self, mode: str, search_text: Optional[str]) -> str:
+        if mode == "trigram":
+            return (search_text or "").lower()
+        # Word starts are marked by a leading space, so prefix tests are substring tests.
+        return " " + " ".join(self._fold_words(search_text or ""))
+
+    def _store_refine_candidates(
+        self,
+        query: str,
+        data_version: int,
+        mode: str,
+        results: List[SearchResult],
+        texts: List[str],
+    ) -> None:
+        # Skip storing if a write landed while the query was running.
+        if self.db.data_version() != data_version:
+            return
+        with self._refine_lock:
+            self._refine_candidates = _RefineCandidates(
+                data_version, query, mode, tuple(replace(result) for result in results), tuple(texts)
+            )
 
-        # Search in methodical materials
-        results.extend(self._search_materials(keyword))
+    def _refine(self, query: str, data_version: int) -> Optional[List[SearchResult]]:
+        """
+        Filter the kept result set for a query extending the one that produced it.
 
-        # Sort results by relevance score
-        results.sort(key=lambda x: x.relevance_score, reverse=True)
+        The same query gets the kept set back unchanged, so later pages of a
+        streamed search do not run the statement again. Returns None when the
+        set cannot answer ``query``: no set for this data version, the query
+        is not a strict extension, it uses phrases or apostrophe words, or no
+        word match is left (the trigram index would be searched next).
+        """
+        with self._refine_lock:
+            candidates = self._refine_candidates
+        if candidates is None or candidates.data_version != data_version:
+            return None
+        if query == candidates.query:
+            return [replace(result) for result in candidates.results]
+        if (
+            '"' in query
+            or len(query) <= len(candidates.query)
+            or not query.startswith(candidates.query)
+        ):
+            return None
+        if candidates.mode == "word":
+            terms = []
+            for raw_token in re.findall(r"\w+(?:'\w+)*", query):
+                words = self._fold_words(raw_token.strip("_"))
+                if "'" in raw_token or len(words) != 1:
+                    return None
+                terms.append(" " + words[0])
+        else:
+            terms = [term.lower() for term in self._trigram_terms(query)]
+        if not terms:
+            return None
+        kept = [
+            (result, text)
+            for result, text in zip(candidates.results, candidates.texts)
+            if all(term in text for term in terms)
+        ]
+        if not kept and candidates.mode == "word":
+            return None
+        results = [result for result, _text in kept]
+        with self._refine_lock:
+            self._refine_candidates = replace(
+                candidates, query=query, results=tuple(results), texts=tuple(text for _result, text in kept)
+            )
+        return [replace(result) for result in results]
+
+    def _run_branches(
+        self,
+        conn: sqlite3.Connection,
+        branches: tuple,
+        query: str,
+        limit: int,
+        offset: int,
+        cancellation: Optional[SearchCancellation],
+    ) -> list:
+        """Run the merged per-table MATCH statement and return one page of rows."""
+        if cancellation is None:
+            return self._branch_cursor(conn, branches, query, limit, offset).fetchall()
+        with cancellation.bind(conn):
+            return self._branch_cursor(conn, branches, query, limit, offset).fetchall()
+
+    def _branch_cursor(
+        self,
+        conn: sqlite3.Connection,
+        branches: tuple,
+        query: str,
+        limit: int,
+        offset: int,
+    ) -> sqlite3.Cursor:
+        """Execute the merged per-table MATCH statement and return its cursor."""
+        sql = " UNION ALL ".join(branches)
+        sql += " ORDER BY score, entity_rank, id LIMIT ? OFFSET ?"
+        params = [query] * sql.count("MATCH ?") + [limit, offset]
+        return conn.execute(sql, params)
+
+    def _row_to_search_result(self, row) -> SearchResult:
+        """
+        Convert a row of the unified FTS statement to a SearchResult.
 
-        return results
+        Args:
+            row: Database row with the shared column layout
 
-    def _search_teachers(self, keyword: str) -> List[SearchResult]:
-        """Search in teachers using FTS."""
+        Returns:
+            SearchResult: Search result for the row's entity
+        """
+        entity_type = row['entity_type']
+        title = row['title'] or ''
+        description = row['description'] or ''
+        if entity_type == 'teacher':
+            matched_text = self._get_matched_text(row, ['title', 'extra1', 'extra2', 'extra3', 'extra4', 'extra5'])
+            description = f"{row['extra2'] or ''} - {row['extra3'] or ''}".strip(' -')
+        elif entity_type == 'program':
+            matched_text = self._get_matched_text(row, ['title', 'description', 'extra1'])
+            description = f"{row['extra1'] or ''} - {description}".strip(' -')
+        elif entity_type == 'lesson':
+            matched_text = self._get_matched_text(row, ['title', 'description', 'extra1'])
+            description = f"{description} ({row['extra2']}h)"
+            if row['extra1']:
+                description = f"{row['extra1']} | {description}"
+        elif entity_type == 'question':
+            matched_text = self._get_matched_text(row, ['title'])
+            title = title[:100] + '...' if len(title) > 100 else title
+        elif entity_type == 'material':
+            matched_text = self._get_matched_text(row, ['title', 'description', 'extra2'])
+            description = f"{row['extra1']} - {description}"
+            if row['extra2']:
+                description += f" | File: {row['extra2']}"
+            description = description.strip(' -')
+        else:
+            matched_text = self._get_matched_text(row, ['title', 'description'])
+        return SearchResult(
+            entity_type=entity_type,
+            entity_id=row['id'],
+            title=title,
+            description=description,
+            matched_text=matched_text,
+            relevance_score=-(row['score'] or 0)
+        )
+
+    def _fallback_search(self, keyword: str) -> List[SearchResult]:
+        """Run LIKE-based searches for keywords that yield no FTS query."""
         results: List[SearchResult] = []
-        fts_query = self._fts_query(keyword)
-        if not fts_query:
-            return self._fallback_teachers(keyword)
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT t.id, t.full_name, t.military_rank, t.position, t.department,
-                       t.email, t.phone, bm25(teachers_fts) as score
-                FROM teachers t
-                JOIN teachers_fts ON t.id = teachers_fts.rowid
-                WHERE teachers_fts MATCH ?
-                ORDER BY score
-            """, (fts_query,))
-
-            for row in cursor.fetchall():
-                matched_text = self._get_matched_text(
-                    row, ['full_name', 'military_rank', 'position', 'department', 'email', 'phone']
-                )
-                description = f"{row['position'] or ''} - {row['department'] or ''}"
-                results.append(SearchResult(
-                    entity_type='teacher',
-                    entity_id=row['id'],
-                    title=row['full_name'],
-                    description=description.strip(' -'),
-                    matched_text=matched_text,
-                    relevance_score=-(row['score'] or 0)
-                ))
-
-        return results or self._fallback_teachers(keyword)
-
-    def _search_programs(self, keyword: str) -> List[SearchResult]:
-        """Search in educational programs using FTS."""
-        results = []
-        fts_query = self._fts_query(keyword)
-        if not fts_query:
-            return self._fallback_programs(keyword)
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT p.id, p.name, p.description, p.level,
-                       p.duration_hours, bm25(programs_fts) as score
-                FROM educational_programs p
-                JOIN programs_fts ON p.id = programs_fts.rowid
-                WHERE programs_fts MATCH ?
-                ORDER BY score
-            """, (fts_query,))
-
-            for row in cursor.fetchall():
-                matched_text = self._get_matched_text(
-                    row, ['name', 'description', 'level']
-                )
-                description = f"{row['level'] or ''} - {row['description'] or ''}"
-                results.append(SearchResult(
-                    entity_type='program',
-                    entity_id=row['id'],
-                    title=row['name'],
-                    description=description.strip(' -'),
-                    matched_text=matched_text,
-                    relevance_score=-(row['score'] or 0)
-                ))
-
-        return results or self._fallback_programs(keyword)
-
-    def _search_disciplines(self, keyword: str) -> List[SearchResult]:
-        """Search in disciplines using FTS."""
-        results = []
-        fts_query = self._fts_query(keyword)
-        if not fts_query:
-            return self._fallback_disciplines(keyword)
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT d.id, d.name, d.description, bm25(disciplines_fts) as score
-                FROM disciplines d
-                JOIN disciplines_fts ON d.id = disciplines_fts.rowid
-                WHERE disciplines_fts MATCH ?
-                ORDER BY score
-            """, (fts_query,))
-
-            for row in cursor.fetchall():
-                matched_text = self._get_matched_text(
-                    row, ['name', 'description']
-                )
-                results.append(SearchResult(
-                    entity_type='discipline',
-                    entity_id=row['id'],
-                    title=row['name'],
-                    description=row['description'] or '',
-                    matched_text=matched_text,
-                    relevance_score=-(row['score'] or 0)
-                ))
-
-        return results or self._fallback_disciplines(keyword)
-
-    def _search_topics(self, keyword: str) -> List[SearchResult]:
-        """Search in topics using FTS."""
-        results = []
-        fts_query = self._fts_query(keyword)
-        if not fts_query:
-            return self._fallback_topics(keyword)
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT t.id, t.title, t.description, bm25(topics_fts) as score
-                FROM topics t
-                JOIN topics_fts ON t.id = topics_fts.rowid
-                WHERE topics_fts MATCH ?
-                ORDER BY score
-            """, (fts_query,))
-
-            for row in cursor.fetchall():
-                matched_text = self._get_matched_text(
-                    row, ['title', 'description']
-                )
-                results.append(SearchResult(
-                    entity_type='topic',
-                    entity_id=row['id'],
-                    title=row['title'],
-                    description=row['description'] or '',
-                    matched_text=matched_text,
-                    relevance_score=-(row['score'] or 0)
-                ))
-
-        return results or self._fallback_topics(keyword)
-
-    def _search_lessons(self, keyword: str) -> List[SearchResult]:
-        """Search in lessons using FTS."""
-        results = []
-        fts_query = self._fts_query(keyword)
-        if not fts_query:
-            return self._fallback_lessons(keyword)
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT l.id, l.title, l.description, l.duration_hours,
-                       lt.name as lesson_type_name,
-                       bm25(lessons_fts) as score
-                FROM lessons l
-                LEFT JOIN lesson_types lt ON l.lesson_type_id = lt.id
-                JOIN lessons_fts ON l.id = lessons_fts.rowid
-                WHERE lessons_fts MATCH ?
-                ORDER BY score
-            """, (fts_query,))
-
-            for row in cursor.fetchall():
-                matched_text = self._get_matched_text(
-                    row, ['title', 'description', 'lesson_type_name']
-                )
-                lesson_type = row['lesson_type_name'] or ''
-                description = f"{row['description'] or ''} ({row['duration_hours']}h)"
-                if lesson_type:
-                    description = f"{lesson_type} | {description}"
-                results.append(SearchResult(
-                    entity_type='lesson',
-                    entity_id=row['id'],
-                    title=row['title'],
-                    description=description,
-                    matched_text=matched_text,
-                    relevance_score=-(row['score'] or 0)
-                ))
-
-        return results or self._fallback_lessons(keyword)
-
-    def _search_questions(self, keyword: str) -> List[SearchResult]:
-        """Search in questions using FTS."""
-        results = []
-        fts_query = self._fts_query(keyword)
-        if not fts_query:
-            return self._fallback_questions(keyword)
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT q.id, q.content, q.answer,
-                       bm25(questions_fts) as score
-                FROM questions q
-                JOIN questions_fts ON q.id = questions_fts.rowid
-                WHERE questions_fts MATCH ?
-                ORDER BY score
-            """, (fts_query,))
-
-            for row in cursor.fetchall():
-                matched_text = self._get_matched_text(row, ['content'])
-                description = ""
-                results.append(SearchResult(
-                    entity_type='question',
-                    entity_id=row['id'],
-                    title=row['content'][:100] + '...' if len(row['content']) > 100 else row['content'],
-                    description=description,
-                    matched_text=matched_text,
-                    relevance_score=-(row['score'] or 0)
-                ))
-
-        return results or self._fallback_questions(keyword)
-
-    def _search_materials(self, keyword: str) -> List[SearchResult]:
-        """Search in methodical materials using FTS."""
-        results = []
-        fts_query = self._fts_query(keyword)
-        if not fts_query:
-            return self._fallback_materials(keyword)
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT m.id, m.title, m.description, m.material_type,
-                       m.file_name, bm25(materials_fts) as score
-                FROM methodical_materials m
-                JOIN materials_fts ON m.id = materials_fts.rowid
-                WHERE materials_fts MATCH ?
-                ORDER BY score
-            """, (fts_query,))
-
-            for row in cursor.fetchall():
-                matched_text = self._get_matched_text(
-                    row, ['title', 'description', 'file_name']
-                )
-                description = f"{row['material_type']} - {row['description'] or ''}"
-                if row['file_name']:
-                    description += f" | File: {row['file_name']}"
-                results.append(SearchResult(
-                    entity_type='material',
-                    entity_id=row['id'],
-                    title=row['title'],
-                    description=description.strip(' -'),
-                    matched_text=matched_text,
-                    relevance_score=-(row['score'] or 0)
-                ))
-
-        return results or self._fallback_materials(keyword)
+        results.extend(self._fallback_teachers(keyword))
+        results.extend(self._fallback_programs(keyword))
+        results.extend(self._fallback_disciplines(keyword))
+        results.extend(self._fallback_topics(keyword))
+        results.extend(self._fallback_lessons(keyword))
+        results.extend(self._fallback_questions(keyword))
+        results.extend(self._fallback_materials(keyword))
+        return results
 
     def _get_matched_text(self, row: Dict[str, Any], fields: List[str]) -> str:
         """
@@ -452,7 +716,7 @@ class SearchService:
 
     def _fallback_materials(self, keyword: str) -> List[SearchResult]:
         results = []
-        for material in self.material_repo.search(keyword):
+        for material in self.material_repo.search(keyword, include_teachers=False):
             matched_text = " | ".join(
                 value for value in [material.title, material.description or "", material.file_name or ""] if value
             )
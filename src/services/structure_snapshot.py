@@ -0,0 +1,217 @@
+"""Whole-database structure snapshot used by the local sync view."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from ..models.database import Database
+from ..models.entities import Discipline, EducationalProgram, Lesson, MethodicalMaterial, Question, Topic
+from ..repositories.discipline_repository import DisciplineRepository
+from ..repositories.lesson_repository import LessonRepository
+from ..repositories.material_repository import MaterialRepository
+from ..repositories.program_repository import ProgramRepository
+from ..repositories.question_repository import QuestionRepository
+from ..repositories.teacher_repository import TeacherRepository
+from ..repositories.topic_repository import TopicRepository
+
+
+@dataclass
+class StructureSnapshot:
+    """In-memory program hierarchy, materials and authors of one database.
+
+    Mirrors the read methods the sync view calls on controllers
+    (``get_programs``, ``get_program_structure``,
+    ``get_materials_for_entity``) so the trees can be built without further
+    queries. Entities are shared between calls; treat them as read-only.
+    """
+
+    programs: List[EducationalProgram] = field(default_factory=list)
+    disciplines_by_program: Dict[int, List[Discipline]] = field(default_factory=dict)
+    topics_by_discipline: Dict[int, List[Topic]] = field(default_factory=dict)
+    lessons_by_topic: Dict[int, List[Lesson]] = field(default_factory=dict)
+    questions_by_lesson: Dict[int, List[Question]] = field(default_factory=dict)
+    materials_by_entity: Dict[Tuple[str, int], List[MethodicalMaterial]] = field(default_factory=dict)
+
+    def get_programs(self) -> List[EducationalProgram]:
+        return list(self.programs)
+
+    def get_program_disciplines(self, program_id: int) -> List[Discipline]:
+        return list(self.disciplines_by_program.get(program_id, []))
+
+    def get_program_structure(self, program_id: int) -> List[Discipline]:
+        return self.get_program_disciplines(program_id)
+
+    def get_discipline_topics(self, discipline_id: int) -> List[Topic]:
+        return list(self.topics_by_discipline.get(discipline_id, []))
+
+    def get_topic_lessons(self, topic_id: int) -> List[Lesson]:
+        return list(self.lessons_by_topic.get(topic_id, []))
+
+    def get_lesson_questions(self, lesson_id: int) -> List[Question]:
+        return list(self.questions_by_lesson.get(lesson_id, []))
+
+    def get_materials_for_entity(self, entity_type: str, entity_id: int) -> List[MethodicalMaterial]:
+        return list(self.materials_by_entity.get((entity_type, entity_id), []))
+
+    def compare_index(self, program: Optional[EducationalProgram] = None) -> dict:
+        """
+        Build the name-keyed lookup used to match source nodes to this database.
+
+        Args:
+            program: Restrict the index to this program (it also becomes
+                ``selected_program``); all programs when omitted
+
+        Returns:
+            dict: programs, disciplines, topics and lessons keyed by name per parent ID
+        """
+        programs = [program] if program is not None else self.programs
+        disciplines = {}
+        topics = {}
+        lessons = {}
+        for item in programs:
+            disciplines[item.id] = {d.name: d for d in self.disciplines_by_program.get(item.id, [])}
+            for discipline in disciplines[item.id].values():
+                topics[discipline.id] = {t.title: t for t in self.topics_by_discipline.get(discipline.id, [])}
+                for topic in topics[discipline.id].values():
+                    lessons[topic.id] = {l.title: l for l in self.lessons_by_topic.get(topic.id, [])}
+        index = {
+            "programs": {p.name: p for p in programs},
+            "disciplines": disciplines,
+            "topics": topics,
+            "lessons": lessons,
+        }
+        if program is not None:
+            index["selected_program"] = program
+        return index
+
+
+def load_structure_snapshot(database: Database) -> StructureSnapshot:
+    """
+    Load the full hierarchy of a database with one query per table level.
+
+    Args:
+        database: Database to read
+
+    Returns:
+        StructureSnapshot: Programs with nested disciplines, topics, lessons and
+            questions plus materials (with authors) per associated entity
+    """
+    program_repo = ProgramRepository(database)
+    discipline_repo = DisciplineRepository(database)
+    topic_repo = TopicRepository(database)
+    lesson_repo = LessonRepository(database)
+    question_repo = QuestionRepository(database)
+    material_repo = MaterialRepository(database)
+    teacher_repo = TeacherRepository(database)
+    snapshot = StructureSnapshot()
+
+    with database.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, name, description, level, year, duration_hours,
+                   created_at, updated_at
+            FROM educational_programs ORDER BY name
+        """)
+        snapshot.programs = [program_repo._row_to_program(row) for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT pd.program_id as parent_id,
+                   d.id, d.name, d.description, pd.order_index as order_index,
+                   d.created_at, d.updated_at
+            FROM program_disciplines pd
+            JOIN disciplines d ON d.id = pd.discipline_id
+            ORDER BY pd.program_id, pd.order_index, d.id
+        """)
+        for row in cursor.fetchall():
+            snapshot.disciplines_by_program.setdefault(row["parent_id"], []).append(
+                discipline_repo._row_to_discipline(row)
+            )
+
+        cursor.execute("""
+            SELECT dt.discipline_id as parent_id,
+                   t.id, t.title, t.description, dt.order_index as order_index,
+                   t.created_at, t.updated_at
+            FROM discipline_topics dt
+            JOIN topics t ON t.id = dt.topic_id
+            ORDER BY dt.discipline_id, dt.order_index, t.id
+        """)
+        for row in cursor.fetchall():
+            snapshot.topics_by_discipline.setdefault(row["parent_id"], []).append(topic_repo._row_to_topic(row))
+
+        cursor.execute("""
+            SELECT tl.topic_id as parent_id,
+                   l.id, l.title, l.description, l.duration_hours,
+                   l.lesson_type_id, lt.name as lesson_type_name,
+                   l.classroom_hours, l.self_study_hours,
+                   l.order_index, l.created_at, l.updated_at
+            FROM topic_lessons tl
+            JOIN lessons l ON l.id = tl.lesson_id
+            LEFT JOIN lesson_types lt ON l.lesson_type_id = lt.id
+            ORDER BY tl.topic_id, tl.order_index, l.id
+        """)
+        for row in cursor.fetchall():
+            snapshot.lessons_by_topic.setdefault(row["parent_id"], []).append(lesson_repo._row_to_lesson(row))
+
+        cursor.execute("""
+            SELECT lq.lesson_id as parent_id,
+                   q.id, q.content, q.answer,
+                   q.order_index, q.created_at, q.updated_at
+            FROM lesson_questions lq
+            JOIN questions q ON q.id = lq.question_id
+            ORDER BY lq.lesson_id, CASE
+                WHEN lq.order_index IS NULL OR lq.order_index = 0 THEN q.order_index
+                ELSE lq.order_index
+            END, q.order_index, q.id
+        """)
+        for row in cursor.fetchall():
+            snapshot.questions_by_lesson.setdefault(row["parent_id"], []).append(
+                question_repo._row_to_question(row)
+            )
+
+        cursor.execute("""
+            SELECT ma.entity_type, ma.entity_id,
+                   m.id, m.title, m.material_type, m.description,
+                   m.original_filename, m.stored_filename, m.relative_path, m.file_type,
+                   m.file_path, m.file_name, m.created_at, m.updated_at
+            FROM material_associations ma
+            JOIN methodical_materials m ON m.id = ma.material_id
+            ORDER BY ma.entity_type, ma.entity_id, m.title
+        """)
+        materials: Dict[int, MethodicalMaterial] = {}
+        for row in cursor.fetchall():
+            material = materials.get(row["id"])
+            if material is None:
+                material = materials[row["id"]] = material_repo._row_to_material(row)
+                material.teachers = []
+            snapshot.materials_by_entity.setdefault((row["entity_type"], row["entity_id"]), []).append(material)
+
+        cursor.execute("""
+            SELECT tm.material_id, t.id, t.full_name, t.order_index, t.military_rank, t.position,
+                   t.department, t.email, t.phone, t.created_at, t.updated_at
+            FROM teacher_materials tm
+            JOIN teachers t ON t.id = tm.teacher_id
+            ORDER BY
+                tm.material_id,
+                CASE WHEN COALESCE(t.order_index, 0) > 0 THEN 0 ELSE 1 END,
+                COALESCE(t.order_index, 0),
+                t.full_name
+        """)
+        for row in cursor.fetchall():
+            material = materials.get(row["material_id"])
+            if material is not None:
+                material.teachers.append(teacher_repo._row_to_teacher(row))
+
+    # Assemble the tree like ProgramRepository.get_program_structure: the
+    # level lists are shared, lessons get their own copy per topic link.
+    for topic_lessons in snapshot.lessons_by_topic.values():
+        for index, lesson in enumerate(topic_lessons):
+            topic_lessons[index] = replace(lesson, questions=list(snapshot.questions_by_lesson.get(lesson.id, [])))
+    for discipline_topics in snapshot.topics_by_discipline.values():
+        for topic in discipline_topics:
+            topic.lessons = snapshot.lessons_by_topic.get(topic.id, [])
+    for program_disciplines in snapshot.disciplines_by_program.values():
+        for discipline in program_disciplines:
+            discipline.topics = snapshot.topics_by_discipline.get(discipline.id, [])
+    for program in snapshot.programs:
+        program.disciplines = snapshot.disciplines_by_program.get(program.id, [])
+    return snapshot
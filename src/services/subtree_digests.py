@@ -0,0 +1,175 @@
+"""Persisted subtree digests of the program hierarchy for sync compare."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..models.database import Database
+from .file_fingerprints import FileFingerprintCache, material_file_location
+
+
+# parent type -> (link table, parent column, child column, child table, child label column, child type)
+_CHILD_LEVELS = {
+    "program": ("program_disciplines", "program_id", "discipline_id", "disciplines", "name", "discipline"),
+    "discipline": ("discipline_topics", "discipline_id", "topic_id", "topics", "title", "topic"),
+    "topic": ("topic_lessons", "topic_id", "lesson_id", "lessons", "title", "lesson"),
+}
+
+DIGEST_ENTITY_TYPES = ("program", "discipline", "topic", "lesson")
+
+
+class SubtreeDigestService:
+    """One content hash per program, discipline, topic and lesson.
+
+    A digest covers the node's child titles and child digests, lesson
+    question texts and the attached materials (title, type, file CRC and
+    authors), so two subtrees in different databases are identical exactly
+    when their digests match. Digests are stored in ``subtree_digests`` per
+    files root, with the size and mtime of every file they cover, and
+    dropped by triggers whenever something in the database they cover
+    changes; a stored digest whose files were rewritten is ignored. Missing
+    ones are recomputed on demand, bottom-up, reusing every valid child digest.
+    """
+
+    def __init__(self, database: Database, files_root: Path, fingerprints: Optional[FileFingerprintCache] = None):
+        """
+        Initialize digest service.
+
+        Args:
+            database: Database whose hierarchy is digested
+            files_root: Root directory of the database's material files
+            fingerprints: File CRC cache to reuse (one is created if omitted)
+        """
+        self.db = database
+        self.files_root = Path(files_root)
+        self.fingerprints = fingerprints or FileFingerprintCache(database)
+        self._root_key = str(self.files_root)
+
+    def digest(self, entity_type: str, entity_id: int) -> Optional[str]:
+        """
+        Return the digest of a node, computing and storing missing ones.
+
+        Args:
+            entity_type: program, discipline, topic or lesson
+            entity_id: ID of the node
+
+        Returns:
+            Optional[str]: Hex digest, or None for entity types without digests
+        """
+        if entity_type not in DIGEST_ENTITY_TYPES:
+            return None
+        computed: Dict[Tuple[str, int], Tuple[str, List[list]]] = {}
+        with self.db.get_connection() as conn:
+            value, _stamps = self._digest(conn.cursor(), entity_type, entity_id, computed)
+        if computed:
+            with self.db.get_connection() as conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO subtree_digests (entity_type, entity_id, files_root, digest, file_stamps)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (key[0], key[1], self._root_key, digest, json.dumps(stamps, ensure_ascii=False))
+                        for key, (digest, stamps) in computed.items()
+                    ],
+                )
+        return value
+
+    def _digest(
+        self, cursor, entity_type: str, entity_id: int, computed: dict  # noqa: ANN001
+    ) -> Tuple[str, List[list]]:
+        key = (entity_type, entity_id)
+        if key in computed:
+            return computed[key]
+        cursor.execute(
+            """
+            SELECT digest, file_stamps FROM subtree_digests
+            WHERE entity_type = ? AND entity_id = ? AND files_root = ?
+            """,
+            (entity_type, entity_id, self._root_key),
+        )
+        row = cursor.fetchone()
+        if row is not None:
+            stored_stamps = json.loads(row[1])
+            if all(_file_stamp(stamp[0]) == stamp for stamp in stored_stamps):
+                return row[0], stored_stamps
+
+        stamps: Dict[str, list] = {}
+
+        if entity_type == "lesson":
+            cursor.execute(
+                """
+                SELECT q.content
+                FROM lesson_questions lq
+                JOIN questions q ON q.id = lq.question_id
+                WHERE lq.lesson_id = ?
+                """,
+                (entity_id,),
+            )
+            children = sorted(row[0] or "" for row in cursor.fetchall())
+        else:
+            link_table, parent_column, child_column, child_table, label_column, child_type = _CHILD_LEVELS[entity_type]
+            cursor.execute(
+                f"""
+                SELECT c.id, c.{label_column}
+                FROM {link_table} link
+                JOIN {child_table} c ON c.id = link.{child_column}
+                WHERE link.{parent_column} = ?
+                """,
+                (entity_id,),
+            )
+            children = []
+            for row in cursor.fetchall():
+                child_digest, child_stamps = self._digest(cursor, child_type, row[0], computed)
+                children.append([row[1] or "", child_digest])
+                stamps.update((stamp[0], stamp) for stamp in child_stamps)
+            children.sort()
+
+        payload = [entity_type, children, self._materials_payload(cursor, entity_type, entity_id, stamps)]
+        value = hashlib.sha1(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+        computed[key] = (value, sorted(stamps.values()))
+        return computed[key]
+
+    def _materials_payload(
+        self, cursor, entity_type: str, entity_id: int, stamps: Dict[str, list]  # noqa: ANN001
+    ) -> List[list]:
+        cursor.execute(
+            """
+            SELECT m.id, m.title, m.material_type, m.relative_path, m.file_path, t.full_name
+            FROM material_associations ma
+            JOIN methodical_materials m ON m.id = ma.material_id
+            LEFT JOIN teacher_materials tm ON tm.material_id = m.id
+            LEFT JOIN teachers t ON t.id = tm.teacher_id
+            WHERE ma.entity_type = ? AND ma.entity_id = ?
+            """,
+            (entity_type, entity_id),
+        )
+        materials: Dict[int, list] = {}
+        for row in cursor.fetchall():
+            entry = materials.get(row[0])
+            if entry is None:
+                located = material_file_location(row[3], row[4], self.files_root)
+                crc = 0
+                if located:
+                    # Stamped before hashing, so a file changing meanwhile is hashed again next time.
+                    stamp = _file_stamp(str(located[1]))
+                    stamps[stamp[0]] = stamp
+                    crc = self.fingerprints.crc32(*located)
+                entry = materials[row[0]] = [row[1] or "", row[2] or "", crc, []]
+            if row[5]:
+                entry[3].append(row[5])
+        for entry in materials.values():
+            entry[3].sort()
+        return sorted(materials.values())
+
+
+def _file_stamp(path: str) -> list:
+    """Return [path, size, mtime_ns] of a file; size and mtime are None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return [path, None, None]
+    return [path, stat.st_size, stat.st_mtime_ns]
@@ -165,6 +165,7 @@ UK_UI_FALLBACKS = {
     "Synchronize Internet DB changes to local database (merge, no full overwrite)?": "Синхронізувати зміни з Internet DB до локальної бази даних (злиття без повного перезапису)?",
     "Confirm synchronization": "Підтвердити синхронізацію",
     "Synchronization completed": "Синхронізацію завершено",
+    "Synchronizing {0}: {1} rows": "Синхронізація {0}: {1} рядків",
     "Synchronization": "Синхронізація",
     "Synchronization completed.\nRows processed:\n{0}": "Синхронізацію завершено.\nОпрацьовано рядків:\n{0}",
     "Synchronization failed": "Синхронізація завершилася помилкою",
@@ -183,6 +184,8 @@ UK_UI_FALLBACKS = {
     "Cleanup completed.\nBackup saved to: {0}": "Очищення завершено.\nРезервну копію збережено до: {0}",
     "No input text provided.": "Не надано вхідного тексту.",
     "Import complete": "Імпорт завершено",
+    "Parsing files...": "Розбір файлів...",
+    "Parsed {0} of {1}: {2}": "Розібрано {0} з {1}: {2}",
     "Added topics: {0}\nAdded lessons: {1}\nAdded questions: {2}": "Додано тем: {0}\nДодано занять: {1}\nДодано питань: {2}",
     "Select a topic first.": "Спочатку оберіть тему.",
     "Select a lesson first.": "Спочатку оберіть заняття.",
@@ -280,6 +283,8 @@ UK_UI_FALLBACKS = {
     "Manage reference lists for material types and lesson types here. These values are used across the whole database.": "Тут керуйте довідниками типів матеріалів і типів занять. Ці значення використовуються в усій базі даних.",
     "Lesson types": "Типи занять",
     "Search Results": "Результати пошуку",
+    "Search Results ({0})": "Результати пошуку ({0})",
+    "Search as you type": "Шукати під час введення",
     "Details": "Деталі",
     "Methodical Materials": "Методичні матеріали",
     "Use the tree on the left to choose a program element. Use the action bar above to add, edit, copy, or import structure items.": "Використовуйте дерево ліворуч, щоб вибрати елемент програми. Використовуйте панель дій угорі, щоб додавати, редагувати, копіювати або імпортувати елементи структури.",
@@ -32,6 +32,7 @@ from PySide6.QtWidgets import (
     QInputDialog,
     QSizePolicy,
     QFormLayout,
+    QProgressDialog,
 )
 import json
 import sqlite3
@@ -67,6 +68,8 @@ from ..ui.dialogs import (
     QuestionDialog,
 )
 from ..services.import_service import (
+    BatchImportPlanItem,
+    build_batch_import_plan,
     import_curriculum_structure,
     import_curriculum_structure_by_names,
     import_teachers_from_docx,
@@ -1071,17 +1074,19 @@ class AdminDialog(
                 return
             db_path = Path(choice)
 
+        self._reset_file_fingerprints()
         self.sync_source_db = Database(str(db_path))
         self.sync_source_admin = AdminController(self.sync_source_db)
         self.sync_source_main = MainController(self.sync_source_db)
         self.sync_source_files_root = self._resolve_sync_files_root(sync_root)
         self.sync_target_main = MainController(self.controller.db)
+        # Hash material files in the background while the trees are built.
+        self._prefetch_material_crcs(self.sync_source_admin, self.sync_source_files_root)
+        self._prefetch_material_crcs(self.controller, self.file_storage.files_root)
         self._sync_teacher_cache = {t.full_name: t for t in self.controller.get_teachers() if t.full_name}
 
-        self.sync_source_programs = []
-        for program in self.sync_source_main.get_programs():
-            program.disciplines = self.sync_source_main.get_program_structure(program.id)
-            self.sync_source_programs.append(program)
+        self._reset_sync_snapshots()
+        self.sync_source_programs = self._sync_snapshot(self.sync_source_main).get_programs()
 
         self._sync_compare_index = self._build_sync_compare_index(self.sync_target_main)
         self._populate_sync_program_selectors()
@@ -1143,6 +1148,7 @@ class AdminDialog(
             hide_identical=self.sync_hide_identical.isChecked(),
             programs=[source_program] if source_program else None,
         )
+        self._flush_file_fingerprints()
 
     def _get_selected_sync_source_program(self):
         if hasattr(self, "sync_source_program_combo"):
@@ -1196,7 +1202,7 @@ class AdminDialog(
             target_program_discipline,
         )
 
-        disciplines = self.sync_source_main.get_program_structure(program.id)
+        disciplines = self._sync_snapshot(self.sync_source_main).get_program_structure(program.id)
         for discipline in disciplines:
             target_discipline = self.controller.add_discipline(
                 Discipline(
@@ -1288,7 +1294,9 @@ class AdminDialog(
         programs: list | None = None,
     ) -> None:  # noqa: ANN001
         tree.clear()
-        program_list = programs if programs is not None else controller.get_programs()
+        snapshot = self._sync_snapshot(controller)
+        target_snapshot = self._sync_snapshot(self.sync_target_main) if compare_index else None
+        program_list = programs if programs is not None else snapshot.get_programs()
         for program in program_list:
             if program is None:
                 continue
@@ -1315,7 +1323,7 @@ class AdminDialog(
                     missing = self._materials_diff("program", program.id, target_program.id if target_program else None)
                     if missing:
                         self._mark_materials_diff(program_item, missing)
-            disciplines = controller.get_program_structure(program.id)
+            disciplines = snapshot.get_program_structure(program.id)
             for discipline in disciplines:
                 target_discipline = None
                 if compare_index and target_program:
@@ -1379,10 +1387,7 @@ class AdminDialog(
                             target_lesson = compare_index["lessons"].get(target_topic.id, {}).get(lesson.title)
                             if target_lesson:
                                 target_question_contents = {
-                                    q.content
-                                    for q in self.sync_target_main.lesson_repo.get_lesson_questions(
-                                        target_lesson.id
-                                    )
+                                    q.content for q in target_snapshot.get_lesson_questions(target_lesson.id)
                                 }
                             if hide_identical and target_lesson:
                                 if self._is_identical_entity(
@@ -1419,39 +1424,39 @@ class AdminDialog(
                                 question_item.setCheckState(0, Qt.Unchecked)
                             lesson_item.addChild(question_item)
                         self._append_material_children(
-                            controller,
+                            snapshot,
                             "lesson",
                             lesson.id,
                             lesson_item,
-                            target_controller=self.sync_target_main if compare_index else None,
+                            target_controller=target_snapshot,
                             target_entity_id=target_lesson.id if target_lesson else None,
                         )
                         topic_item.addChild(lesson_item)
                     self._append_material_children(
-                        controller,
+                        snapshot,
                         "topic",
                         topic.id,
                         topic_item,
-                        target_controller=self.sync_target_main if compare_index else None,
+                        target_controller=target_snapshot,
                         target_entity_id=target_topic.id if target_topic else None,
                     )
                     discipline_item.addChild(topic_item)
                 self._append_material_children(
-                    controller,
+                    snapshot,
                     "discipline",
                     discipline.id,
                     discipline_item,
-                    target_controller=self.sync_target_main if compare_index else None,
+                    target_controller=target_snapshot,
                     target_entity_id=target_discipline.id if target_discipline else None,
                 )
                 program_item.addChild(discipline_item)
             tree.addTopLevelItem(program_item)
             self._append_material_children(
-                controller,
+                snapshot,
                 "program",
                 program.id,
                 program_item,
-                target_controller=self.sync_target_main if compare_index else None,
+                target_controller=target_snapshot,
                 target_entity_id=target_program.id if target_program else None,
             )
         tree.expandAll()
@@ -1820,26 +1825,20 @@ class AdminDialog(
         if file_paths:
             totals = {"topics": 0, "lessons": 0, "questions": 0}
             errors = []
-            from ..services.import_service import extract_text_from_file, parse_curriculum_text, program_discipline_from_filename
-
-            for path in file_paths:
+            plan = self._build_batch_plan_with_progress(file_paths, errors)
+            for item in plan:
                 try:
-                    content = extract_text_from_file(path)
-                    topics = parse_curriculum_text(content)
-                    program_name, discipline_name = program_discipline_from_filename(path)
-                    if not discipline_name:
-                        discipline_name = program_name
                     t_added, l_added, q_added = import_curriculum_structure_by_names(
                         self.controller.db,
-                        program_name,
-                        discipline_name,
-                        topics,
+                        item.program_name,
+                        item.discipline_name,
+                        item.topics,
                     )
                     totals["topics"] += t_added
                     totals["lessons"] += l_added
                     totals["questions"] += q_added
                 except (OSError, ValueError, RuntimeError, sqlite3.Error, TypeError) as exc:
-                    errors.append(f"{path}: {exc}")
+                    errors.append(f"{item.path}: {exc}")
 
             if errors:
                 QMessageBox.warning(self, self.tr("Import error"), "\n".join(errors))
@@ -1884,6 +1883,22 @@ class AdminDialog(
         )
         self._refresh_all()
 
+    def _build_batch_plan_with_progress(self, file_paths: list[str], errors: list[str]) -> list[BatchImportPlanItem]:
+        progress_dialog = QProgressDialog(self.tr("Parsing files..."), "", 0, len(file_paths), self)
+        progress_dialog.setWindowTitle(self.tr("Import curriculum structure"))
+        progress_dialog.setCancelButton(None)
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+
+        def report_progress(done: int, total: int, path: str) -> None:
+            progress_dialog.setLabelText(self.tr("Parsed {0} of {1}: {2}").format(done, total, Path(path).name))
+            progress_dialog.setValue(done)
+
+        try:
+            return build_batch_import_plan(file_paths, progress=report_progress, errors=errors)
+        finally:
+            progress_dialog.close()
+
     def _on_import_teachers(self) -> None:
         path, _ = QFileDialog.getOpenFileName(
             self,
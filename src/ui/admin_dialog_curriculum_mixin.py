@@ -378,8 +378,8 @@ class AdminDialogCurriculumMixin:
         topic = self._current_entity(self.topics_table)
         if not topic:
             return
-        materials = self.controller.get_materials()
-        assigned = self.controller.get_materials_for_entity("topic", topic.id)
+        materials = self.controller.get_materials(include_teachers=False)
+        assigned = self.controller.get_materials_for_entity("topic", topic.id, include_teachers=False)
         assigned_ids = {m.id for m in assigned}
         for material in materials:
             label = material.title
@@ -515,8 +515,8 @@ class AdminDialogCurriculumMixin:
         lesson = self._current_entity(self.lessons_table)
         if not lesson:
             return
-        materials = self.controller.get_materials()
-        assigned = self.controller.get_materials_for_entity("lesson", lesson.id)
+        materials = self.controller.get_materials(include_teachers=False)
+        assigned = self.controller.get_materials_for_entity("lesson", lesson.id, include_teachers=False)
         assigned_ids = {m.id for m in assigned}
         for material in materials:
             label = material.title
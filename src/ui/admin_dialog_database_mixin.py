@@ -197,7 +197,9 @@ class AdminDialogDatabaseMixin:
         ) != QMessageBox.Yes:
             return
         try:
+            self.controller.db.close()
             self._copy_database_with_backup(Path(path), Path(self.controller.db.db_path))
+            self.controller.db.bump_data_version()
         except (OSError, ValueError, RuntimeError, sqlite3.Error) as exc:
             QMessageBox.warning(self, self.tr("Import error"), str(exc))
             return
@@ -75,7 +75,12 @@ class AdminDialogMaterialSyncMixin:
         if source_entity_type not in {"program", "discipline", "topic", "lesson"}:
             return
         materials = self.sync_source_admin.get_materials_for_entity(source_entity_type, source_entity_id)
-        existing_titles = {m.title for m in self.controller.get_materials_for_entity(target_entity_type, target_entity_id)}
+        existing_titles = {
+            m.title
+            for m in self.controller.get_materials_for_entity(
+                target_entity_type, target_entity_id, include_teachers=False
+            )
+        }
         material_types = {t.name for t in self.controller.get_material_types()}
         for material in materials:
             if material.material_type and material.material_type not in material_types:
@@ -7,56 +7,195 @@ import sqlite3
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QDialog, QMessageBox, QTreeWidgetItem
 
+from ..controllers.admin_controller import CHANGE_CHILDREN, CHANGE_DELETED, CHANGE_RESET
 from .dialogs import DisciplineDialog, LessonDialog, ProgramDialog, QuestionDialog, TopicDialog
 
 
 class AdminDialogStructureMixin:
     """Structure tree refresh and structure CRUD/copy/duplicate actions."""
 
+    # Parent entity type -> child entity type shown under it; None is the tree root.
+    _STRUCTURE_CHILD_TYPES = {
+        None: "program",
+        "program": "discipline",
+        "discipline": "topic",
+        "topic": "lesson",
+        "lesson": "question",
+    }
+
     def _refresh_structure_tree(self) -> None:
+        """Rebuild the whole structure tree from the database."""
+        self._watch_structure_changes()
+        self._pending_structure_changes = {}
         expanded_keys = self._structure_expanded_keys()
         selected_key = self._structure_selected_key()
         self.structure_tree.clear()
-        item_index = {}
-        for program in self.controller.get_programs():
-            program_item = QTreeWidgetItem([program.name])
-            program_item.setData(0, Qt.UserRole, program)
-            program_item.setData(0, Qt.UserRole + 1, "program")
-            self.structure_tree.addTopLevelItem(program_item)
-            item_index[("program", program.id)] = program_item
-            for discipline in self.controller.get_program_disciplines(program.id):
-                discipline_item = QTreeWidgetItem([discipline.name])
-                discipline_item.setData(0, Qt.UserRole, discipline)
-                discipline_item.setData(0, Qt.UserRole + 1, "discipline")
-                program_item.addChild(discipline_item)
-                item_index[("discipline", discipline.id)] = discipline_item
-                for topic in self.controller.get_discipline_topics(discipline.id):
-                    topic_item = QTreeWidgetItem([topic.title])
-                    topic_item.setData(0, Qt.UserRole, topic)
-                    topic_item.setData(0, Qt.UserRole + 1, "topic")
-                    discipline_item.addChild(topic_item)
-                    item_index[("topic", topic.id)] = topic_item
-                    for lesson in self.controller.get_topic_lessons(topic.id):
-                        lesson_item = QTreeWidgetItem([lesson.title])
-                        lesson_item.setData(0, Qt.UserRole, lesson)
-                        lesson_item.setData(0, Qt.UserRole + 1, "lesson")
-                        topic_item.addChild(lesson_item)
-                        item_index[("lesson", lesson.id)] = lesson_item
-                        for question in self.controller.get_lesson_questions(lesson.id):
-                            question_item = QTreeWidgetItem([question.content])
-                            question_item.setData(0, Qt.UserRole, question)
-                            question_item.setData(0, Qt.UserRole + 1, "question")
-                            lesson_item.addChild(question_item)
-                            item_index[("question", question.id)] = question_item
+        self._structure_item_index = {}
+        root = self.structure_tree.invisibleRootItem()
+        for program in self._structure_children(None, None):
+            root.addChild(self._new_structure_item("program", program))
 
         for key in expanded_keys:
-            item = item_index.get(key)
-            if item:
+            for item in self._structure_item_index.get(key, []):
                 item.setExpanded(True)
-        if selected_key and selected_key in item_index:
-            self.structure_tree.setCurrentItem(item_index[selected_key])
+        if selected_key and self._structure_item_index.get(selected_key):
+            self.structure_tree.setCurrentItem(self._structure_item_index[selected_key][0])
+        self._resize_structure_tree()
+
+    def _watch_structure_changes(self) -> None:
+        source = getattr(self, "_structure_change_source", None)
+        if source is self.controller:
+            return
+        if source is not None:
+            source.remove_change_listener(self._on_structure_change)
+        self.controller.add_change_listener(self._on_structure_change)
+        self._structure_change_source = self.controller
+
+    def _on_structure_change(self, event) -> None:  # noqa: ANN001
+        if event.op == CHANGE_RESET or event.entity_type in self._STRUCTURE_CHILD_TYPES.values():
+            pending = getattr(self, "_pending_structure_changes", None)
+            if pending is None:
+                pending = self._pending_structure_changes = {}
+            pending[event] = None
+
+    def _apply_structure_changes(self) -> None:
+        """Patch tree items affected by controller changes since the last refresh."""
+        changes = list(getattr(self, "_pending_structure_changes", None) or {})
+        self._pending_structure_changes = {}
+        if not changes:
+            return
+        if getattr(self, "_structure_item_index", None) is None or any(c.op == CHANGE_RESET for c in changes):
+            self._refresh_structure_tree()
+            return
+        root_key = (None, None)
+        resync: dict = {}
+        self.structure_tree.blockSignals(True)
+        try:
+            for change in changes:
+                key = (change.entity_type, change.entity_id)
+                if change.op == CHANGE_DELETED:
+                    for item in list(self._structure_item_index.get(key, [])):
+                        self._remove_structure_item(item)
+                elif change.op == CHANGE_CHILDREN:
+                    resync[key] = None
+                elif change.entity_type == "program":
+                    # Programs are sorted by name at the top level.
+                    resync[root_key] = None
+                else:
+                    # Re-reading the parent's children refreshes labels and ordering.
+                    for item in self._structure_item_index.get(key, []):
+                        parent = item.parent()
+                        resync[self._structure_item_key(parent) if parent else root_key] = None
+            for entity_type, entity_id in resync:
+                if entity_type is None:
+                    items = [self.structure_tree.invisibleRootItem()]
+                else:
+                    items = list(self._structure_item_index.get((entity_type, entity_id), []))
+                for item in items:
+                    self._sync_structure_children(item, entity_type, entity_id)
+        finally:
+            self.structure_tree.blockSignals(False)
+        self._on_structure_selection_changed()
         self._resize_structure_tree()
 
+    def _structure_children(self, entity_type, entity_id) -> list:  # noqa: ANN001
+        if entity_type is None:
+            return self.controller.get_programs()
+        if entity_type == "program":
+            return self.controller.get_program_disciplines(entity_id)
+        if entity_type == "discipline":
+            return self.controller.get_discipline_topics(entity_id)
+        if entity_type == "topic":
+            return self.controller.get_topic_lessons(entity_id)
+        if entity_type == "lesson":
+            return self.controller.get_lesson_questions(entity_id)
+        return []
+
+    @staticmethod
+    def _structure_item_label(entity_type: str, entity) -> str:  # noqa: ANN001
+        if entity_type in ("program", "discipline"):
+            return entity.name
+        if entity_type == "question":
+            return entity.content
+        return entity.title
+
+    @staticmethod
+    def _structure_item_key(item: QTreeWidgetItem):
+        entity = item.data(0, Qt.UserRole)
+        return item.data(0, Qt.UserRole + 1), getattr(entity, "id", None)
+
+    def _new_structure_item(self, entity_type: str, entity) -> QTreeWidgetItem:  # noqa: ANN001
+        item = QTreeWidgetItem([self._structure_item_label(entity_type, entity)])
+        item.setData(0, Qt.UserRole, entity)
+        item.setData(0, Qt.UserRole + 1, entity_type)
+        self._structure_item_index.setdefault((entity_type, entity.id), []).append(item)
+        child_type = self._STRUCTURE_CHILD_TYPES.get(entity_type)
+        if child_type:
+            for child in self._structure_children(entity_type, entity.id):
+                item.addChild(self._new_structure_item(child_type, child))
+        return item
+
+    def _sync_structure_children(self, item: QTreeWidgetItem, entity_type, entity_id) -> None:  # noqa: ANN001
+        child_type = self._STRUCTURE_CHILD_TYPES.get(entity_type)
+        if child_type is None:
+            return
+        current = [item.child(idx) for idx in range(item.childCount())]
+        reusable: dict = {}
+        for child in current:
+            reusable.setdefault(self._structure_item_key(child), []).append(child)
+        ordered = []
+        for entity in self._structure_children(entity_type, entity_id):
+            existing = reusable.get((child_type, entity.id))
+            if existing:
+                child = existing.pop(0)
+                child.setText(0, self._structure_item_label(child_type, entity))
+                child.setData(0, Qt.UserRole, entity)
+            else:
+                child = self._new_structure_item(child_type, entity)
+            ordered.append(child)
+        if len(ordered) == len(current) and all(a is b for a, b in zip(ordered, current)):
+            return
+
+        kept = {id(child) for child in ordered}
+        expanded = [
+            node
+            for child in current
+            if id(child) in kept
+            for node in self._iter_structure_subtree(child)
+            if node.isExpanded()
+        ]
+        selected = self.structure_tree.currentItem()
+        item.takeChildren()
+        for child in current:
+            if id(child) not in kept:
+                self._unindex_structure_item(child)
+        item.addChildren(ordered)
+        for node in expanded:
+            node.setExpanded(True)
+        if selected is not None and selected.treeWidget() is self.structure_tree:
+            self.structure_tree.setCurrentItem(selected)
+
+    def _remove_structure_item(self, item: QTreeWidgetItem) -> None:
+        parent = item.parent() or self.structure_tree.invisibleRootItem()
+        parent.removeChild(item)
+        self._unindex_structure_item(item)
+
+    def _unindex_structure_item(self, item: QTreeWidgetItem) -> None:
+        for node in self._iter_structure_subtree(item):
+            key = self._structure_item_key(node)
+            items = self._structure_item_index.get(key, [])
+            items[:] = [other for other in items if other is not node]
+            if not items:
+                self._structure_item_index.pop(key, None)
+
+    @staticmethod
+    def _iter_structure_subtree(item: QTreeWidgetItem):
+        stack = [item]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.child(idx) for idx in range(node.childCount()))
+
     def _refresh_structure_with_reorder(self) -> None:
         selection = self._current_structure_entity()
         if not selection:
@@ -174,23 +313,9 @@ class AdminDialogStructureMixin:
         return None
 
     def _select_structure_entity(self, entity_type: str, entity_id: int) -> None:
-        root_count = self.structure_tree.topLevelItemCount()
-        for i in range(root_count):
-            item = self._find_structure_item(self.structure_tree.topLevelItem(i), entity_type, entity_id)
-            if item:
-                self.structure_tree.setCurrentItem(item)
-                return
-
-    def _find_structure_item(self, item: QTreeWidgetItem, entity_type: str, entity_id: int):
-        if item.data(0, Qt.UserRole + 1) == entity_type:
-            entity = item.data(0, Qt.UserRole)
-            if entity and getattr(entity, "id", None) == entity_id:
-                return item
-        for idx in range(item.childCount()):
-            found = self._find_structure_item(item.child(idx), entity_type, entity_id)
-            if found:
-                return found
-        return None
+        items = getattr(self, "_structure_item_index", {}).get((entity_type, entity_id))
+        if items:
+            self.structure_tree.setCurrentItem(items[0])
 
     def _filtered_teachers_for_target(self, entity_type: str, entity):
         if entity_type == "lesson":
@@ -275,7 +400,7 @@ class AdminDialogStructureMixin:
             return
         self.controller.add_program(program)
         self._log_action("add_program", program.name or "")
-        self._refresh_structure_tree()
+        self._apply_structure_changes()
 
     def _add_structure_discipline(self) -> None:
         item = self.structure_tree.currentItem()
@@ -295,7 +420,7 @@ class AdminDialogStructureMixin:
         self.controller.add_discipline(discipline)
         self.controller.add_discipline_to_program(program.id, discipline.id, discipline.order_index)
         self._log_action("add_discipline", discipline.name or "")
-        self._refresh_structure_tree()
+        self._apply_structure_changes()
 
     def _add_structure_topic(self) -> None:
         item = self.structure_tree.currentItem()
@@ -315,7 +440,7 @@ class AdminDialogStructureMixin:
         self.controller.add_topic(topic)
         self.controller.add_topic_to_discipline(discipline.id, topic.id, topic.order_index)
         self._log_action("add_topic", topic.title or "")
-        self._refresh_structure_tree()
+        self._apply_structure_changes()
 
     def _add_structure_lesson(self) -> None:
         item = self.structure_tree.currentItem()
@@ -339,7 +464,7 @@ class AdminDialogStructureMixin:
         self.controller.add_lesson_to_topic(topic.id, lesson.id, lesson.order_index)
         self._log_action("add_lesson", lesson.title or "")
         self._attach_new_questions_to_lesson(lesson.id, dialog.get_new_questions())
-        self._refresh_structure_tree()
+        self._apply_structure_changes()
 
     def _add_structure_question(self) -> None:
         item = self.structure_tree.currentItem()
@@ -361,7 +486,7 @@ class AdminDialogStructureMixin:
         self.controller.add_question(question)
         self.controller.add_question_to_lesson(lesson.id, question.id, question.order_index)
         self._log_action("add_question", (question.content or "")[:120])
-        self._refresh_structure_tree()
+        self._apply_structure_changes()
 
     def _edit_structure_selected(self) -> None:
         selection = self._current_structure_entity()
@@ -374,7 +499,7 @@ class AdminDialogStructureMixin:
             if dialog.exec() != QDialog.Accepted:
                 return
             self.controller.update_program(dialog.get_program())
-            self._refresh_structure_tree()
+            self._apply_structure_changes()
             self._select_structure_entity(entity_type, entity.id)
             return
         if entity_type == "discipline":
@@ -404,7 +529,7 @@ class AdminDialogStructureMixin:
                 self.controller.update_discipline(updated)
                 if program and parent_type == "program" and parent_id and parent_id != program.id:
                     self.controller.move_discipline_to_program(updated.id, program.id, parent_id)
-                self._refresh_structure_tree()
+                self._apply_structure_changes()
                 self._select_structure_entity("discipline", updated.id)
             else:
                 if not parent_id:
@@ -422,7 +547,7 @@ class AdminDialogStructureMixin:
                 except (ValueError, RuntimeError, sqlite3.Error) as exc:
                     QMessageBox.warning(self, self.tr("Validation"), str(exc))
                     return
-                self._refresh_structure_tree()
+                self._apply_structure_changes()
                 self._select_structure_entity("topic", new_topic.id)
             return
         if entity_type == "topic":
@@ -457,7 +582,7 @@ class AdminDialogStructureMixin:
                 self.controller.update_topic(updated)
                 if discipline and parent_type == "discipline" and parent_id and parent_id != discipline.id:
                     self.controller.move_topic_to_discipline(updated.id, discipline.id, parent_id)
-                self._refresh_structure_tree()
+                self._apply_structure_changes()
                 self._select_structure_entity("topic", updated.id)
             else:
                 if not parent_id:
@@ -470,7 +595,7 @@ class AdminDialogStructureMixin:
                 except (ValueError, RuntimeError, sqlite3.Error) as exc:
                     QMessageBox.warning(self, self.tr("Validation"), str(exc))
                     return
-                self._refresh_structure_tree()
+                self._apply_structure_changes()
                 self._select_structure_entity("discipline", new_discipline.id)
             return
         if entity_type == "lesson":
@@ -484,7 +609,7 @@ class AdminDialogStructureMixin:
             self.controller.update_lesson(updated)
             if topic and updated.order_index > 0:
                 self.controller.update_topic_lesson_order(topic.id, updated.id, updated.order_index)
-            self._refresh_structure_tree()
+            self._apply_structure_changes()
             self._select_structure_entity(entity_type, entity.id)
             return
         if entity_type == "question":
@@ -498,7 +623,7 @@ class AdminDialogStructureMixin:
             self.controller.update_question(updated)
             if lesson and updated.order_index > 0:
                 self.controller.update_lesson_question_order(lesson.id, updated.id, updated.order_index)
-            self._refresh_structure_tree()
+            self._apply_structure_changes()
             self._select_structure_entity(entity_type, entity.id)
 
     def _delete_structure_selected(self) -> None:
@@ -524,7 +649,7 @@ class AdminDialogStructureMixin:
         elif entity_type == "question":
             self.controller.delete_question(entity.id)
             self._log_action("delete_question", (entity.content or "")[:120])
-        self._refresh_structure_tree()
+        self._apply_structure_changes()
 
     def _duplicate_structure_selected(self) -> None:
         selection = self._current_structure_entity()
@@ -552,7 +677,7 @@ class AdminDialogStructureMixin:
             if lesson:
                 new_entity = self.controller.duplicate_question(entity.id, lesson.id)
         if new_entity:
-            self._refresh_structure_tree()
+            self._apply_structure_changes()
             self._select_structure_entity(entity_type, new_entity.id)
 
     def _copy_structure_selected(self) -> None:
@@ -581,5 +706,5 @@ class AdminDialogStructureMixin:
             if lesson:
                 new_entity = self.controller.copy_question(entity.id, lesson.id)
         if new_entity:
-            self._refresh_structure_tree()
+            self._apply_structure_changes()
             self._select_structure_entity(entity_type, new_entity.id)
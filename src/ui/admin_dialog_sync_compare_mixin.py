@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import zlib
 from pathlib import Path
 
 from PySide6.QtCore import Qt
@@ -10,6 +9,9 @@ from PySide6.QtGui import QBrush, QColor
 from PySide6.QtWidgets import QTreeWidgetItem
 
 from ..models.entities import EducationalProgram, MethodicalMaterial
+from ..services.file_fingerprints import FileFingerprintCache, material_file_location
+from ..services.structure_snapshot import StructureSnapshot, load_structure_snapshot
+from ..services.subtree_digests import SubtreeDigestService
 
 
 class AdminDialogSyncCompareMixin:
@@ -31,161 +33,111 @@ class AdminDialogSyncCompareMixin:
         target_controller,
         target_files_root: Path,
     ) -> bool:  # noqa: ANN001
-        source_sig = self._entity_signature(
-            source_controller, entity_type, source_entity, source_files_root, {}
+        source_digest = self._subtree_digests(source_controller, source_files_root).digest(
+            entity_type, source_entity.id
         )
-        target_sig = self._entity_signature(
-            target_controller, entity_type, target_entity, target_files_root, {}
+        if source_digest is None:
+            return False
+        target_digest = self._subtree_digests(target_controller, target_files_root).digest(
+            entity_type, target_entity.id
         )
-        return source_sig == target_sig
-
-    def _entity_signature(
-        self,
-        controller,
-        entity_type: str,
-        entity,
-        files_root: Path,
-        cache: dict,
-    ) -> tuple:  # noqa: ANN001
-        cache_key = (entity_type, getattr(entity, "id", None), str(files_root))
-        if cache_key in cache:
-            return cache[cache_key]
-        if entity_type == "lesson":
-            questions = controller.lesson_repo.get_lesson_questions(entity.id)
-            q_sig = tuple(sorted(q.content for q in questions))
-            m_sig = tuple(self._materials_signature(controller, "lesson", entity.id, files_root))
-            sig = ("lesson", q_sig, m_sig)
-        elif entity_type == "topic":
-            lessons = controller.topic_repo.get_topic_lessons(entity.id)
-            l_sig = tuple(
-                sorted(
-                    (
-                        lesson.title,
-                        self._entity_signature(controller, "lesson", lesson, files_root, cache),
-                    )
-                    for lesson in lessons
-                )
-            )
-            m_sig = tuple(self._materials_signature(controller, "topic", entity.id, files_root))
-            sig = ("topic", l_sig, m_sig)
-        elif entity_type == "discipline":
-            topics = controller.discipline_repo.get_discipline_topics(entity.id)
-            t_sig = tuple(
-                sorted(
-                    (
-                        topic.title,
-                        self._entity_signature(controller, "topic", topic, files_root, cache),
-                    )
-                    for topic in topics
-                )
-            )
-            m_sig = tuple(self._materials_signature(controller, "discipline", entity.id, files_root))
-            sig = ("discipline", t_sig, m_sig)
-        elif entity_type == "program":
-            disciplines = controller.program_repo.get_program_disciplines(entity.id)
-            d_sig = tuple(
-                sorted(
-                    (
-                        disc.name,
-                        self._entity_signature(controller, "discipline", disc, files_root, cache),
-                    )
-                    for disc in disciplines
-                )
-            )
-            m_sig = tuple(self._materials_signature(controller, "program", entity.id, files_root))
-            sig = ("program", d_sig, m_sig)
-        else:
-            sig = (entity_type, getattr(entity, "id", None))
-        cache[cache_key] = sig
-        return sig
-
-    def _materials_signature(
-        self,
-        controller,
-        entity_type: str,
-        entity_id: int,
-        files_root: Path,
-    ) -> list[tuple]:  # noqa: ANN001
-        materials = controller.get_materials_for_entity(entity_type, entity_id)
-        sig = []
-        for material in materials:
-            crc = self._material_crc(material, files_root)
-            authors = self._material_author_labels(controller, material)
-            sig.append((material.title, material.material_type, crc, authors))
-        return sorted(sig)
-
-    def _material_crc(self, material: MethodicalMaterial, files_root: Path) -> int:
-        path = None
-        if material.relative_path:
-            path = files_root / material.relative_path
-        elif material.file_path:
-            path = Path(material.file_path)
-            if not path.is_absolute():
-                path = files_root / material.file_path
-        if not path or not path.exists():
-            return 0
-        checksum = 0
-        with open(path, "rb") as handle:
-            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-                checksum = zlib.crc32(chunk, checksum)
-        return checksum & 0xFFFFFFFF
+        return source_digest == target_digest
+
+    def _subtree_digests(self, controller, files_root: Path) -> SubtreeDigestService:  # noqa: ANN001
+        services = getattr(self, "_subtree_digest_services", None)
+        if services is None:
+            services = self._subtree_digest_services = {}
+        key = (controller.db, str(files_root))
+        service = services.get(key)
+        if service is None:
+            service = SubtreeDigestService(controller.db, files_root, self._file_fingerprints(controller))
+            services[key] = service
+        return service
+
+    @staticmethod
+    def _material_file_location(material: MethodicalMaterial, files_root: Path) -> tuple[str, Path] | None:
+        return material_file_location(material.relative_path, material.file_path, files_root)
+
+    def _file_fingerprints(self, controller) -> FileFingerprintCache:  # noqa: ANN001
+        caches = getattr(self, "_file_fingerprint_caches", None)
+        if caches is None:
+            caches = self._file_fingerprint_caches = {}
+        cache = caches.get(controller.db)
+        if cache is None:
+            cache = FileFingerprintCache(controller.db)
+            caches[controller.db] = cache
+        return cache
+
+    def _reset_file_fingerprints(self) -> None:
+        for cache in getattr(self, "_file_fingerprint_caches", {}).values():
+            cache.shutdown()
+        self._file_fingerprint_caches = {}
+        self._subtree_digest_services = {}
+
+    def _prefetch_material_crcs(self, controller, files_root: Path) -> None:  # noqa: ANN001
+        """Start hashing the material files of ``controller`` in the background."""
+        files = []
+        for material in controller.get_materials(include_teachers=False):
+            located = self._material_file_location(material, files_root)
+            if located is not None:
+                files.append(located)
+        self._file_fingerprints(controller).prefetch(files)
+
+    def _flush_file_fingerprints(self) -> None:
+        for cache in getattr(self, "_file_fingerprint_caches", {}).values():
+            cache.flush()
 
     def _build_sync_compare_index_for_program(self, controller, program: EducationalProgram) -> dict:  # noqa: ANN001
-        programs = {program.name: program}
-        disciplines = {program.id: {d.name: d for d in controller.get_program_disciplines(program.id)}}
-        topics = {}
-        lessons = {}
-        for discipline in disciplines[program.id].values():
-            topics[discipline.id] = {
-                t.title: t for t in controller.discipline_repo.get_discipline_topics(discipline.id)
-            }
-            for topic in topics[discipline.id].values():
-                lessons[topic.id] = {l.title: l for l in controller.topic_repo.get_topic_lessons(topic.id)}
-        return {
-            "programs": programs,
-            "selected_program": program,
-            "disciplines": disciplines,
-            "topics": topics,
-            "lessons": lessons,
-        }
+        return self._sync_snapshot(controller).compare_index(program)
 
     def _build_sync_compare_index(self, controller) -> dict:  # noqa: ANN001
-        programs = {p.name: p for p in controller.get_programs()}
-        disciplines = {}
-        topics = {}
-        lessons = {}
-        for program in programs.values():
-            disciplines[program.id] = {d.name: d for d in controller.get_program_disciplines(program.id)}
-            for discipline in disciplines[program.id].values():
-                topics[discipline.id] = {
-                    t.title: t for t in controller.discipline_repo.get_discipline_topics(discipline.id)
-                }
-                for topic in topics[discipline.id].values():
-                    lessons[topic.id] = {l.title: l for l in controller.topic_repo.get_topic_lessons(topic.id)}
-        return {
-            "programs": programs,
-            "disciplines": disciplines,
-            "topics": topics,
-            "lessons": lessons,
-        }
+        return self._sync_snapshot(controller).compare_index()
+
+    def _sync_snapshot(self, controller) -> StructureSnapshot:  # noqa: ANN001
+        """Return the loaded structure snapshot of ``controller``'s database, loading it once."""
+        snapshots = getattr(self, "_sync_snapshots", None)
+        if snapshots is None:
+            snapshots = self._sync_snapshots = {}
+        snapshot = snapshots.get(controller.db)
+        if snapshot is None:
+            snapshot = load_structure_snapshot(controller.db)
+            snapshots[controller.db] = snapshot
+        return snapshot
+
+    def _reset_sync_snapshots(self) -> None:
+        self._sync_snapshots = {}
+        # Writes to the local database (sync, import, edits in other tabs)
+        # make its snapshot stale; the source database is never written.
+        source = getattr(self, "_sync_snapshot_change_source", None)
+        if source is self.controller:
+            return
+        if source is not None:
+            source.remove_change_listener(self._on_sync_target_data_changed)
+        self.controller.add_change_listener(self._on_sync_target_data_changed)
+        self._sync_snapshot_change_source = self.controller
+
+    def _on_sync_target_data_changed(self, _event) -> None:  # noqa: ANN001
+        getattr(self, "_sync_snapshots", {}).pop(self.controller.db, None)
 
     def _materials_diff(self, entity_type: str, source_id: int, target_id: int | None) -> list[str]:
         if entity_type not in {"program", "discipline", "topic", "lesson"}:
             return []
-        source_materials = self.sync_source_admin.get_materials_for_entity(entity_type, source_id)
+        source_snapshot = self._sync_snapshot(self.sync_source_admin)
+        source_materials = source_snapshot.get_materials_for_entity(entity_type, source_id)
         if not source_materials:
             return []
         if target_id is None:
             return [m.title for m in source_materials if m.title]
-        target_materials = self.controller.get_materials_for_entity(entity_type, target_id)
+        target_snapshot = self._sync_snapshot(self.controller)
+        target_materials = target_snapshot.get_materials_for_entity(entity_type, target_id)
         target_map = {
-            (m.title, m.material_type): self._material_author_names(self.controller, m)
+            (m.title, m.material_type): self._material_author_names(target_snapshot, m)
             for m in target_materials
         }
         missing = []
         for material in source_materials:
             key = (material.title, material.material_type)
-            source_authors = self._material_author_names(self.sync_source_admin, material)
+            source_authors = self._material_author_names(source_snapshot, material)
             if key not in target_map:
                 missing.append(material.title)
             elif source_authors != target_map.get(key, set()):
@@ -38,7 +38,12 @@ from ..models.entities import (
     Question,
     MethodicalMaterial,
 )
-from ..services.import_service import extract_text_from_file, parse_curriculum_text, CurriculumTopic
+from ..services.import_service import (
+    extract_text_from_file,
+    parse_curriculum_file,
+    parse_curriculum_text,
+    CurriculumTopic,
+)
 
 
 class PasswordDialog(QDialog):
@@ -911,7 +916,9 @@ class ImportCurriculumDialog(QDialog):
         except (OSError, ValueError, RuntimeError, TypeError) as exc:
             QMessageBox.warning(self, self.tr("Import error"), str(exc))
             return
+        # The loaded file is what gets imported; its text is shown only as a preview.
         self.input_text.setPlainText(content)
+        self.input_text.setReadOnly(True)
 
     def _load_files(self) -> None:
         paths, _ = QFileDialog.getOpenFileNames(
@@ -934,7 +941,7 @@ class ImportCurriculumDialog(QDialog):
             )
             return
         try:
-            topics = parse_curriculum_text(self.input_text.toPlainText())
+            topics = self._parse_input()
         except (OSError, ValueError, RuntimeError, TypeError) as exc:
             QMessageBox.warning(self, self.tr("Import error"), str(exc))
             return
@@ -942,6 +949,13 @@ class ImportCurriculumDialog(QDialog):
         if dialog.exec() == QDialog.Accepted:
             self.parsed_topics = topics
 
+    def _parse_input(self) -> list[CurriculumTopic]:
+        # A loaded file is parsed like the batch import does, so .docx cells
+        # keep their paragraphs (a lesson title followed by its questions).
+        if self.file_paths:
+            return parse_curriculum_file(self.file_paths[0])
+        return parse_curriculum_text(self.input_text.toPlainText())
+
     def get_payload(self):
         program_id = self.program_combo.currentData()
         discipline_id = self.discipline_combo.currentData()
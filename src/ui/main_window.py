@@ -3,8 +3,7 @@ import os
 import re
 import sys
 import time
-import sqlite3
-from typing import Callable, Dict, Tuple
+from typing import Callable, Dict, Optional, Tuple
 from PySide6.QtCore import Qt, QSettings, QSize, QRect
 from PySide6.QtWidgets import (
     QMainWindow,
@@ -14,14 +13,15 @@ from PySide6.QtWidgets import (
     QLabel,
     QListWidget,
     QListWidgetItem,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
     QLineEdit,
     QPushButton,
     QSplitter,
     QPlainTextEdit,
     QTableWidget,
     QTableWidgetItem,
+    QTableView,
+    QAbstractItemView,
     QMessageBox,
     QComboBox,
     QFileDialog,
@@ -43,8 +43,18 @@ from ..ui.editor_wizard import EditorWizardDialog
 from ..services.auth_service import AuthService
 from ..services.i18n import I18nManager
 from ..services.file_storage import FileStorageManager
+from ..services.material_contents import MaterialContentIndexer
+from ..services.storage_settings import get_materials_root
 from ..services.teacher_sorting import teacher_sort_key
+from ..services.report_service import (
+    STATUS_COMPLETE,
+    STATUS_MISSING,
+    STATUS_PARTIAL,
+    normalize_report_material_type,
+)
 from ..ui.dialogs import TeacherLoginDialog
+from ..ui.search_worker import IncrementalSearchRunner, SearchResultsModel
+from ..ui.program_tree_model import ProgramTreeModel
 
 
 class MainWindow(QMainWindow):
@@ -58,13 +68,14 @@ class MainWindow(QMainWindow):
         self.i18n = i18n
         self.settings = settings
         self.file_storage = FileStorageManager()
+        self.content_indexer = MaterialContentIndexer(self.controller.db, self.file_storage.files_root)
         self.auth_service = AuthService()
         self.program_items: Dict[int, QListWidgetItem] = {}
-        self.tree_items: Dict[Tuple[str, int], QTreeWidgetItem] = {}
         self._tree_syncing_columns = False
         self.last_program_id = None
         self.last_discipline_id = None
         self.active_teacher = None
+        self._search_result_count: Optional[int] = None
         self._auth_blocked_until: Dict[str, float] = {}
         self.setWindowTitle(self.tr("Educational Program Manager"))
         self.resize(1200, 720)
@@ -73,6 +84,7 @@ class MainWindow(QMainWindow):
         self._load_programs()
         self._load_settings()
         self.i18n.language_changed.connect(self._on_language_changed)
+        self._start_content_indexing()
 
     def _build_ui(self) -> None:
         central = QWidget()
@@ -91,6 +103,7 @@ class MainWindow(QMainWindow):
         top_bar.addWidget(self.search_label)
         self.search_input = QLineEdit()
         self.search_button = QPushButton(self.tr("Search"))
+        self.search_as_you_type = QCheckBox(self.tr("Search as you type"))
         self.language_combo = QComboBox()
         self.language_combo.addItem(self.tr("Ukrainian"), "uk")
         self.language_combo.addItem(self.tr("English"), "en")
@@ -101,6 +114,7 @@ class MainWindow(QMainWindow):
         self.active_teacher_label = QLabel(self.tr("User: not selected"))
         top_bar.addWidget(self.search_input)
         top_bar.addWidget(self.search_button)
+        top_bar.addWidget(self.search_as_you_type)
         top_bar.addWidget(self.language_combo)
         top_bar.addWidget(self.font_combo)
         top_bar.addStretch(1)
@@ -121,8 +135,11 @@ class MainWindow(QMainWindow):
         self.center_splitter = QSplitter()
         self.center_splitter.setOrientation(Qt.Vertical)
 
-        self.content_tree = QTreeWidget()
-        self.content_tree.setHeaderLabels([self.tr("Title"), self.tr("Type")])
+        self.tree_model = ProgramTreeModel(self.controller.get_tree_children, self._translate_entity_type, self)
+        self.tree_model.set_headers([self.tr("Title"), self.tr("Type")])
+        self.content_tree = QTreeView()
+        self.content_tree.setModel(self.tree_model)
+        self.content_tree.setItemDelegateForColumn(0, _WrapItemDelegate(self.content_tree))
         self.content_tree.setColumnWidth(0, 350)
         header = self.content_tree.header()
         header.setSectionResizeMode(0, QHeaderView.Interactive)
@@ -155,8 +172,14 @@ class MainWindow(QMainWindow):
 
         self.center_splitter.addWidget(self.structure_tabs)
 
-        self.search_results = QTableWidget(0, 3)
-        self.search_results.setHorizontalHeaderLabels([self.tr("Type"), self.tr("Title"), self.tr("Description")])
+        self.search_results_model = SearchResultsModel(self._format_search_row, self)
+        self.search_results_model.set_headers([self.tr("Type"), self.tr("Title"), self.tr("Description")])
+        self.search_results = QTableView()
+        self.search_results.setModel(self.search_results_model)
+        self.search_results.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.search_results.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.search_results.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.search_runner = IncrementalSearchRunner(self.controller, self)
         self.language_combo.setItemText(0, self.tr("Ukrainian"))
         self.language_combo.setItemText(1, self.tr("English"))
         self.search_results.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
@@ -211,10 +234,16 @@ class MainWindow(QMainWindow):
 
         self.search_button.clicked.connect(self._on_search)
         self.search_input.returnPressed.connect(self._on_search)
+        self.search_input.textChanged.connect(self._on_search_text_changed)
+        self.search_as_you_type.toggled.connect(self._on_search_as_you_type_toggled)
+        self.search_runner.started.connect(self._on_search_started)
+        self.search_runner.results_ready.connect(self.search_results_model.append_entries)
+        self.search_runner.finished.connect(self._on_search_finished)
+        self.search_runner.failed.connect(self._on_search_failed)
         self.program_list.itemSelectionChanged.connect(self._on_program_selected)
-        self.content_tree.itemSelectionChanged.connect(self._on_tree_selected)
-        self.search_results.cellDoubleClicked.connect(self._on_search_result_activated)
-        self.search_results.itemSelectionChanged.connect(self._on_search_result_selected)
+        self.content_tree.selectionModel().currentChanged.connect(self._on_tree_selected)
+        self.search_results.doubleClicked.connect(self._on_search_result_activated)
+        self.search_results.selectionModel().selectionChanged.connect(self._on_search_result_selected)
         self.admin_button.clicked.connect(self._on_open_admin)
         self.editor_button.clicked.connect(self._on_open_editor)
         self.materials_list.itemDoubleClicked.connect(self._on_open_material_item)
@@ -293,8 +322,6 @@ class MainWindow(QMainWindow):
         self.search_results.resizeRowsToContents()
         self.search_results.resizeColumnsToContents()
         self._sync_tree_columns()
-        self._rewrap_tree_texts()
-        self._update_tree_item_sizes()
         self.content_tree.doItemsLayout()
         self.content_tree.viewport().update()
         self.program_list.doItemsLayout()
@@ -357,66 +384,36 @@ class MainWindow(QMainWindow):
         self.last_program_id = program_id
 
     def _load_program_structure(self, program_id: int, select_last_discipline: bool = True) -> None:
-        self.content_tree.clear()
-        self.tree_items.clear()
-        disciplines = self.controller.get_program_structure(program_id)
-        for discipline in disciplines:
-            discipline_item = QTreeWidgetItem([discipline.name, self.tr("Discipline")])
-            discipline_item.setData(0, Qt.UserRole + 10, discipline.name)
-            discipline_item.setData(0, Qt.UserRole, ("discipline", discipline.id))
-            self.tree_items[("discipline", discipline.id)] = discipline_item
-            for topic in discipline.topics:
-                topic_item = QTreeWidgetItem([topic.title, self.tr("Topic")])
-                topic_item.setData(0, Qt.UserRole + 10, topic.title)
-                topic_item.setData(0, Qt.UserRole, ("topic", topic.id))
-                self.tree_items[("topic", topic.id)] = topic_item
-                for lesson in topic.lessons:
-                    lesson_item = QTreeWidgetItem([lesson.title, self.tr("Lesson")])
-                    lesson_item.setData(0, Qt.UserRole + 10, lesson.title)
-                    lesson_item.setData(0, Qt.UserRole, ("lesson", lesson.id))
-                    self.tree_items[("lesson", lesson.id)] = lesson_item
-                    for question in lesson.questions:
-                        question_item = QTreeWidgetItem([question.content, self.tr("Question")])
-                        question_item.setData(0, Qt.UserRole + 10, question.content)
-                        question_item.setData(0, Qt.UserRole, ("question", question.id))
-                        self.tree_items[("question", question.id)] = question_item
-                        lesson_item.addChild(question_item)
-                    topic_item.addChild(lesson_item)
-                discipline_item.addChild(topic_item)
-            self.content_tree.addTopLevelItem(discipline_item)
-        self.content_tree.expandAll()
+        # Disciplines and topics open expanded, so the levels down to lessons are
+        # loaded up front in one batch; lessons fetch their questions on demand.
+        self.tree_model.load_program(program_id, self.controller.get_program_outline(program_id))
+        for discipline_row in range(self.tree_model.rowCount()):
+            discipline_index = self.tree_model.index(discipline_row, 0)
+            self.content_tree.expand(discipline_index)
+            for topic_row in range(self.tree_model.rowCount(discipline_index)):
+                self.content_tree.expand(self.tree_model.index(topic_row, 0, discipline_index))
         self._sync_tree_columns()
-        self._rewrap_tree_texts()
-        self._update_tree_item_sizes()
         self.content_tree.doItemsLayout()
         self.content_tree.viewport().update()
         if select_last_discipline and self.last_discipline_id:
-            item = self.tree_items.get(("discipline", self.last_discipline_id))
-            if item:
-                self.content_tree.setCurrentItem(item)
+            index = self.tree_model.find_index([("discipline", self.last_discipline_id)])
+            if index.isValid():
+                self.content_tree.setCurrentIndex(index)
 
-    def _on_tree_selected(self) -> None:
-        item = self.content_tree.currentItem()
-        if not item:
+    def _on_tree_selected(self, *_args) -> None:
+        entity = self.tree_model.entity(self.content_tree.currentIndex())
+        if not entity:
             return
-        entity_type, entity_id = item.data(0, Qt.UserRole)
+        entity_type, entity_id = entity
         details = self.controller.get_entity_details(entity_type, entity_id)
         self._show_details(details)
         self._load_materials(entity_type, entity_id)
         if entity_type == "discipline":
             self.last_discipline_id = entity_id
-        elif entity_type == "topic":
-            disciplines = self.controller.discipline_repo.get_disciplines_for_topic(entity_id)
-            if disciplines:
-                self.last_discipline_id = disciplines[0].id
-        elif entity_type == "lesson":
-            disciplines = self.controller.discipline_repo.get_disciplines_for_lesson(entity_id)
-            if disciplines:
-                self.last_discipline_id = disciplines[0].id
-        elif entity_type == "question":
-            disciplines = self.controller.discipline_repo.get_disciplines_for_question(entity_id)
-            if disciplines:
-                self.last_discipline_id = disciplines[0].id
+        elif entity_type in ("topic", "lesson", "question"):
+            discipline_id = self.controller.resolve_navigation(entity_type, entity_id)["discipline_id"]
+            if discipline_id:
+                self.last_discipline_id = discipline_id
 
     def _show_details(self, details: Dict[str, object]) -> None:
         if not details:
@@ -490,54 +487,6 @@ class MainWindow(QMainWindow):
             item.setData(Qt.UserRole, material)
             self.materials_list.addItem(item)
 
-    def _update_tree_item_sizes(self) -> None:
-        fm = self.content_tree.fontMetrics()
-        line_height = fm.lineSpacing()
-        padding = 6
-
-        def update_item(item):
-            if not item:
-                return
-            text = item.text(0) or ""
-            lines = text.count("\n") + 1
-            height = max(line_height * lines + padding, line_height + padding)
-            item.setSizeHint(0, QSize(self.content_tree.columnWidth(0), height))
-            item.setSizeHint(1, QSize(self.content_tree.columnWidth(1), height))
-            for i in range(item.childCount()):
-                update_item(item.child(i))
-
-        for i in range(self.content_tree.topLevelItemCount()):
-            update_item(self.content_tree.topLevelItem(i))
-
-    def _rewrap_tree_texts(self) -> None:
-        base_width = self.content_tree.columnWidth(0) - 8
-        if base_width <= 0:
-            return
-        font = self.content_tree.font()
-        indent_step = self.content_tree.indentation() or 0
-
-        def depth(item):
-            d = 0
-            parent = item.parent()
-            while parent is not None:
-                d += 1
-                parent = parent.parent()
-            return d
-
-        def wrap_item(item):
-            if not item:
-                return
-            d = depth(item)
-            width = max(120, base_width - (indent_step * d) - 8)
-            full_text = item.data(0, Qt.UserRole + 10) or item.text(0)
-            wrapped = self._wrap_text(full_text, width, font)
-            item.setText(0, wrapped)
-            for i in range(item.childCount()):
-                wrap_item(item.child(i))
-
-        for i in range(self.content_tree.topLevelItemCount()):
-            wrap_item(self.content_tree.topLevelItem(i))
-
     def _sync_tree_columns(self) -> None:
         header = self.content_tree.header()
         if header is None:
@@ -567,84 +516,59 @@ class MainWindow(QMainWindow):
             return
         if logical_index == 1:
             self._sync_tree_columns()
-        self._rewrap_tree_texts()
-        self._update_tree_item_sizes()
         self.content_tree.doItemsLayout()
         self.content_tree.viewport().update()
 
-    def _wrap_text(self, text: str, width: int, font: QFont) -> str:
-        if not text:
-            return ""
-        fm = QFontMetrics(font)
-        if fm.horizontalAdvance(text) <= width:
-            return text
-        words = text.split(" ")
-        lines = []
-        current = ""
-        for word in words:
-            candidate = f"{current} {word}".strip()
-            if fm.horizontalAdvance(candidate) <= width:
-                current = candidate
-            else:
-                if current:
-                    lines.append(current)
-                if fm.horizontalAdvance(word) > width:
-                    chunk = ""
-                    for ch in word:
-                        if fm.horizontalAdvance(chunk + ch) <= width:
-                            chunk += ch
-                        else:
-                            if chunk:
-                                lines.append(chunk)
-                            chunk = ch
-                    current = chunk
-                else:
-                    current = word
-        if current:
-            lines.append(current)
-        return "\n".join(lines)
-
     def _on_search(self) -> None:
-        keyword = self.search_input.text().strip()
-        self.search_results.setRowCount(0)
-        try:
-            results = self.controller.search(keyword)
-        except (sqlite3.Error, ValueError, RuntimeError, OSError, TypeError) as exc:
-            QMessageBox.critical(
-                self,
-                self.tr("Search Error"),
-                self.tr("Search is temporarily unavailable: {0}").format(str(exc)),
-            )
-            return
-        for result in results:
-            row = self.search_results.rowCount()
-            self.search_results.insertRow(row)
-            context = self._build_search_context(result)
-            description = result.description
-            if context:
-                description = f"{description} | {context}" if description else context
-            self.search_results.setItem(row, 0, QTableWidgetItem(self._translate_entity_type(result.entity_type)))
-            self.search_results.setItem(row, 1, QTableWidgetItem(result.title))
-            self.search_results.setItem(row, 2, QTableWidgetItem(description))
-            self.search_results.item(row, 0).setData(Qt.UserRole, result)
+        self.search_runner.run_now(self.search_input.text())
+
+    def _on_search_text_changed(self, text: str) -> None:
+        if self.search_as_you_type.isChecked():
+            self.search_runner.schedule(text)
+
+    def _on_search_as_you_type_toggled(self, checked: bool) -> None:
+        self.settings.setValue("ui/search_as_you_type", bool(checked))
+
+    def _on_search_started(self, _keyword: str) -> None:
+        self.search_results_model.clear()
+        self._search_result_count = None
+        self._update_search_results_label()
+
+    def _on_search_finished(self, count: int) -> None:
+        self._search_result_count = count
+        self._update_search_results_label()
         self.search_results.resizeRowsToContents()
 
+    def _update_search_results_label(self) -> None:
+        if self._search_result_count is None:
+            self.search_results_label.setText(self.tr("Search Results"))
+        else:
+            self.search_results_label.setText(self.tr("Search Results ({0})").format(self._search_result_count))
+
+    def _on_search_failed(self, message: str) -> None:
+        QMessageBox.critical(
+            self,
+            self.tr("Search Error"),
+            self.tr("Search is temporarily unavailable: {0}").format(message),
+        )
+
+    def _format_search_row(self, entry) -> Tuple[str, str, str]:
+        result, context_parts = entry
+        context = " | ".join(
+            f"{self._translate_entity_type(entity_type)}: {name}" for entity_type, name in context_parts
+        )
+        description = result.description
+        if context:
+            description = f"{description} | {context}" if description else context
+        return self._translate_entity_type(result.entity_type), result.title, description
+
     def _on_search_result_selected(self) -> None:
-        row = self.search_results.currentRow()
-        if row < 0:
-            return
-        result_item = self.search_results.item(row, 0)
-        if not result_item:
-            return
-        result = result_item.data(Qt.UserRole)
+        result = self.search_results_model.result_at(self.search_results.currentIndex().row())
         if result:
             self._navigate_to_search_result(result, open_material=False)
 
-    def _on_search_result_activated(self, row: int, _column: int) -> None:
-        result_item = self.search_results.item(row, 0)
-        if not result_item:
-            return
-        result = result_item.data(Qt.UserRole)
+    def _on_search_result_activated(self, index) -> None:
+        result = self.search_results_model.result_at(index.row())
         if result:
             self._navigate_to_search_result(result, open_material=True)
 
@@ -682,32 +606,32 @@ class MainWindow(QMainWindow):
             self._load_materials("program", result.entity_id)
             return
 
-        target = None
-        if navigation.get("question_id"):
-            target = ("question", navigation["question_id"])
-        elif navigation.get("lesson_id"):
-            target = ("lesson", navigation["lesson_id"])
-        elif navigation.get("topic_id"):
-            target = ("topic", navigation["topic_id"])
-        elif navigation.get("discipline_id"):
-            target = ("discipline", navigation["discipline_id"])
-
-        if target:
-            item = self.tree_items.get(target)
-            if item:
-                self._select_tree_item(item)
+        path = [
+            (entity_type, navigation[key])
+            for entity_type, key in (
+                ("discipline", "discipline_id"),
+                ("topic", "topic_id"),
+                ("lesson", "lesson_id"),
+                ("question", "question_id"),
+            )
+            if navigation.get(key)
+        ]
+        if path:
+            index = self.tree_model.find_index(path)
+            if index.isValid() and self.tree_model.entity(index) == path[-1]:
+                self._select_tree_index(index)
                 return
 
         details = self.controller.get_entity_details(result.entity_type, result.entity_id)
         self._show_details(details)
 
-    def _select_tree_item(self, item: QTreeWidgetItem) -> None:
-        current = item.parent()
-        while current:
-            current.setExpanded(True)
+    def _select_tree_index(self, index) -> None:
+        current = index.parent()
+        while current.isValid():
+            self.content_tree.expand(current)
             current = current.parent()
-        self.content_tree.setCurrentItem(item)
-        self.content_tree.scrollToItem(item)
+        self.content_tree.setCurrentIndex(index)
+        self.content_tree.scrollTo(index)
 
     def _on_open_admin(self) -> None:
         from ..ui.dialogs import PasswordDialog
@@ -746,6 +670,7 @@ class MainWindow(QMainWindow):
         )
         dialog.exec()
         # Always refresh after admin dialog closes to sync UI state.
+        self._start_content_indexing()
         self._load_programs()
         if self.last_program_id and self.last_program_id in self.program_items:
             self.program_list.setCurrentItem(self.program_items[self.last_program_id])
@@ -778,6 +703,7 @@ class MainWindow(QMainWindow):
             actor_mode="editor",
         )
         wizard.exec()
+        self._start_content_indexing()
         self._load_programs()
         if self.last_program_id and self.last_program_id in self.program_items:
             self.program_list.setCurrentItem(self.program_items[self.last_program_id])
@@ -786,6 +712,12 @@ class MainWindow(QMainWindow):
         if self.last_program_id:
             self._refresh_report(self.last_program_id)
 
+    def _start_content_indexing(self) -> None:
+        """Index the text of new or changed material files in the background."""
+        # The admin dialog may have moved the materials storage.
+        self.content_indexer.files_root = get_materials_root()
+        self.content_indexer.start()
+
     def _prompt_new_password(self, title: str, label: str) -> str | None:
         from ..ui.dialogs import PasswordDialog
 
@@ -987,64 +919,17 @@ class MainWindow(QMainWindow):
         self.report_table.clear()
         self._report_rows = []
 
-        lessons = []
-        program_structure = self.controller.get_program_structure(program_id)
-        for discipline in program_structure:
-            topic_index = 1
-            for topic in discipline.topics:
-                lesson_index = 1
-                for lesson in topic.lessons:
-                    lesson_type = (lesson.lesson_type_name or "").strip().lower()
-                    is_self_study = "самостійна" in lesson_type or "self-study" in lesson_type or "self study" in lesson_type
-                    if is_self_study:
-                        code = f"т.{topic_index}.ср"
-                    else:
-                        code = f"т.{topic_index}.з.{lesson_index}"
-                    lessons.append(
-                        {
-                            "code": code,
-                            "lesson": lesson,
-                            "discipline": discipline,
-                            "topic": topic,
-                            "is_self_study": is_self_study,
-                        }
-                    )
-                    self._report_rows.append(lesson)
-                    if not is_self_study:
-                        lesson_index += 1
-                topic_index += 1
-
-        if not lessons:
+        report = self.controller.get_coverage_report(
+            program_id, include_all_teachers=self.report_include_all_teachers.isChecked()
+        )
+        if not report.rows:
             self.report_table.setRowCount(0)
             self.report_table.setColumnCount(0)
             return
+        self._report_rows = [row.lesson_id for row in report.rows]
 
-        cell_map = {}
-        cell_types = {}
-        material_teachers = {}
-        for lesson_row, info in enumerate(lessons):
-            lesson = info["lesson"]
-            materials = self.controller.get_materials_for_entity("lesson", lesson.id)
-            for material in materials:
-                for teacher in material.teachers:
-                    if teacher.id is None:
-                        continue
-                    material_teachers[teacher.id] = teacher
-                    key = (lesson_row, teacher.id)
-                    cell_map.setdefault(key, []).append(material.title)
-                    normalized = self._normalize_report_material_type(material.material_type or "")
-                    cell_types.setdefault(key, set()).add(normalized)
-
-        if self.report_include_all_teachers.isChecked():
-            teachers = list(material_teachers.values())
-        else:
-            disciplines = self.controller.get_program_disciplines(program_id)
-            discipline_ids = [d.id for d in disciplines if d and d.id is not None]
-            teachers = self.controller.get_teachers_for_disciplines(discipline_ids)
-
-        teachers = sorted(teachers, key=teacher_sort_key)
-
-        self.report_table.setRowCount(len(lessons))
+        teachers = report.teachers
+        self.report_table.setRowCount(len(report.rows))
         self.report_table.setColumnCount(len(teachers) + 1)
         headers = [self.tr("Lesson")] + [
             self._format_report_teacher_header(t) for t in teachers
@@ -1052,58 +937,28 @@ class MainWindow(QMainWindow):
         self.report_table.setHorizontalHeaderLabels(headers)
         self._adjust_report_header_geometry()
 
-        for row_index, info in enumerate(lessons):
-            row_code_item = QTableWidgetItem(info["code"])
-            row_has_green = False
-            row_has_sand = False
-            row_has_red = False
+        cell_colors = {
+            STATUS_COMPLETE: QColor(198, 239, 206),
+            STATUS_PARTIAL: QColor(255, 242, 204),
+            STATUS_MISSING: QColor(255, 199, 206),
+        }
+        row_colors = {
+            STATUS_COMPLETE: QColor(84, 130, 53),
+            STATUS_PARTIAL: QColor(191, 143, 0),
+            STATUS_MISSING: QColor(192, 0, 0),
+        }
+        for row_index, row in enumerate(report.rows):
+            row_code_item = QTableWidgetItem(row.code)
             for col_offset, teacher in enumerate(teachers, start=1):
-                titles = cell_map.get((row_index, teacher.id), [])
-                item = QTableWidgetItem("\n".join(titles) if titles else "")
-                types = cell_types.get((row_index, teacher.id), set())
-                if info.get("is_self_study"):
-                    normalized = [title.lower() for title in titles]
-                    has_cadets = any(("курсант" in t) or ("слухач" in t) for t in normalized)
-                    has_teachers = any("викладач" in t for t in normalized)
-                    if len(titles) >= 2 and has_cadets and has_teachers:
-                        item.setBackground(QBrush(QColor(198, 239, 206)))
-                        row_has_green = True
-                    elif titles:
-                        item.setBackground(QBrush(QColor(255, 242, 204)))
-                        row_has_sand = True
-                    else:
-                        item.setBackground(QBrush(QColor(255, 199, 206)))
-                        row_has_red = True
-                else:
-                    has_plan = "plan" in types
-                    has_guide = "guide" in types
-                    has_presentation = "presentation" in types
-                    if has_plan and has_guide and has_presentation:
-                        item.setBackground(QBrush(QColor(198, 239, 206)))
-                        row_has_green = True
-                    elif types:
-                        item.setBackground(QBrush(QColor(255, 242, 204)))
-                        row_has_sand = True
-                    else:
-                        item.setBackground(QBrush(QColor(255, 199, 206)))
-                        row_has_red = True
+                cell = report.cell(row_index, teacher.id)
+                item = QTableWidgetItem("\n".join(cell.titles) if cell.titles else "")
+                item.setBackground(QBrush(cell_colors[cell.status]))
                 self.report_table.setItem(row_index, col_offset, item)
-            if row_has_green:
-                row_code_item.setBackground(QBrush(QColor(84, 130, 53)))
-                row_code_item.setForeground(QBrush(QColor(255, 255, 255)))
-            elif row_has_sand:
-                row_code_item.setBackground(QBrush(QColor(191, 143, 0)))
-                row_code_item.setForeground(QBrush(QColor(255, 255, 255)))
-            elif row_has_red:
-                row_code_item.setBackground(QBrush(QColor(192, 0, 0)))
+            if row.status in row_colors:
+                row_code_item.setBackground(QBrush(row_colors[row.status]))
                 row_code_item.setForeground(QBrush(QColor(255, 255, 255)))
+            row_code_item.setToolTip(f"{row.discipline_name} | {row.topic_title} | {row.lesson_title}")
             self.report_table.setItem(row_index, 0, row_code_item)
-
-        for idx, info in enumerate(lessons):
-            tooltip = f"{info['discipline'].name} | {info['topic'].title} | {info['lesson'].title}"
-            row_item = self.report_table.item(idx, 0)
-            if row_item:
-                row_item.setToolTip(tooltip)
         self.report_table.resizeRowsToContents()
         self.report_table.resizeColumnsToContents()
         self._adjust_report_header_geometry()
@@ -1139,26 +994,7 @@ class MainWindow(QMainWindow):
 
     @staticmethod
     def _normalize_report_material_type(material_type: str) -> str:
-        raw = (material_type or "").strip().casefold()
-        if not raw:
-            return ""
-        if raw == "metod":
-            return "guide"
-
-        plan_markers = ("plan", "план", "план-конспект", "конспект")
-        guide_markers = ("guide", "method", "метод", "методич", "посібник", "рекомендац", "настанова")
-        presentation_markers = ("presentation", "презентац", "слайд")
-        attachment_markers = ("attachment", "додат", "appendix", "файл")
-
-        if any(marker in raw for marker in plan_markers):
-            return "plan"
-        if any(marker in raw for marker in guide_markers):
-            return "guide"
-        if any(marker in raw for marker in presentation_markers):
-            return "presentation"
-        if any(marker in raw for marker in attachment_markers):
-            return "attachment"
-        return raw
+        return normalize_report_material_type(material_type)
 
     def _on_report_selection_changed(self) -> None:
         item = self.report_table.currentItem()
@@ -1175,10 +1011,10 @@ class MainWindow(QMainWindow):
             self._show_details({})
             self.materials_list.clear()
             return
-        lesson = self._report_rows[row]
-        details = self.controller.get_entity_details("lesson", lesson.id)
+        lesson_id = self._report_rows[row]
+        details = self.controller.get_entity_details("lesson", lesson_id)
         self._show_details(details)
-        self._load_materials("lesson", lesson.id)
+        self._load_materials("lesson", lesson_id)
 
     def _on_report_include_all_teachers_toggled(self, checked: bool) -> None:
         self.settings.setValue("ui/report_include_all_teachers", bool(checked))
@@ -1249,8 +1085,12 @@ class MainWindow(QMainWindow):
 
         include_all_teachers = self.settings.value("ui/report_include_all_teachers", False, type=bool)
         self.report_include_all_teachers.setChecked(bool(include_all_teachers))
+        search_as_you_type = self.settings.value("ui/search_as_you_type", True, type=bool)
+        self.search_as_you_type.setChecked(bool(search_as_you_type))
 
     def closeEvent(self, event) -> None:
+        self.search_runner.shutdown()
+        self.content_indexer.shutdown()
         self.settings.setValue("ui/main_geometry", self.saveGeometry())
         self.settings.setValue("ui/main_splitter", self.main_splitter.saveState())
         self.settings.setValue("ui/center_splitter", self.center_splitter.saveState())
@@ -1286,6 +1126,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(self.tr("Educational Program Manager"))
         self.search_label.setText(self.tr("Search:"))
         self.search_button.setText(self.tr("Search"))
+        self.search_as_you_type.setText(self.tr("Search as you type"))
         self.editor_button.setText(self.tr("Editor Mode"))
         self.admin_button.setText(self.tr("Admin Mode"))
         self._update_active_teacher_label()
@@ -1299,41 +1140,20 @@ class MainWindow(QMainWindow):
         self.action_exit.triggered.connect(self._close_application)
         self.program_label.setText(self.tr("Programs"))
         self.structure_label.setText(self.tr("Program Structure"))
-        self.search_results_label.setText(self.tr("Search Results"))
+        self._update_search_results_label()
         self.details_label.setText(self.tr("Details"))
         self.materials_label.setText(self.tr("Methodical Materials"))
         self.report_include_all_teachers.setText(self.tr("Include all teachers"))
         self.open_material_button.setText(self.tr("Open Selected File"))
         self.show_material_button.setText(self.tr("Show in folder"))
         self.copy_material_button.setText(self.tr("Copy file as..."))
-        self.content_tree.setHeaderLabels([self.tr("Title"), self.tr("Type")])
-        self.search_results.setHorizontalHeaderLabels([self.tr("Type"), self.tr("Title"), self.tr("Description")])
+        self.tree_model.set_headers([self.tr("Title"), self.tr("Type")])
+        self.search_results_model.set_headers([self.tr("Type"), self.tr("Title"), self.tr("Description")])
         self._load_program_structure(self.last_program_id) if self.last_program_id else None
-        if self.content_tree.currentItem():
+        if self.content_tree.currentIndex().isValid():
             self._on_tree_selected()
         self._adjust_report_header_geometry()
 
-    def _build_search_context(self, result) -> str:
-        navigation = self.controller.resolve_search_navigation(result)
-        parts = []
-        if navigation.get("program_id"):
-            program = self.controller.program_repo.get_by_id(navigation["program_id"])
-            if program:
-                parts.append(f"{self.tr('Program')}: {program.name}")
-        if navigation.get("discipline_id"):
-            discipline = self.controller.discipline_repo.get_by_id(navigation["discipline_id"])
-            if discipline:
-                parts.append(f"{self.tr('Discipline')}: {discipline.name}")
-        if navigation.get("topic_id"):
-            topic = self.controller.topic_repo.get_by_id(navigation["topic_id"])
-            if topic:
-                parts.append(f"{self.tr('Topic')}: {topic.title}")
-        if navigation.get("lesson_id"):
-            lesson = self.controller.lesson_repo.get_by_id(navigation["lesson_id"])
-            if lesson:
-                parts.append(f"{self.tr('Lesson')}: {lesson.title}")
-        return " | ".join(parts)
-
     def _translate_entity_type(self, entity_type: str) -> str:
         mapping = {
             "program": self.tr("Program"),
@@ -1357,9 +1177,14 @@ class MainWindow(QMainWindow):
 
 
 class _WrapItemDelegate(QStyledItemDelegate):
+    """Word-wrap column 0 and cache row heights per (text width, font, text)."""
+
+    MAX_CACHED_HEIGHTS = 20000
+
     def __init__(self, view):
         super().__init__(view)
         self._view = view
+        self._height_cache: Dict[Tuple[int, str, str], int] = {}
 
     def initStyleOption(self, option, index):  # noqa: ANN001
         super().initStyleOption(option, index)
@@ -1372,19 +1197,40 @@ class _WrapItemDelegate(QStyledItemDelegate):
             return super().sizeHint(option, index)
         opt = QStyleOptionViewItem(option)
         self.initStyleOption(opt, index)
+        width = self._text_width(opt, index)
+        if width <= 0:
+            return super().sizeHint(option, index)
+        # Only rows the view lays out reach here; the cache keeps re-layouts
+        # (scrolling, expand/collapse) from re-measuring the same text.
+        key = (width, opt.font.key(), opt.text)
+        height = self._height_cache.get(key)
+        if height is None:
+            doc = QTextDocument()
+            doc.setDefaultFont(opt.font)
+            doc.setTextWidth(width)
+            doc.setPlainText(opt.text)
+            height = max(int(doc.size().height()) + opt.fontMetrics.leading() + 10, opt.fontMetrics.height() + 10)
+            if len(self._height_cache) >= self.MAX_CACHED_HEIGHTS:
+                self._height_cache.clear()
+            self._height_cache[key] = height
+        return QSize(int(opt.rect.width()), height)
+
+    def _text_width(self, opt, index) -> int:  # noqa: ANN001
         style = opt.widget.style() if opt.widget else self._view.style()
         text_rect = style.subElementRect(QStyle.SE_ItemViewItemText, opt, opt.widget)
         width = text_rect.width()
         if width <= 0 and self._view is not None:
             width = self._view.columnWidth(index.column())
-        if width <= 0:
-            return super().sizeHint(option, index)
-        doc = QTextDocument()
-        doc.setDefaultFont(opt.font)
-        doc.setTextWidth(width)
-        doc.setPlainText(opt.text)
-        height = max(int(doc.size().height()) + opt.fontMetrics.leading() + 10, opt.fontMetrics.height() + 10)
-        return QSize(int(opt.rect.width()), height)
+            if isinstance(self._view, QTreeView):
+                depth = 0
+                parent = index.parent()
+                while parent.isValid():
+                    depth += 1
+                    parent = parent.parent()
+                if self._view.rootIsDecorated():
+                    depth += 1
+                width -= self._view.indentation() * depth + 8
+        return width
 
     def paint(self, painter, option, index):  # noqa: ANN001
         if index.column() != 0:
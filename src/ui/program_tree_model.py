@@ -0,0 +1,252 @@
+"""Lazy item model for the user-mode program structure tree."""
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+
+class _TreeNode:
+    __slots__ = ("entity_type", "entity_id", "title", "parent", "row", "children", "child_count")
+
+    def __init__(
+        self,
+        entity_type: str,
+        entity_id: int,
+        title: str,
+        parent: Optional["_TreeNode"],
+        row: int,
+        child_count: Optional[int] = None,
+    ):
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.title = title
+        self.parent = parent
+        self.row = row
+        # None until the children are fetched from the controller.
+        self.children: Optional[List["_TreeNode"]] = None
+        # Known number of children before they are fetched, if any.
+        self.child_count = child_count
+
+
+class ProgramTreeModel(QAbstractItemModel):
+    """Discipline -> topic -> lesson -> question tree fetched level by level.
+
+    Children of a node are requested from ``fetch_children`` only when the
+    view expands it (``canFetchMore``/``fetchMore``), so opening a program
+    costs one query regardless of how many questions it contains. Levels
+    loaded in advance can be passed to ``load_program`` as an outline.
+    Child rows are ``(id, title)`` or ``(id, title, child_count)``; a known
+    count of 0 shows the node without an expand arrow.
+    """
+
+    CHILD_TYPES = {
+        "program": "discipline",
+        "discipline": "topic",
+        "topic": "lesson",
+        "lesson": "question",
+    }
+
+    def __init__(
+        self,
+        fetch_children: Callable[[str, int], List[Tuple[int, str]]],
+        type_label: Callable[[str], str],
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._fetch_children = fetch_children
+        self._type_label = type_label
+        self._headers = ["", ""]
+        self._root: Optional[_TreeNode] = None
+
+    def load_program(
+        self,
+        program_id: Optional[int],
+        outline: Optional[Dict[Tuple[str, int], Sequence[tuple]]] = None,
+    ) -> None:
+        """
+        Show a program, optionally with some levels already loaded.
+
+        Args:
+            program_id: Program to show, or None for an empty tree
+            outline: Child rows keyed by (entity_type, entity_id) of their parent;
+                nodes missing from it are fetched on demand
+        """
+        self.beginResetModel()
+        self._root = _TreeNode("program", program_id, "", None, 0) if program_id else None
+        if self._root is not None and outline:
+            pending = [self._root]
+            while pending:
+                node = pending.pop()
+                rows = outline.get((node.entity_type, node.entity_id))
+                if rows is None:
+                    continue
+                node.children = self._make_children(node, rows)
+                pending.extend(node.children)
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.load_program(None)
+
+    def set_headers(self, labels: List[str]) -> None:
+        self._headers = list(labels)
+        self.headerDataChanged.emit(Qt.Horizontal, 0, len(self._headers) - 1)
+
+    def refresh_labels(self) -> None:
+        """Repaint type labels after a language change."""
+        self.layoutChanged.emit()
+
+    def index(self, row: int, column: int, parent=QModelIndex()) -> QModelIndex:
+        node = self._node(parent)
+        if node is None or node.children is None or not 0 <= row < len(node.children):
+            return QModelIndex()
+        if not 0 <= column < self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:  # noqa: D401
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer().parent
+        if node is None or node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def rowCount(self, parent=QModelIndex()) -> int:  # noqa: N802
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        node = self._node(parent)
+        if node is None or node.children is None:
+            return 0
+        return len(node.children)
+
+    def columnCount(self, parent=QModelIndex()) -> int:  # noqa: N802
+        return 2
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:  # noqa: N802
+        node = self._node(parent)
+        if node is None:
+            return False
+        if node.children is None:
+            if node.child_count is not None:
+                return node.child_count > 0
+            return node.entity_type in self.CHILD_TYPES
+        return bool(node.children)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:  # noqa: N802
+        node = self._node(parent)
+        return node is not None and node.children is None and node.entity_type in self.CHILD_TYPES
+
+    def fetchMore(self, parent: QModelIndex) -> None:  # noqa: N802
+        node = self._node(parent)
+        if node is not None:
+            self._ensure_fetched(node, parent)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):  # noqa: ANN001
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return node.title if index.column() == 0 else self._type_label(node.entity_type)
+        if role == Qt.ToolTipRole and index.column() == 0:
+            return node.title
+        if role == Qt.UserRole:
+            return node.entity_type, node.entity_id
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):  # noqa: ANN001, N802
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self._headers):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index: QModelIndex):  # noqa: ANN001
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def entity(self, index: QModelIndex) -> Optional[Tuple[str, int]]:
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        return node.entity_type, node.entity_id
+
+    def find_index(self, path: Iterable[Tuple[str, int]]) -> QModelIndex:
+        """
+        Locate a node by its (entity_type, entity_id) path, fetching levels on the way.
+
+        Path steps that do not sit directly under the previous node (for
+        example a lesson shared by several topics) are looked up among its
+        descendants instead.
+
+        Args:
+            path: Ancestor chain ending with the wanted node
+
+        Returns:
+            QModelIndex: Index of the node or an invalid index if it is not in the tree
+        """
+        node = self._root
+        if node is None:
+            return QModelIndex()
+        for entity_type, entity_id in path:
+            found = self._find_child(node, entity_type, entity_id)
+            if found is None:
+                found = self._find_descendant(node, entity_type, entity_id)
+            if found is None:
+                return QModelIndex()
+            node = found
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _node(self, index: QModelIndex) -> Optional[_TreeNode]:
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def _index_for(self, node: _TreeNode) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _ensure_fetched(self, node: _TreeNode, index: Optional[QModelIndex] = None) -> None:
+        if node.children is not None:
+            return
+        if node.child_count == 0 or node.entity_type not in self.CHILD_TYPES:
+            node.children = []
+            return
+        rows = self._fetch_children(node.entity_type, node.entity_id)
+        if not rows:
+            node.children = []
+            return
+        parent_index = index if index is not None else self._index_for(node)
+        self.beginInsertRows(parent_index, 0, len(rows) - 1)
+        node.children = self._make_children(node, rows)
+        self.endInsertRows()
+
+    def _make_children(self, node: _TreeNode, rows: Sequence[tuple]) -> List[_TreeNode]:
+        child_type = self.CHILD_TYPES[node.entity_type]
+        return [
+            _TreeNode(child_type, child[0], child[1] or "", node, row, child[2] if len(child) > 2 else None)
+            for row, child in enumerate(rows)
+        ]
+
+    def _find_child(self, node: _TreeNode, entity_type: str, entity_id: int) -> Optional[_TreeNode]:
+        if self.CHILD_TYPES.get(node.entity_type) != entity_type:
+            return None
+        self._ensure_fetched(node)
+        for child in node.children:
+            if child.entity_id == entity_id:
+                return child
+        return None
+
+    def _find_descendant(self, node: _TreeNode, entity_type: str, entity_id: int) -> Optional[_TreeNode]:
+        if node.entity_type not in self.CHILD_TYPES:
+            return None
+        self._ensure_fetched(node)
+        for child in node.children:
+            if child.entity_type == entity_type:
+                if child.entity_id == entity_id:
+                    return child
+                continue
+            found = self._find_descendant(child, entity_type, entity_id)
+            if found is not None:
+                return found
+        return None
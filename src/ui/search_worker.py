@@ -0,0 +1,224 @@
+"""Background search-as-you-type support for the main window."""
+import sqlite3
+from typing import Callable, List, Optional, Tuple
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QTimer,
+    Qt,
+    Signal,
+)
+
+from ..models.entities import SearchResult
+from ..services.search_service import SearchCancellation, SearchCancelled
+
+
+# (result, context parts as (entity_type, name) pairs)
+SearchEntry = Tuple[SearchResult, List[Tuple[str, str]]]
+
+
+class SearchResultsModel(QAbstractTableModel):
+    """Table model for search results that grows in batches."""
+
+    COLUMN_COUNT = 3
+
+    def __init__(self, format_row: Callable[[SearchEntry], Tuple[str, str, str]], parent=None):
+        super().__init__(parent)
+        self._format_row = format_row
+        self._results: List[SearchResult] = []
+        self._rows: List[Tuple[str, str, str]] = []
+        self._headers = ["", "", ""]
+
+    def rowCount(self, parent=QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:  # noqa: N802
+        return 0 if parent.isValid() else self.COLUMN_COUNT
+
+    def data(self, index, role=Qt.DisplayRole):  # noqa: ANN001
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._rows[index.row()][index.column()]
+        if role == Qt.UserRole:
+            return self._results[index.row()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):  # noqa: ANN001, N802
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self._headers):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def set_headers(self, labels: List[str]) -> None:
+        self._headers = list(labels)
+        self.headerDataChanged.emit(Qt.Horizontal, 0, self.COLUMN_COUNT - 1)
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._results = []
+        self._rows = []
+        self.endResetModel()
+
+    def append_entries(self, entries: List[SearchEntry]) -> None:
+        if not entries:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        for entry in entries:
+            self._results.append(entry[0])
+            self._rows.append(self._format_row(entry))
+        self.endInsertRows()
+
+    def result_at(self, row: int) -> Optional[SearchResult]:
+        if 0 <= row < len(self._results):
+            return self._results[row]
+        return None
+
+
+class _SearchSignals(QObject):
+    batch_ready = Signal(int, object)
+    finished = Signal(int, int)
+    failed = Signal(int, str)
+
+
+class _SearchTask(QRunnable):
+    """Run one search on a pool thread and stream every result back in batches.
+
+    The search statement runs once and its rows are read a page at a time,
+    so the first rows show up quickly and nothing is cut off; cancellation
+    interrupts the statement or stops between pages.
+    """
+
+    def __init__(self, controller, generation: int, keyword: str, page_size: int, batch_size: int,  # noqa: ANN001
+                 cancellation: SearchCancellation, signals: _SearchSignals):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.controller = controller
+        self.generation = generation
+        self.keyword = keyword
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.cancellation = cancellation
+        self.signals = signals
+
+    def run(self) -> None:
+        try:
+            total = 0
+            for results in self.controller.iter_search(self.keyword, self.page_size, cancellation=self.cancellation):
+                self.cancellation.raise_if_cancelled()
+                entries: List[SearchEntry] = list(zip(results, self.controller.get_search_contexts(results)))
+                for start in range(0, len(entries), self.batch_size):
+                    self.cancellation.raise_if_cancelled()
+                    self.signals.batch_ready.emit(self.generation, entries[start:start + self.batch_size])
+                total += len(results)
+            self.signals.finished.emit(self.generation, total)
+        except SearchCancelled:
+            return
+        except (sqlite3.Error, ValueError, RuntimeError, OSError, TypeError) as exc:
+            self.signals.failed.emit(self.generation, str(exc))
+
+
+class IncrementalSearchRunner(QObject):
+    """Debounce keystrokes and run searches off the GUI thread.
+
+    Every new query cancels the previous one: its SQLite statement is
+    interrupted and any batches it still emits are ignored by generation.
+    A query that is not replaced streams all of its results from a single
+    statement, ``page_size`` rows at a time.
+    """
+
+    DEFAULT_DEBOUNCE_MS = 250
+    DEFAULT_PAGE_SIZE = 200
+    DEFAULT_BATCH_SIZE = 25
+
+    started = Signal(str)
+    results_ready = Signal(object)
+    finished = Signal(int)
+    failed = Signal(str)
+
+    def __init__(self, controller, parent=None, debounce_ms: int = DEFAULT_DEBOUNCE_MS,  # noqa: ANN001
+                 page_size: int = DEFAULT_PAGE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE):
+        super().__init__(parent)
+        self.controller = controller
+        self.page_size = max(1, int(page_size))
+        self.batch_size = max(1, int(batch_size))
+        self._generation = 0
+        self._pending_keyword = ""
+        self._cancellation: Optional[SearchCancellation] = None
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _SearchSignals()
+        self._signals.batch_ready.connect(self._on_batch_ready)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(max(0, int(debounce_ms)))
+        self._timer.timeout.connect(self._start_pending)
+
+    def schedule(self, keyword: str) -> None:
+        """Search for ``keyword`` once typing pauses for the debounce interval."""
+        self._pending_keyword = keyword
+        self.cancel()
+        self._timer.start()
+
+    def run_now(self, keyword: str) -> None:
+        """Search for ``keyword`` immediately, cancelling anything in flight."""
+        self._timer.stop()
+        self._pending_keyword = keyword
+        self._start_pending()
+
+    def cancel(self) -> None:
+        """Cancel the running search; its remaining results are discarded."""
+        self._generation += 1
+        if self._cancellation is not None:
+            self._cancellation.cancel()
+            self._cancellation = None
+
+    def shutdown(self) -> None:
+        """Cancel pending work and wait for the worker thread to stop."""
+        self._timer.stop()
+        self.cancel()
+        self._pool.clear()
+        self._pool.waitForDone()
+
+    def _start_pending(self) -> None:
+        keyword = (self._pending_keyword or "").strip()
+        self.cancel()
+        self.started.emit(keyword)
+        if not keyword:
+            self.finished.emit(0)
+            return
+        cancellation = SearchCancellation()
+        self._cancellation = cancellation
+        # Tasks still queued behind the running one are stale now.
+        self._pool.clear()
+        self._pool.start(
+            _SearchTask(
+                self.controller,
+                self._generation,
+                keyword,
+                self.page_size,
+                self.batch_size,
+                cancellation,
+                self._signals,
+            )
+        )
+
+    def _on_batch_ready(self, generation: int, entries) -> None:  # noqa: ANN001
+        if generation == self._generation:
+            self.results_ready.emit(entries)
+
+    def _on_finished(self, generation: int, count: int) -> None:
+        if generation == self._generation:
+            self._cancellation = None
+            self.finished.emit(count)
+
+    def _on_failed(self, generation: int, message: str) -> None:
+        if generation == self._generation:
+            self._cancellation = None
+            self.failed.emit(message)
@@ -2,11 +2,19 @@ import tempfile
 import unittest
 from unittest import mock
 
+from src.controllers.admin_controller import AdminController
+from src.controllers.main_controller import MainController
 from src.models.database import Database
+from src.models.entities import Discipline, EducationalProgram, Lesson, MethodicalMaterial, Question, Teacher, Topic
 from src.repositories.discipline_repository import DisciplineRepository
+from src.repositories.lesson_repository import LessonRepository
+from src.repositories.material_repository import MaterialRepository
+from src.repositories.program_repository import ProgramRepository
+from src.repositories.question_repository import QuestionRepository
 from src.repositories.teacher_repository import TeacherRepository
 from src.repositories.topic_repository import TopicRepository
 from src.services.auth_service import AuthService
+from src.services.report_service import STATUS_COMPLETE, STATUS_MISSING, STATUS_PARTIAL, ReportService
 
 
 class AuthAndRepositoryRegressionTests(unittest.TestCase):
@@ -75,3 +83,205 @@ class AuthAndRepositoryRegressionTests(unittest.TestCase):
                 repo.add_lesson_to_topic(1, 1, 1)
         finally:
             database.get_connection = original_get_connection
+
+    def test_program_structure_loader_matches_per_node_walk(self):
+        database = Database(":memory:")
+        program_repo = ProgramRepository(database)
+        discipline_repo = DisciplineRepository(database)
+        topic_repo = TopicRepository(database)
+        lesson_repo = LessonRepository(database)
+        question_repo = QuestionRepository(database)
+
+        program = program_repo.add(EducationalProgram(name="Program", year=2026))
+        shared_topic = topic_repo.add(Topic(title="Shared topic"))
+        for d_index in (2, 1):
+            discipline = discipline_repo.add(Discipline(name=f"Discipline {d_index}"))
+            program_repo.add_discipline_to_program(program.id, discipline.id, d_index)
+            discipline_repo.add_topic_to_discipline(discipline.id, shared_topic.id, 5)
+            topic = topic_repo.add(Topic(title=f"Topic {d_index}"))
+            discipline_repo.add_topic_to_discipline(discipline.id, topic.id, 1)
+            for l_index in (2, 1):
+                lesson = lesson_repo.add(Lesson(title=f"Lesson {d_index}.{l_index}"))
+                topic_repo.add_lesson_to_topic(topic.id, lesson.id, l_index)
+                topic_repo.add_lesson_to_topic(shared_topic.id, lesson.id, l_index * 10 + d_index)
+                for q_index in (3, 1, 2):
+                    question = question_repo.add(Question(content=f"Q {d_index}.{l_index}.{q_index}"))
+                    lesson_repo.add_question_to_lesson(lesson.id, question.id, q_index)
+
+        def walk(disciplines):
+            return [
+                (
+                    d.id,
+                    d.order_index,
+                    [
+                        (
+                            t.id,
+                            t.order_index,
+                            [(l.id, l.title, [q.content for q in l.questions]) for l in t.lessons],
+                        )
+                        for t in d.topics
+                    ],
+                )
+                for d in disciplines
+            ]
+
+        expected = program_repo.get_program_disciplines(program.id)
+        for discipline in expected:
+            discipline.topics = discipline_repo.get_discipline_topics(discipline.id)
+            for topic in discipline.topics:
+                topic.lessons = topic_repo.get_topic_lessons(topic.id)
+                for lesson in topic.lessons:
+                    lesson.questions = lesson_repo.get_lesson_questions(lesson.id)
+
+        stats_before = database.connection_stats()
+        loaded = program_repo.get_program_structure(program.id)
+        stats_after = database.connection_stats()
+
+        self.assertEqual(walk(loaded), walk(expected))
+        acquired = (stats_after["opened"] + stats_after["reused"]) - (stats_before["opened"] + stats_before["reused"])
+        self.assertEqual(acquired, 1)
+        shared = [t for d in loaded for t in d.topics if t.id == shared_topic.id]
+        self.assertIsNot(shared[0].lessons[0], shared[1].lessons[0])
+        self.assertEqual(program_repo.get_program_structure(program.id + 100), [])
+
+    def test_coverage_report_aggregates_lessons_and_teachers(self):
+        database = Database(":memory:")
+        program_repo = ProgramRepository(database)
+        discipline_repo = DisciplineRepository(database)
+        topic_repo = TopicRepository(database)
+        lesson_repo = LessonRepository(database)
+        teacher_repo = TeacherRepository(database)
+        material_repo = MaterialRepository(database)
+        with database.get_connection() as conn:
+            self_study_type_id = conn.execute(
+                "SELECT id FROM lesson_types WHERE name = ?", ("Самостійна робота",)
+            ).fetchone()["id"]
+
+        program = program_repo.add(EducationalProgram(name="Program", year=2026))
+        discipline = discipline_repo.add(Discipline(name="Discipline"))
+        program_repo.add_discipline_to_program(program.id, discipline.id, 1)
+        empty_topic = topic_repo.add(Topic(title="Empty topic"))
+        topic = topic_repo.add(Topic(title="Topic"))
+        discipline_repo.add_topic_to_discipline(discipline.id, empty_topic.id, 1)
+        discipline_repo.add_topic_to_discipline(discipline.id, topic.id, 2)
+        first = lesson_repo.add(Lesson(title="First"))
+        study = lesson_repo.add(Lesson(title="Study", lesson_type_id=self_study_type_id))
+        second = lesson_repo.add(Lesson(title="Second"))
+        for index, lesson in enumerate((first, study, second), start=1):
+            topic_repo.add_lesson_to_topic(topic.id, lesson.id, index)
+
+        assigned = teacher_repo.add(Teacher(full_name="Assigned", order_index=2))
+        other = teacher_repo.add(Teacher(full_name="Other", order_index=1))
+        teacher_repo.add_discipline(assigned.id, discipline.id)
+
+        def attach(lesson, teacher, title, material_type):
+            material = material_repo.add(MethodicalMaterial(title=title, material_type=material_type))
+            material_repo.add_material_to_entity(material.id, "lesson", lesson.id)
+            material_repo.add_teacher_to_material(teacher.id, material.id)
+
+        attach(first, assigned, "Plan", "plan")
+        attach(first, assigned, "Guide", "metod")
+        attach(first, assigned, "Slides", "presentation")
+        attach(study, assigned, "Для курсантів", "guide")
+        attach(second, other, "Other plan", "plan")
+
+        service = ReportService(database)
+        report = service.build_coverage_report(program.id)
+        self.assertEqual([row.code for row in report.rows], ["т.2.з.1", "т.2.ср", "т.2.з.2"])
+        self.assertEqual([row.lesson_id for row in report.rows], [first.id, study.id, second.id])
+        self.assertEqual([t.id for t in report.teachers], [assigned.id])
+        self.assertEqual(report.cell(0, assigned.id).titles, ["Guide", "Plan", "Slides"])
+        self.assertEqual(
+            [report.cell(i, assigned.id).status for i in range(3)],
+            [STATUS_COMPLETE, STATUS_PARTIAL, STATUS_MISSING],
+        )
+        self.assertEqual([row.status for row in report.rows], [STATUS_COMPLETE, STATUS_PARTIAL, STATUS_MISSING])
+
+        report = service.build_coverage_report(program.id, include_all_teachers=True)
+        self.assertEqual([t.id for t in report.teachers], [other.id, assigned.id])
+        self.assertEqual(report.cell(2, other.id).titles, ["Other plan"])
+        self.assertEqual(report.rows[2].status, STATUS_PARTIAL)
+        self.assertEqual(service.build_coverage_report(program.id + 100).rows, [])
+
+    def test_material_lists_load_teachers_in_one_connection(self):
+        database = Database(":memory:")
+        teacher_repo = TeacherRepository(database)
+        material_repo = MaterialRepository(database)
+        first = teacher_repo.add(Teacher(full_name="Bravo"))
+        second = teacher_repo.add(Teacher(full_name="Alpha", order_index=1))
+        for index in range(3):
+            material = material_repo.add(MethodicalMaterial(title=f"Material {index}"))
+            material_repo.add_material_to_entity(material.id, "lesson", 1)
+            if index < 2:
+                material_repo.add_teacher_to_material(first.id, material.id)
+            if index == 0:
+                material_repo.add_teacher_to_material(second.id, material.id)
+
+        def acquired(call):
+            before = database.connection_stats()
+            value = call()
+            after = database.connection_stats()
+            return value, (after["opened"] + after["reused"]) - (before["opened"] + before["reused"])
+
+        for call in (
+            material_repo.get_all,
+            lambda: material_repo.search("Material"),
+            lambda: material_repo.get_materials_for_entity("lesson", 1),
+        ):
+            materials, connections = acquired(call)
+            self.assertEqual(connections, 1)
+            self.assertEqual(
+                [[t.full_name for t in m.teachers] for m in materials],
+                [["Alpha", "Bravo"], ["Bravo"], []],
+            )
+            self.assertEqual(
+                [[t.id for t in m.teachers] for m in materials],
+                [[t.id for t in material_repo.get_material_teachers(m.id)] for m in materials],
+            )
+
+        materials = material_repo.get_all(include_teachers=False)
+        self.assertEqual([m.teachers for m in materials], [[], [], []])
+
+    def test_main_controller_caches_reads_until_data_version_changes(self):
+        database = Database(":memory:")
+        controller = MainController(database)
+        admin = AdminController(database)
+        program = admin.add_program(EducationalProgram(name="Program", year=2026))
+        discipline = admin.add_discipline(Discipline(name="Discipline"))
+        admin.add_discipline_to_program(program.id, discipline.id, 1)
+
+        first = controller.get_program_disciplines(program.id)
+        first.append(Discipline(name="Local only"))
+        stats_before = database.connection_stats()
+        second = controller.get_program_disciplines(program.id)
+        details = controller.get_entity_details("discipline", discipline.id)
+        details = controller.get_entity_details("discipline", discipline.id)
+        stats_after = database.connection_stats()
+
+        self.assertEqual([d.name for d in second], ["Discipline"])
+        self.assertEqual(details["title"], "Discipline")
+        self.assertEqual(stats_after["reused"] + stats_after["opened"], stats_before["reused"] + stats_before["opened"] + 1)
+        self.assertEqual(controller.cache_stats()["hits"], 2)
+
+        discipline.name = "Renamed"
+        admin.update_discipline(discipline)
+        self.assertEqual(controller.get_entity_details("discipline", discipline.id)["title"], "Renamed")
+        self.assertEqual([d.name for d in controller.get_program_disciplines(program.id)], ["Renamed"])
+        self.assertEqual(controller.cache_stats()["invalidations"], 1)
+
+    def test_database_data_version_is_shared_per_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            from pathlib import Path
+
+            db_path = str(Path(tmp_dir) / "education.db")
+            first = Database(db_path)
+            second = Database(db_path)
+            version = first.data_version()
+            with second.get_connection() as conn:
+                conn.execute("SELECT COUNT(*) FROM teachers").fetchone()
+            self.assertEqual(first.data_version(), version)
+            with second.get_connection() as conn:
+                conn.execute("INSERT INTO teachers (full_name) VALUES (?)", ("Teacher",))
+            self.assertGreater(first.data_version(), version)
+            first.close()
+            second.close()
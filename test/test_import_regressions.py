@@ -4,13 +4,20 @@ from pathlib import Path
 
 from src.models.database import Database
 from src.services.import_service import (
+    CurriculumLesson,
+    CurriculumQuestion,
+    CurriculumTopic,
     build_batch_import_plan,
     extract_text_from_file,
     import_curriculum_structure_by_names,
     import_teachers_from_docx,
+    parse_curriculum_file,
     parse_curriculum_text,
+    parse_teachers_from_docx,
     summarize_curriculum_topics,
 )
+from src.services.docx_tables import iter_docx_blocks
+from src.services.search_service import SearchService
 
 
 class ImportRegressionTests(unittest.TestCase):
@@ -66,6 +73,66 @@ class ImportRegressionTests(unittest.TestCase):
             with self.assertRaises(ValueError):
                 import_teachers_from_docx(Database(":memory:"), str(path))
 
+    def test_docx_rows_stream_with_merged_and_multi_paragraph_cells(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "Program - Discipline.docx"
+            try:
+                from docx import Document
+            except ImportError:
+                self.skipTest("python-docx is not installed")
+            doc = Document()
+            doc.add_paragraph("Навчальна програма")
+            table = doc.add_table(rows=4, cols=3)
+            for idx, header in enumerate(["Назва теми", "Заняття", "Всього"]):
+                table.cell(0, idx).text = header
+            table.cell(1, 0).text = "Тема 1. Основи"
+            lesson = table.cell(1, 1)
+            lesson.text = "Заняття 1. Лекція"
+            lesson.add_paragraph("1. Q1")
+            lesson.add_paragraph("2. Q2")
+            table.cell(2, 1).text = "Заняття 2. Семінар"
+            table.cell(1, 2).merge(table.cell(2, 2)).text = "2"
+            table.cell(3, 0).merge(table.cell(3, 2)).text = "Всього за тему"
+            doc.save(path)
+
+            blocks = list(iter_docx_blocks(str(path)))
+            topics = parse_curriculum_file(str(path))
+
+            self.assertEqual(blocks[0], (None, ["Навчальна програма"]))
+            self.assertEqual(blocks[2], (0, ["Тема 1. Основи", "Заняття 1. Лекція\n1. Q1\n2. Q2", "2"]))
+            self.assertEqual(blocks[3], (0, ["", "Заняття 2. Семінар", "2"]))
+            self.assertEqual(blocks[4], (0, ["Всього за тему"] * 3))
+            self.assertEqual(len(topics), 1)
+            self.assertEqual([item.title for item in topics[0].lessons], ["Заняття 1. Лекція", "Заняття 2. Семінар"])
+            self.assertEqual([q.text for q in topics[0].lessons[0].questions], ["1. Q1", "2. Q2"])
+            self.assertEqual([item.total_hours for item in topics[0].lessons], [2.0, 2.0])
+            self.assertEqual(extract_text_from_file(str(path)).splitlines()[0], "Назва теми\tЗаняття\tВсього")
+
+    def test_parse_teachers_reads_only_first_docx_table(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "teachers.docx"
+            try:
+                from docx import Document
+            except ImportError:
+                self.skipTest("python-docx is not installed")
+            doc = Document()
+            first = doc.add_table(rows=2, cols=2)
+            first.cell(0, 0).text = "name"
+            first.cell(0, 1).text = "email"
+            first.cell(1, 0).text = "A"
+            first.cell(1, 1).text = "a@example.com"
+            doc.add_table(rows=1, cols=2).cell(0, 0).text = "B"
+            doc.save(path)
+
+            teachers = parse_teachers_from_docx(str(path))
+
+            self.assertEqual([(t.full_name, t.email) for t in teachers], [("A", "a@example.com")])
+
+            empty = Path(tmp_dir) / "empty.docx"
+            Document().save(empty)
+            with self.assertRaises(ValueError):
+                parse_teachers_from_docx(str(empty))
+
     def test_batch_import_plan_uses_filename_targets(self):
         with tempfile.TemporaryDirectory() as tmp_dir:
             path = Path(tmp_dir) / "Program A - Discipline B.txt"
@@ -86,6 +153,48 @@ class ImportRegressionTests(unittest.TestCase):
             with self.assertRaises(ValueError):
                 build_batch_import_plan([str(path)])
 
+    def test_batch_import_plan_parses_in_workers_and_keeps_input_order(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = []
+            for index in range(4):
+                path = Path(tmp_dir) / f"Program {index} - Discipline {index}.txt"
+                lines = ["Тема 1. Основи"] + [f"Заняття {n}. Intro {n}\n1. Q{n}" for n in range(1, index + 2)]
+                path.write_text("\n".join(lines), encoding="utf-8")
+                paths.append(str(path))
+            reported = []
+
+            plan = build_batch_import_plan(
+                paths, max_workers=2, progress=lambda done, total, path: reported.append((done, total, path))
+            )
+
+            self.assertEqual([item.path for item in plan], paths)
+            self.assertEqual([item.summary.lessons_count for item in plan], [1, 2, 3, 4])
+            self.assertEqual([entry[0] for entry in reported], [1, 2, 3, 4])
+            self.assertEqual({entry[2] for entry in reported}, set(paths))
+            self.assertEqual(plan, build_batch_import_plan(paths, max_workers=1))
+
+    def test_batch_import_plan_reports_every_failing_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            good = Path(tmp_dir) / "Program A - Discipline B.txt"
+            good.write_text("\n".join(["Тема 1. Основи", "Заняття 1. Intro", "1. Q1"]), encoding="utf-8")
+            unsupported = Path(tmp_dir) / "Program A - Notes.pdf"
+            unsupported.write_bytes(b"%PDF")
+            unnamed = Path(tmp_dir) / "   .txt"
+            unnamed.write_text("\n".join(["Тема 1. Основи", "Заняття 1. Intro", "1. Q1"]), encoding="utf-8")
+
+            with self.assertRaises(ValueError) as ctx:
+                build_batch_import_plan([str(unnamed), str(good), str(unsupported)], max_workers=2)
+
+            lines = str(ctx.exception).splitlines()
+            self.assertEqual(len(lines), 2)
+            self.assertTrue(lines[0].startswith("   .txt: "))
+            self.assertTrue(lines[1].startswith("Program A - Notes.pdf: "))
+
+            errors = []
+            plan = build_batch_import_plan([str(unnamed), str(good), str(unsupported)], max_workers=2, errors=errors)
+            self.assertEqual([item.path for item in plan], [str(good)])
+            self.assertEqual(errors, lines)
+
     def test_import_allows_duplicate_lesson_titles_in_same_topic(self):
         text = "\n".join(
             [
@@ -108,3 +217,61 @@ class ImportRegressionTests(unittest.TestCase):
             self.assertEqual(t_added, 1)
             self.assertEqual(l_added, 1)
             self.assertEqual(q_added, 2)
+
+    def test_bulk_import_merges_in_memory_and_indexes_new_rows(self):
+        def lesson(title, hours, questions):
+            return CurriculumLesson(
+                number=None,
+                title=title,
+                lesson_type_name=None,
+                total_hours=hours,
+                classroom_hours=None,
+                self_study_hours=None,
+                questions=[CurriculumQuestion(number=None, text=text) for text in questions],
+            )
+
+        topics = [
+            CurriculumTopic(
+                title="Тема 1",
+                lessons=[lesson("Заняття 1", None, ["Перше питання"]), lesson("Заняття 1", 2.0, ["Друге питання"])],
+            ),
+            CurriculumTopic(title="Тема 2", lessons=[lesson("Заняття 2", 1.0, ["Третє питання"])]),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = Database(str(Path(tmp_dir) / "edu.db"))
+            self.assertEqual(import_curriculum_structure_by_names(db, "Program", "Discipline", topics), (2, 2, 3))
+
+            topics[1].lessons.append(lesson("Заняття 3", 1.0, ["Четверте питання", "Третє питання"]))
+            statements = []
+            with db.get_connection() as conn:
+                conn.set_trace_callback(statements.append)
+            try:
+                self.assertEqual(import_curriculum_structure_by_names(db, "Program", "Discipline", topics), (0, 1, 2))
+            finally:
+                with db.get_connection() as conn:
+                    conn.set_trace_callback(None)
+            # IDs are allocated inside the write transaction that inserts them.
+            begin = statements.index("BEGIN IMMEDIATE")
+            self.assertLess(begin, min(i for i, sql in enumerate(statements) if "sqlite_sequence" in sql))
+            commit = statements.index("COMMIT", begin)
+            self.assertTrue(any(sql.startswith("INSERT INTO lessons") for sql in statements[begin:commit]))
+
+            with db.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT t.title, l.title, l.duration_hours, tl.order_index
+                    FROM topic_lessons tl
+                    JOIN topics t ON t.id = tl.topic_id
+                    JOIN lessons l ON l.id = tl.lesson_id
+                    ORDER BY t.id, tl.order_index
+                """).fetchall()
+                triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+            self.assertEqual(
+                [tuple(row) for row in rows],
+                [("Тема 1", "Заняття 1", 2.0, 1), ("Тема 2", "Заняття 2", 1.0, 1), ("Тема 2", "Заняття 3", 1.0, 3)],
+            )
+            self.assertTrue({"topics_ai", "lessons_ai", "questions_ai"} <= triggers)
+
+            service = SearchService(db)
+            self.assertEqual([r.title for r in service.search_all("Четверте")], ["Четверте питання"])
+            self.assertEqual([r.entity_type for r in service.search_all("Заняття 3")][:1], ["lesson"])
@@ -1,6 +1,7 @@
 import tempfile
 import unittest
 import json
+import os
 import re
 import xml.etree.ElementTree as ET
 from pathlib import Path
@@ -17,13 +18,18 @@ import src.services.activity_log as activity_log_module
 import src.ui.admin_dialog_settings_mixin as settings_mixin_module
 import src.app as app_module
 from src.services.ui_fallback_translations import UK_UI_FALLBACKS
+import src.services.file_fingerprints as file_fingerprints_module
+from src.services.file_fingerprints import FileFingerprintCache
 from src.services.file_storage import FileStorageManager
+from src.services.structure_snapshot import load_structure_snapshot
+from src.services.subtree_digests import SubtreeDigestService
 from src.services.file_storage import StorageScopeError
 from src.services.import_service import extract_text_from_file, parse_curriculum_text
+from src.services.internet_sync_service import InternetSyncService
 from src.services.search_service import SearchService
 from src.services import storage_settings
 import src.services.i18n as i18n_module
-from src.models.entities import MethodicalMaterial
+from src.models.entities import Discipline, EducationalProgram, Lesson, MethodicalMaterial, Question, Teacher, Topic
 from src.controllers.admin_controller import AdminController
 from src.ui.admin_dialog_internet_sync_mixin import AdminDialogInternetSyncMixin
 from src.ui.admin_dialog import AdminDialog
@@ -129,6 +135,239 @@ class RegressionTests(unittest.TestCase):
             CountingDatabase(str(db_path))
             self.assertEqual(CountingDatabase.rebuild_calls, 0)
 
+    def test_fts_triggers_keep_index_consistent_on_update_and_delete(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(str(Path(tmp_dir) / "education.db"))
+            with database.get_connection() as conn:
+                cursor = conn.execute("INSERT INTO questions (content, answer) VALUES (?, ?)", ("First", ""))
+                question_id = cursor.lastrowid
+                conn.execute("UPDATE questions SET content = ? WHERE id = ?", ("Renamed edited", question_id))
+
+            service = SearchService(database)
+            self.assertEqual([r.entity_id for r in service.search_all("Renamed")], [question_id])
+            self.assertEqual(service.search_all("First"), [])
+
+            with database.get_connection() as conn:
+                conn.execute("DELETE FROM questions WHERE id = ?", (question_id,))
+                conn.execute("INSERT INTO questions_fts(questions_fts) VALUES ('integrity-check')")
+            self.assertEqual(service.search_all("Renamed"), [])
+
+    def test_deferred_fts_indexes_journaled_rows_on_exit(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(str(Path(tmp_dir) / "education.db"))
+            with database.get_connection() as conn:
+                conn.executemany(
+                    "INSERT INTO questions (content, answer) VALUES (?, ?)",
+                    [(f"Filler {index}", "") for index in range(20)] + [("Kept original", ""), ("Dropped", "")],
+                )
+                kept_id, dropped_id = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id DESC LIMIT 2")][::-1]
+            service = SearchService(database)
+
+            with database.deferred_fts():
+                with database.deferred_fts(), database.get_connection() as conn:
+                    new_id = conn.execute("INSERT INTO questions (content, answer) VALUES ('Fresh', '')").lastrowid
+                    conn.execute("UPDATE questions SET content = 'Kept renamed' WHERE id = ?", (kept_id,))
+                    conn.execute("UPDATE questions SET content = 'Fresh twice' WHERE id = ?", (new_id,))
+                    conn.execute("DELETE FROM questions WHERE id = ?", (dropped_id,))
+                    conn.execute("INSERT OR REPLACE INTO questions (id, content, answer) VALUES (1, 'Replaced', '')")
+                self.assertEqual(service.search_all("Fresh"), [])
+                with database.get_connection() as conn:
+                    self.assertEqual(
+                        conn.execute("SELECT COUNT(*) FROM fts_pending WHERE fts_table = 'questions_fts'").fetchone()[0],
+                        4,
+                    )
+
+            self.assertEqual([r.entity_id for r in service.search_all("Fresh")], [new_id])
+            self.assertEqual([r.entity_id for r in service.search_all("renamed")], [kept_id])
+            self.assertEqual([r.entity_id for r in service.search_all("Replaced")], [1])
+            self.assertEqual(service.search_all("original"), [])
+            self.assertEqual(service.search_all("Dropped"), [])
+            with database.get_connection() as conn:
+                conn.execute("INSERT INTO questions_fts(questions_fts) VALUES ('integrity-check')")
+                conn.execute("INSERT INTO questions_trigram(questions_trigram) VALUES ('integrity-check')")
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM fts_pending").fetchone()[0], 0)
+                self.assertIsNone(conn.execute("SELECT id FROM fts_deferral").fetchone())
+                conn.execute("INSERT INTO questions (content, answer) VALUES ('Live', '')")
+            self.assertEqual(len(service.search_all("Live")), 1)
+
+    def test_interrupted_fts_deferral_is_applied_on_next_open(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = str(Path(tmp_dir) / "education.db")
+            Database(path)
+            with closing(sqlite3.connect(path)) as conn:
+                conn.execute("INSERT INTO fts_deferral (id) VALUES (1)")
+                conn.execute("INSERT INTO topics (title, description) VALUES ('Orphaned write', '')")
+                conn.commit()
+
+            database = Database(path)
+
+            self.assertEqual(len(SearchService(database).search_all("Orphaned")), 1)
+            with database.get_connection() as conn:
+                self.assertIsNone(conn.execute("SELECT id FROM fts_deferral").fetchone())
+                conn.execute("INSERT INTO topics_fts(topics_fts) VALUES ('integrity-check')")
+
+    def test_file_fingerprint_cache_hashes_unchanged_files_once(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            database = Database(str(root / "education.db"))
+            (root / "p01").mkdir()
+            slides = root / "p01" / "slides.pptx"
+            slides.write_bytes(b"slide-data" * 1000)
+            expected = file_fingerprints_module.file_crc32(slides)
+
+            hashed = []
+            original = file_fingerprints_module.file_crc32
+
+            def counting_crc32(path):
+                hashed.append(Path(path).name)
+                return original(path)
+
+            file_fingerprints_module.file_crc32 = counting_crc32
+            try:
+                cache = FileFingerprintCache(database)
+                self.assertEqual(cache.prefetch([("p01/slides.pptx", slides)]), 1)
+                self.assertEqual(cache.crc32("p01/slides.pptx", slides), expected)
+                self.assertEqual(cache.crc32("p01/slides.pptx", slides), expected)
+                cache.shutdown()
+
+                reopened = FileFingerprintCache(Database(str(root / "education.db")))
+                self.assertEqual(reopened.prefetch([("p01/slides.pptx", slides)]), 0)
+                self.assertEqual(reopened.crc32("p01/slides.pptx", slides), expected)
+                self.assertEqual(hashed, ["slides.pptx"])
+
+                slides.write_bytes(b"changed")
+                self.assertEqual(reopened.crc32("p01/slides.pptx", slides), original(slides))
+                self.assertEqual(hashed, ["slides.pptx", "slides.pptx"])
+                self.assertEqual(reopened.crc32("p01/missing.pptx", root / "p01" / "missing.pptx"), 0)
+                reopened.shutdown()
+            finally:
+                file_fingerprints_module.file_crc32 = original
+
+    def test_subtree_digests_match_across_databases_and_invalidate_ancestors(self):
+        def build(root: Path, question_text: str):
+            controller = AdminController(Database(str(root / "education.db")))
+            program = controller.add_program(EducationalProgram(name="Program", year=2026))
+            discipline = controller.add_discipline(Discipline(name="Discipline"))
+            controller.add_discipline_to_program(program.id, discipline.id)
+            topic = controller.add_topic(Topic(title="Topic"))
+            controller.add_topic_to_discipline(discipline.id, topic.id)
+            lessons = []
+            for title in ("Lesson A", "Lesson B"):
+                lesson = controller.add_lesson(Lesson(title=title))
+                controller.add_lesson_to_topic(topic.id, lesson.id)
+                question = controller.add_question(Question(content=f"{title}: {question_text}"))
+                controller.add_question_to_lesson(lesson.id, question.id)
+                lessons.append((lesson, question))
+            (root / "p01").mkdir()
+            (root / "p01" / "plan.docx").write_bytes(b"plan")
+            material = controller.add_material(
+                MethodicalMaterial(title="Plan", material_type="plan", relative_path="p01/plan.docx")
+            )
+            controller.add_material_to_entity(material.id, "lesson", lessons[0][0].id)
+            return controller, program, lessons
+
+        def stored(controller):
+            with controller.db.get_connection() as conn:
+                rows = conn.execute("SELECT entity_type FROM subtree_digests").fetchall()
+            return sorted(row[0] for row in rows)
+
+        with tempfile.TemporaryDirectory() as left_dir, tempfile.TemporaryDirectory() as right_dir:
+            left, left_program, left_lessons = build(Path(left_dir), "same")
+            right, right_program, right_lessons = build(Path(right_dir), "same")
+            left_digests = SubtreeDigestService(left.db, Path(left_dir))
+            right_digests = SubtreeDigestService(right.db, Path(right_dir))
+
+            self.assertEqual(
+                left_digests.digest("program", left_program.id),
+                right_digests.digest("program", right_program.id),
+            )
+            self.assertEqual(stored(left), ["discipline", "lesson", "lesson", "program", "topic"])
+
+            lesson_b, question_b = right_lessons[1]
+            question_b.content = "Lesson B: changed"
+            right.update_question(question_b)
+            self.assertEqual(stored(right), ["lesson"])
+            self.assertNotEqual(
+                left_digests.digest("program", left_program.id),
+                right_digests.digest("program", right_program.id),
+            )
+            self.assertEqual(
+                left_digests.digest("lesson", left_lessons[0][0].id),
+                right_digests.digest("lesson", right_lessons[0][0].id),
+            )
+
+            (Path(left_dir) / "p01" / "plan.docx").write_bytes(b"other plan")
+            material = left.get_materials_for_entity("lesson", left_lessons[0][0].id)[0]
+            left.update_material(material)
+            self.assertEqual(stored(left), ["lesson"])
+            self.assertNotEqual(
+                left_digests.digest("lesson", left_lessons[0][0].id),
+                right_digests.digest("lesson", right_lessons[0][0].id),
+            )
+
+            # Rewritten in place: no database change drops the stored digests.
+            left_plan = Path(left_dir) / "p01" / "plan.docx"
+            stat = left_plan.stat()
+            left_plan.write_bytes(b"plan")
+            os.utime(left_plan, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertEqual(stored(left), ["lesson", "lesson"])
+            self.assertEqual(
+                left_digests.digest("lesson", left_lessons[0][0].id),
+                right_digests.digest("lesson", right_lessons[0][0].id),
+            )
+            # Digests are kept per files root.
+            self.assertEqual(
+                SubtreeDigestService(right.db, Path(left_dir)).digest("lesson", right_lessons[0][0].id),
+                right_digests.digest("lesson", right_lessons[0][0].id),
+            )
+            (Path(left_dir) / "p01" / "plan.docx").write_bytes(b"third plan")
+            self.assertNotEqual(
+                SubtreeDigestService(right.db, Path(left_dir)).digest("lesson", right_lessons[0][0].id),
+                right_digests.digest("lesson", right_lessons[0][0].id),
+            )
+
+    def test_structure_snapshot_matches_per_program_reads(self):
+        controller = AdminController(Database(":memory:"))
+        shared = controller.add_discipline(Discipline(name="Shared"))
+        programs = []
+        for name in ("Beta", "Alpha"):
+            program = controller.add_program(EducationalProgram(name=name, year=2026))
+            controller.add_discipline_to_program(program.id, shared.id, 1)
+            own = controller.add_discipline(Discipline(name=f"{name} own"))
+            controller.add_discipline_to_program(program.id, own.id, 2)
+            programs.append(program)
+        topic = controller.add_topic(Topic(title="Topic"))
+        controller.add_topic_to_discipline(shared.id, topic.id)
+        for index, title in enumerate(("Second", "First")):
+            lesson = controller.add_lesson(Lesson(title=title))
+            controller.add_lesson_to_topic(topic.id, lesson.id, 2 - index)
+            for text in ("q2", "q1"):
+                question = controller.add_question(Question(content=f"{title} {text}"))
+                controller.add_question_to_lesson(lesson.id, question.id)
+        teacher = controller.add_teacher(Teacher(full_name="Author"))
+        material = controller.add_material(MethodicalMaterial(title="Guide", material_type="guide"))
+        controller.add_material_to_entity(material.id, "topic", topic.id)
+        controller.add_teacher_to_material(teacher.id, material.id)
+
+        snapshot = load_structure_snapshot(controller.db)
+
+        self.assertEqual([p.name for p in snapshot.get_programs()], ["Alpha", "Beta"])
+        for program in programs:
+            self.assertEqual(
+                snapshot.get_program_structure(program.id),
+                controller.program_repo.get_program_structure(program.id),
+            )
+        self.assertEqual(
+            snapshot.get_materials_for_entity("topic", topic.id),
+            controller.material_repo.get_materials_for_entity("topic", topic.id),
+        )
+        self.assertEqual(snapshot.get_materials_for_entity("topic", topic.id)[0].teachers[0].full_name, "Author")
+
+        index = snapshot.compare_index(programs[0])
+        self.assertIs(index["selected_program"], programs[0])
+        self.assertEqual(set(index["disciplines"][programs[0].id]), {"Shared", "Beta own"})
+        self.assertEqual(set(index["lessons"][topic.id]), {"First", "Second"})
+
     def test_search_service_does_not_swallow_database_errors(self):
         database = Database(":memory:")
         service = SearchService(database)
@@ -391,25 +630,119 @@ class RegressionTests(unittest.TestCase):
         self.assertGreaterEqual(len(tables), 10)
 
     def test_internet_sync_conflict_columns_exclude_meta_fields(self):
-        dummy = type("DummySync", (AdminDialogInternetSyncMixin,), {})()
-        cols = dummy._conflict_compare_columns(
+        cols = InternetSyncService().conflict_compare_columns(
             ["id", "sync_uuid", "created_at", "updated_at", "title", "description"]
         )
         self.assertEqual(cols, ["title", "description"])
 
     def test_internet_sync_rows_differ_uses_normalized_values(self):
-        dummy = type("DummySync", (AdminDialogInternetSyncMixin,), {})()
+        service = InternetSyncService()
         left = {"duration_hours": 1, "title": "A"}
         right = {"duration_hours": 1.0, "title": "A"}
-        self.assertFalse(dummy._rows_differ(left, right, ["duration_hours", "title"]))
+        self.assertFalse(service.rows_differ(left, right, ["duration_hours", "title"]))
         right["title"] = "B"
-        self.assertTrue(dummy._rows_differ(left, right, ["duration_hours", "title"]))
+        self.assertTrue(service.rows_differ(left, right, ["duration_hours", "title"]))
 
     def test_internet_sync_entity_type_table_mapping(self):
-        dummy = type("DummySync", (AdminDialogInternetSyncMixin,), {})()
-        self.assertEqual(dummy._entity_type_to_table("program"), "educational_programs")
-        self.assertEqual(dummy._entity_type_to_table("lesson"), "lessons")
-        self.assertIsNone(dummy._entity_type_to_table("unknown"))
+        service = InternetSyncService()
+        self.assertEqual(service.entity_type_to_table("program"), "educational_programs")
+        self.assertEqual(service.entity_type_to_table("lesson"), "lessons")
+        self.assertIsNone(service.entity_type_to_table("unknown"))
+
+    def test_internet_sync_merges_sorted_pages_by_uuid(self):
+        service = InternetSyncService()
+        with closing(sqlite3.connect(":memory:")) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute("CREATE TABLE topics (id INTEGER PRIMARY KEY, title TEXT, sync_uuid TEXT)")
+            conn.executemany(
+                "INSERT INTO topics (title, sync_uuid) VALUES (?, ?)",
+                [("A", "a"), ("C", "c"), ("D", "d"), ("E", "e"), ("No uuid", None)],
+            )
+            pages = list(service.iter_sqlite_rows_by_uuid(conn, "topics", 2))
+            self.assertEqual([[row["sync_uuid"] for row in page] for page in pages], [["a", "c"], ["d", "e"]])
+
+            remote_pages = iter([[{"sync_uuid": "b"}, {"sync_uuid": "c"}], [{"sync_uuid": "f"}]])
+            merged = [
+                (sync_uuid, local is not None, remote is not None)
+                for sync_uuid, local, remote in service.merge_rows_by_uuid(
+                    service.iter_sqlite_rows_by_uuid(conn, "topics", 2), remote_pages
+                )
+            ]
+        self.assertEqual(
+            merged,
+            [
+                ("a", True, False),
+                ("b", False, True),
+                ("c", True, True),
+                ("d", True, False),
+                ("e", True, False),
+                ("f", False, True),
+            ],
+        )
+        with self.assertRaises(ValueError):
+            list(service.merge_rows_by_uuid(iter([[{"sync_uuid": "b"}, {"sync_uuid": "a"}]]), iter([])))
+
+    def test_internet_sync_link_upserts_batch_and_cache_metadata(self):
+        class FakeCursor:
+            def __init__(self, log):
+                self.log = log
+                self._rows = []
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *_args):
+                return False
+
+            def execute(self, sql, params=None):
+                self.log.append(("execute", sql.split()[0] + " " + sql.split()[1]))
+                if sql.startswith("SHOW COLUMNS"):
+                    self._rows = [{"Field": "lesson_id"}, {"Field": "question_id"}, {"Field": "order_index"}]
+                elif sql.startswith("SHOW KEYS"):
+                    self._rows = [
+                        {"Column_name": "lesson_id", "Seq_in_index": 1},
+                        {"Column_name": "question_id", "Seq_in_index": 2},
+                    ]
+
+            def executemany(self, sql, params):
+                self.log.append(("executemany", len(params)))
+
+            def fetchall(self):
+                return self._rows
+
+        class FakeMySQL:
+            def __init__(self):
+                self.log = []
+
+            def cursor(self):
+                return FakeCursor(self.log)
+
+        service = InternetSyncService()
+        mysql_conn = FakeMySQL()
+        rows = [{"lesson_id": 1, "question_id": i, "order_index": i} for i in range(5)]
+        self.assertEqual(service.upsert_mysql_link_rows(mysql_conn, "lesson_questions", rows[:3]), 3)
+        self.assertEqual(service.upsert_mysql_link_rows(mysql_conn, "lesson_questions", rows[3:]), 2)
+        self.assertEqual(
+            mysql_conn.log,
+            [("execute", "SHOW COLUMNS"), ("execute", "SHOW KEYS"), ("executemany", 3), ("executemany", 2)],
+        )
+
+        statements = []
+        with closing(sqlite3.connect(":memory:")) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute(
+                "CREATE TABLE lesson_questions (lesson_id INTEGER, question_id INTEGER, order_index INTEGER, "
+                "PRIMARY KEY (lesson_id, question_id))"
+            )
+            conn.set_trace_callback(statements.append)
+            self.assertEqual(service.upsert_sqlite_link_rows(conn, "lesson_questions", rows[:3]), 3)
+            rows[0]["order_index"] = 9
+            self.assertEqual(service.upsert_sqlite_link_rows(conn, "lesson_questions", rows), 5)
+            conn.set_trace_callback(None)
+            stored = conn.execute("SELECT COUNT(*), MAX(order_index) FROM lesson_questions").fetchone()
+        self.assertEqual(tuple(stored), (5, 9))
+        # Columns and primary keys are read once each, not per batch.
+        self.assertEqual(sum(1 for sql in statements if sql.startswith("PRAGMA table_info")), 2)
 
     def test_editor_password_change_requires_admin_verification(self):
         class Dummy(settings_mixin_module.AdminDialogSettingsMixin):
@@ -1,10 +1,24 @@
 import sqlite3
 import tempfile
+import threading
 import unittest
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
 
+from src.controllers.admin_controller import AdminController
+from src.controllers.main_controller import MainController
 from src.models.database import Database
-from src.services.search_service import SearchService
+from src.models.entities import SearchResult
+from src.repositories.discipline_repository import DisciplineRepository
+from src.repositories.lesson_repository import LessonRepository
+from src.repositories.material_repository import MaterialRepository
+from src.repositories.program_repository import ProgramRepository
+from src.repositories.question_repository import QuestionRepository
+from src.repositories.teacher_repository import TeacherRepository
+from src.repositories.topic_repository import TopicRepository
+from src.services.material_contents import MaterialContentIndexer
+from src.services.search_service import SearchCancellation, SearchCancelled, SearchService
 
 
 class SearchAndDatabaseRegressionTests(unittest.TestCase):
@@ -63,3 +77,434 @@ class SearchAndDatabaseRegressionTests(unittest.TestCase):
                 service.search_all("alpha")
         finally:
             database.get_connection = original_get_connection
+
+    def test_database_reuses_pooled_connections(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(str(Path(tmp_dir) / "education.db"))
+            opened_before = database.connection_stats()["opened"]
+
+            for _ in range(5):
+                with database.get_connection() as conn:
+                    conn.execute("SELECT 1").fetchone()
+            with database.get_connection() as outer:
+                with database.get_connection() as inner:
+                    self.assertIsNot(outer, inner)
+
+            stats = database.connection_stats()
+            self.assertEqual(stats["opened"], opened_before + 1)
+            self.assertGreaterEqual(stats["reused"], 6)
+
+            database.close()
+            self.assertEqual(database.connection_stats()["open"], 0)
+            with database.get_connection() as conn:
+                self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+
+    def test_database_closes_connections_of_finished_threads(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(str(Path(tmp_dir) / "education.db"))
+            open_before = database.connection_stats()["open"]
+
+            def work():
+                with database.get_connection() as conn:
+                    conn.execute("SELECT 1").fetchone()
+
+            for _ in range(5):
+                thread = threading.Thread(target=work)
+                thread.start()
+                thread.join()
+
+            stats = database.connection_stats()
+            self.assertGreaterEqual(stats["opened"], 5)
+            self.assertEqual(stats["open"], open_before)
+            database.close()
+
+    def test_database_applies_connection_profile_and_read_only_reader(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(str(Path(tmp_dir) / "education.db"))
+            with database.get_connection() as conn:
+                self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+                self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+                self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -16384)
+                self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)
+                conn.execute("INSERT INTO disciplines (name) VALUES (?)", ("Committed",))
+
+            reader = database.reader()
+            self.assertEqual(reader.db_path, database.db_path)
+            with reader.get_connection() as conn:
+                self.assertEqual(conn.execute("SELECT name FROM disciplines").fetchone()[0], "Committed")
+                with self.assertRaises(sqlite3.OperationalError):
+                    conn.execute("INSERT INTO disciplines (name) VALUES (?)", ("Rejected",))
+
+            controller = MainController(database)
+            self.assertIs(controller.db, database)
+            self.assertIs(controller.discipline_repo.db, reader)
+            database.close()
+
+    def test_link_lookups_use_indexes(self):
+        database = Database(":memory:")
+        statements = []
+        original_get_connection = database.get_connection
+
+        @contextmanager
+        def traced_connection():
+            with original_get_connection() as conn:
+                conn.set_trace_callback(statements.append)
+                try:
+                    yield conn
+                finally:
+                    conn.set_trace_callback(None)
+
+        def query_plans(call):
+            del statements[:]
+            database.get_connection = traced_connection
+            try:
+                call()
+            finally:
+                database.get_connection = original_get_connection
+            with database.get_connection() as conn:
+                return [
+                    [row["detail"] for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}")]
+                    for statement in statements
+                    if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE"))
+                ]
+
+        lookups = {
+            "disciplines for topic": lambda: DisciplineRepository(database).get_disciplines_for_topic(1),
+            "disciplines for lesson": lambda: DisciplineRepository(database).get_disciplines_for_lesson(1),
+            "disciplines for question": lambda: DisciplineRepository(database).get_disciplines_for_question(1),
+            "topics for lesson": lambda: TopicRepository(database).get_topics_for_lesson(1),
+            "topics for question": lambda: TopicRepository(database).get_topics_for_question(1),
+            "lessons for question": lambda: LessonRepository(database).get_lessons_for_question(1),
+            "programs for discipline": lambda: ProgramRepository(database).get_programs_for_discipline(1),
+            "programs for topic": lambda: ProgramRepository(database).get_programs_for_topic(1),
+            "programs for lesson": lambda: ProgramRepository(database).get_programs_for_lesson(1),
+            "programs for question": lambda: ProgramRepository(database).get_programs_for_question(1),
+            "materials for entity": lambda: MaterialRepository(database).get_materials_for_entity("lesson", 1),
+            "material teachers": lambda: MaterialRepository(database).get_material_teachers(1),
+            "materials by path": lambda: MaterialRepository(database).count_by_relative_path("a/b.pdf"),
+            "teachers for disciplines": lambda: TeacherRepository(database).get_teachers_for_disciplines([1, 2]),
+            "discipline delete": lambda: DisciplineRepository(database).delete(1),
+            "question delete": lambda: QuestionRepository(database).delete(1),
+            "material delete": lambda: MaterialRepository(database).delete(1),
+        }
+        for name, call in lookups.items():
+            plans = query_plans(call)
+            self.assertTrue(plans, name)
+            for plan in plans:
+                scans = [detail for detail in plan if detail.startswith("SCAN")]
+                self.assertEqual(scans, [], name)
+
+        # Counting unused rows walks each entity table once; the NOT EXISTS
+        # probes into the link tables must still be index searches.
+        for plan in query_plans(AdminController(database).get_unused_data_counts):
+            scans = [detail for detail in plan if detail.startswith("SCAN")]
+            self.assertEqual(len(scans), 1, plan)
+
+    def test_entity_ancestors_follow_link_changes(self):
+        database = Database(":memory:")
+
+        def ancestors(conn):
+            return sorted(tuple(row) for row in conn.execute("SELECT * FROM entity_ancestors"))
+
+        with database.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO educational_programs (id, name, description, level, year, duration_hours) "
+                "VALUES (1, 'Program', '', '', 2026, 1)"
+            )
+            conn.executemany("INSERT INTO disciplines (id, name) VALUES (?, ?)", [(1, "D1"), (2, "D2")])
+            conn.executemany("INSERT INTO topics (id, title) VALUES (?, ?)", [(1, "T1"), (2, "T2")])
+            conn.execute("INSERT INTO lessons (id, title, duration_hours) VALUES (1, 'L1', 1)")
+            conn.execute("INSERT INTO questions (id, content) VALUES (1, 'Q1')")
+            # Link bottom-up so descendants already exist when parents are attached.
+            conn.execute("INSERT INTO lesson_questions (lesson_id, question_id) VALUES (1, 1)")
+            conn.executemany("INSERT INTO topic_lessons (topic_id, lesson_id) VALUES (?, 1)", [(1,), (2,)])
+            conn.executemany("INSERT INTO discipline_topics (discipline_id, topic_id) VALUES (?, ?)", [(1, 1), (2, 2)])
+            conn.execute("INSERT INTO program_disciplines (program_id, discipline_id) VALUES (1, 1)")
+            self.assertIn(("question", 1, "program", 1), ancestors(conn))
+            self.assertIn(("question", 1, "discipline", 2), ancestors(conn))
+
+            conn.execute("DELETE FROM topic_lessons WHERE topic_id = 1")
+            live = ancestors(conn)
+            self.assertNotIn(("question", 1, "program", 1), live)
+            self.assertIn(("question", 1, "discipline", 2), live)
+            conn.execute("UPDATE discipline_topics SET discipline_id = 1 WHERE topic_id = 2")
+            conn.execute("DELETE FROM disciplines WHERE id = 2")
+            live = ancestors(conn)
+            database._rebuild_entity_ancestors(conn.cursor())
+            self.assertEqual(live, ancestors(conn))
+            self.assertIn(("question", 1, "program", 1), live)
+
+    def test_search_contexts_resolve_in_one_query(self):
+        database = Database(":memory:")
+        with database.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO educational_programs (id, name, description, level, year, duration_hours) "
+                "VALUES (?, ?, '', '', 2026, 1)",
+                [(1, "Beta program"), (2, "Alpha program")],
+            )
+            conn.execute("INSERT INTO disciplines (id, name) VALUES (1, 'Discipline')")
+            conn.execute("INSERT INTO topics (id, title) VALUES (1, 'Topic')")
+            conn.execute("INSERT INTO lessons (id, title, duration_hours) VALUES (1, 'Lesson', 1)")
+            conn.execute("INSERT INTO questions (id, content) VALUES (1, 'Question')")
+            conn.execute(
+                "INSERT INTO methodical_materials (id, title, material_type) VALUES (1, 'Guide', 'guide')"
+            )
+            conn.executemany(
+                "INSERT INTO program_disciplines (program_id, discipline_id) VALUES (?, 1)", [(1,), (2,)]
+            )
+            conn.execute("INSERT INTO discipline_topics (discipline_id, topic_id) VALUES (1, 1)")
+            conn.execute("INSERT INTO topic_lessons (topic_id, lesson_id) VALUES (1, 1)")
+            conn.execute("INSERT INTO lesson_questions (lesson_id, question_id) VALUES (1, 1)")
+            conn.execute(
+                "INSERT INTO material_associations (material_id, entity_type, entity_id) VALUES (1, 'topic', 1)"
+            )
+        controller = MainController(database)
+        results = [
+            SearchResult(entity_type, entity_id, "", "", "")
+            for entity_type, entity_id in (("question", 1), ("material", 1), ("program", 1), ("teacher", 1))
+        ]
+
+        stats_before = database.connection_stats()
+        contexts = controller.get_search_contexts(results)
+        stats_after = database.connection_stats()
+        self.assertEqual(
+            (stats_after["opened"] + stats_after["reused"]) - (stats_before["opened"] + stats_before["reused"]),
+            1,
+        )
+        chain = [("program", "Alpha program"), ("discipline", "Discipline"), ("topic", "Topic")]
+        self.assertEqual(contexts[0], chain + [("lesson", "Lesson")])
+        self.assertEqual(contexts[1], chain)
+        self.assertEqual(contexts[2], [("program", "Beta program")])
+        self.assertEqual(contexts[3], [])
+        self.assertEqual(
+            controller.resolve_search_navigation(results[0]),
+            {"program_id": 2, "discipline_id": 1, "topic_id": 1, "lesson_id": 1, "question_id": 1},
+        )
+
+    def test_search_all_merges_fts_tables_on_one_connection(self):
+        database = Database(":memory:")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO teachers (full_name, position) VALUES (?, ?)", ("Alpha Teacher", "Lead"))
+            conn.execute(
+                "INSERT INTO educational_programs (name, description, level, year, duration_hours) VALUES (?, ?, ?, ?, ?)",
+                ("Alpha Program", "", "Basic", 2026, 1),
+            )
+            conn.execute("INSERT INTO disciplines (name) VALUES (?)", ("Alpha alpha discipline",))
+            conn.execute("INSERT INTO lessons (title, duration_hours) VALUES (?, ?)", ("Alpha lesson", 2))
+            conn.execute("INSERT INTO questions (content) VALUES (?)", ("Alpha " + "x" * 120,))
+            conn.execute(
+                "INSERT INTO methodical_materials (title, material_type, file_name) VALUES (?, ?, ?)",
+                ("Alpha guide", "guide", "alpha.docx"),
+            )
+        service = SearchService(database)
+
+        stats_before = database.connection_stats()
+        results = service.search_all("alpha")
+        stats_after = database.connection_stats()
+        acquired = (stats_after["opened"] + stats_after["reused"]) - (stats_before["opened"] + stats_before["reused"])
+        self.assertEqual(acquired, 1)
+        self.assertEqual(
+            sorted(result.entity_type for result in results),
+            ["discipline", "lesson", "material", "program", "question", "teacher"],
+        )
+        scores = [result.relevance_score for result in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        by_type = {result.entity_type: result for result in results}
+        self.assertEqual(by_type["teacher"].description, "Lead")
+        self.assertEqual(by_type["program"].description, "Basic")
+        self.assertEqual(by_type["lesson"].description, " (2.0h)")
+        self.assertTrue(by_type["material"].description.endswith("| File: alpha.docx"))
+        self.assertTrue(by_type["question"].title.endswith("..."))
+
+        paged = service.search_all("alpha", limit=2, offset=1) + service.search_all("alpha", limit=10, offset=3)
+        self.assertEqual(
+            [(r.entity_type, r.entity_id) for r in paged],
+            [(r.entity_type, r.entity_id) for r in results[1:]],
+        )
+        service._refine_candidates = None
+        pages = list(service.iter_search("alpha", page_size=4))
+        self.assertEqual([len(page) for page in pages], [4, 2])
+        self.assertEqual(
+            [(r.entity_type, r.entity_id) for page in pages for r in page],
+            [(r.entity_type, r.entity_id) for r in results],
+        )
+        fallback_runs = []
+        fallback = service._fallback_search
+        service._fallback_search = lambda keyword: fallback_runs.append(keyword) or fallback(keyword)
+        # LIKE treats "%%" as a wildcard, so every row matches.
+        pages = list(service.iter_search("%%", page_size=1))
+        self.assertGreater(len(pages), 1)
+        self.assertEqual({len(page) for page in pages}, {1})
+        self.assertEqual(fallback_runs, ["%%"])
+
+        service.teacher_repo.search = lambda _keyword: self.fail("fallback must not run for FTS queries")
+        self.assertEqual(
+            sorted(result.entity_type for result in service.search_all("lph")),
+            ["discipline", "lesson", "material", "program", "question", "teacher"],
+        )
+        self.assertEqual(service.search_all("lp"), [])
+
+    def test_trigram_index_serves_substring_search(self):
+        database = Database(":memory:")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO questions (content) VALUES (?)", ("Організація взаємодії підрозділів",))
+            conn.execute("INSERT INTO questions (content) VALUES (?)", ("Тактична підготовка",))
+        service = SearchService(database)
+        service.question_repo.search = lambda _keyword: self.fail("LIKE fallback must not run")
+
+        self.assertEqual([r.entity_id for r in service.search_all("заємод")], [1])
+        self.assertEqual([r.entity_id for r in service.search_all("ТИЧН")], [2])
+
+        with database.deferred_fts():
+            with database.get_connection() as conn:
+                conn.execute("UPDATE questions SET content = ? WHERE id = 2", ("Вогнева підготовка",))
+        self.assertEqual(service.search_all("тичн"), [])
+        self.assertEqual([r.entity_id for r in service.search_all("огнев")], [2])
+
+    def test_extended_query_refines_last_results_in_memory(self):
+        database = Database(":memory:")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO questions (content, answer) VALUES (?, ?)", ("Лекція з тактики", ""))
+            conn.execute("INSERT INTO questions (content, answer) VALUES (?, ?)", ("Лекало", "Лекційна відповідь"))
+            conn.execute("INSERT INTO topics (title) VALUES (?)", ("Лекції Café",))
+            conn.execute("INSERT INTO topics (title) VALUES (?)", ("Полекція",))
+        service = SearchService(database)
+
+        def acquired(keyword):
+            before = database.connection_stats()
+            results = service.search_all(keyword, limit=10)
+            after = database.connection_stats()
+            count = (after["opened"] + after["reused"]) - (before["opened"] + before["reused"])
+            return count, sorted((r.entity_type, r.entity_id) for r in results)
+
+        self.assertEqual(acquired("лек"), (1, [("question", 1), ("question", 2), ("topic", 1)]))
+        self.assertEqual(acquired("Лекц"), (0, [("question", 1), ("question", 2), ("topic", 1)]))
+        self.assertEqual(acquired("лекці cafe"), (0, [("topic", 1)]))
+        # No word match left: the trigram index is searched like a fresh query.
+        self.assertEqual(acquired("лекці cafex")[0], 1)
+
+        self.assertEqual(acquired("екці"), (1, [("question", 1), ("question", 2), ("topic", 1), ("topic", 2)]))
+        self.assertEqual(acquired("екція"), (0, [("question", 1), ("topic", 2)]))
+
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO questions (content, answer) VALUES (?, ?)", ("Секція", ""))
+        self.assertEqual(acquired("екція"), (1, [("question", 1), ("question", 3), ("topic", 2)]))
+        # Repeating the query (the next page of a streamed search) reuses the set.
+        self.assertEqual(acquired("екція"), (0, [("question", 1), ("question", 3), ("topic", 2)]))
+
+    def test_material_file_contents_are_indexed_incrementally(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            files_root = Path(tmp_dir) / "files"
+            files_root.mkdir()
+            (files_root / "notes.txt").write_text("Маскування техніки на марші", encoding="utf-8")
+            with zipfile.ZipFile(files_root / "slides.pptx", "w") as archive:
+                for number, text in ((2, "Друга"), (1, "Перший слайд")):
+                    archive.writestr(
+                        f"ppt/slides/slide{number}.xml",
+                        '<p:sld xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+                        'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+                        f"<a:p><a:r><a:t>{text}</a:t></a:r></a:p></p:sld>",
+                    )
+            (files_root / "broken.docx").write_bytes(b"not a zip")
+            database = Database(str(Path(tmp_dir) / "education.db"))
+            with database.get_connection() as conn:
+                for title, relative_path in (
+                    ("Маскування", "notes.txt"),
+                    ("Slides", "slides.pptx"),
+                    ("Broken", "broken.docx"),
+                    ("Archive", "archive.zip"),
+                ):
+                    conn.execute(
+                        "INSERT INTO methodical_materials (title, material_type, relative_path) VALUES (?, 'guide', ?)",
+                        (title, relative_path),
+                    )
+            indexer = MaterialContentIndexer(database, files_root)
+            service = SearchService(database)
+
+            self.assertEqual(indexer.index_pending(), 3)
+            self.assertEqual(indexer.index_pending(), 0)
+            with database.get_connection() as conn:
+                contents = dict(conn.execute("SELECT material_id, content FROM material_contents").fetchall())
+            self.assertEqual(contents, {1: "Маскування техніки на марші", 2: "Перший слайд\nДруга", 3: ""})
+            self.assertEqual([(r.entity_type, r.entity_id) for r in service.search_all("маскув")], [("material", 1)])
+            self.assertEqual([r.entity_id for r in service.search_all("слайд")], [2])
+
+            (files_root / "notes.txt").write_text("Інженерне обладнання позицій", encoding="utf-8")
+            (files_root / "slides.pptx").unlink()
+            self.assertEqual(indexer.index_pending(), 1)
+            self.assertEqual(service.search_all("техніки"), [])
+            self.assertEqual(service.search_all("слайд"), [])
+            self.assertEqual([r.entity_id for r in service.search_all("обладнан")], [1])
+
+            with database.get_connection() as conn:
+                conn.execute("DELETE FROM methodical_materials WHERE id = 1")
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM material_contents").fetchone()[0], 1)
+                conn.execute("INSERT INTO material_contents_fts(material_contents_fts) VALUES ('integrity-check')")
+            self.assertEqual(service.search_all("обладнан"), [])
+
+    def test_fts_prefix_migration_folds_apostrophe_variants(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = str(Path(tmp_dir) / "education.db")
+            Database(db_path)
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("DROP TABLE questions_fts")
+                conn.execute(
+                    "CREATE VIRTUAL TABLE questions_fts USING fts5(content, answer, "
+                    "content='questions', content_rowid='id')"
+                )
+                conn.execute("INSERT INTO questions (content, answer) VALUES (?, '')", ("М’ясо птиці",))
+                conn.execute("INSERT INTO questions (content, answer) VALUES (?, '')", ("мʼясна продукція",))
+                conn.execute("INSERT INTO questions (content, answer) VALUES (?, '')", ("Мясо без апострофа",))
+                conn.execute("DELETE FROM schema_migrations WHERE version >= 18")
+            conn.close()
+
+            database = Database(db_path)
+            with database.get_connection() as conn:
+                sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'questions_fts'").fetchone()[0]
+                self.assertIn("prefix='2 3 4'", sql)
+                conn.execute("INSERT INTO questions_fts(questions_fts) VALUES ('integrity-check')")
+            service = SearchService(database)
+
+            self.assertEqual(service._fts_query("мʼясо"), "\"м'ясо\"*")
+            self.assertEqual(sorted(r.entity_id for r in service.search_all("м'яс")), [1, 2])
+            self.assertEqual([r.entity_id for r in service.search_all("МʼЯСО")], [1])
+            self.assertEqual([r.entity_id for r in service.search_all("мя")], [3])
+
+    def test_every_word_fts_table_has_the_prefix_indexes_queries_use(self):
+        from src.models.schema import FTS_INDEXES
+
+        database = Database(":memory:")
+        names = [fts_table for _table, fts_table, _prefix, _columns in FTS_INDEXES] + ["material_contents_fts"]
+        with database.get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT name, sql FROM sqlite_master WHERE name IN ({','.join('?' * len(names))})", names
+            ).fetchall()
+        self.assertEqual(sorted(row["name"] for row in rows), sorted(names))
+        for row in rows:
+            self.assertIn("prefix='2 3 4'", row["sql"], row["name"])
+        # Every word term is a prefix query, so 2-4 character terms read a prefix index.
+        self.assertEqual(SearchService(database)._fts_query("ab cde fghi"), "ab* cde* fghi*")
+
+    def test_search_cancellation_interrupts_running_statement(self):
+        database = Database(":memory:")
+        service = SearchService(database)
+
+        cancelled = SearchCancellation()
+        cancelled.cancel()
+        with self.assertRaises(SearchCancelled):
+            service.search_all("alpha", cancellation=cancelled)
+
+        token = SearchCancellation()
+        timer = threading.Timer(0.05, token.cancel)
+        with database.get_connection() as conn:
+            timer.start()
+            try:
+                with self.assertRaises(SearchCancelled):
+                    with token.bind(conn):
+                        conn.execute(
+                            "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c LIMIT 1000000000) "
+                            "SELECT COUNT(*) FROM c"
+                        ).fetchone()
+            finally:
+                timer.cancel()
+            self.assertEqual(conn.execute("SELECT 1").fetchone()[0], 1)
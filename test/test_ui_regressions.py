@@ -1,4 +1,7 @@
+import tempfile
+import time
 import unittest
+from pathlib import Path
 
 
 class UIRegressionTests(unittest.TestCase):
@@ -13,3 +16,295 @@ class UIRegressionTests(unittest.TestCase):
         )
         self.assertIsNone(ok)
         self.assertEqual(error, "bad path")
+
+    def test_incremental_search_runner_drops_stale_queries(self):
+        try:
+            from PySide6.QtWidgets import QApplication
+            from src.ui.search_worker import IncrementalSearchRunner
+        except ImportError:
+            self.skipTest("PySide6 is not installed")
+        from src.controllers.main_controller import MainController
+        from src.models.database import Database
+
+        app = QApplication.instance() or QApplication([])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(str(Path(tmp_dir) / "education.db"))
+            with database.get_connection() as conn:
+                conn.execute("INSERT INTO teachers (full_name) VALUES (?)", ("Alpha Teacher",))
+                conn.execute("INSERT INTO teachers (full_name) VALUES (?)", ("Beta Teacher",))
+            runner = IncrementalSearchRunner(MainController(database), debounce_ms=10_000)
+            titles = []
+            done = []
+            runner.results_ready.connect(lambda entries: titles.extend(result.title for result, _ in entries))
+            runner.finished.connect(done.append)
+            try:
+                runner.schedule("alpha")
+                runner.run_now("beta")
+                deadline = time.monotonic() + 5
+                while not done and time.monotonic() < deadline:
+                    app.processEvents()
+                    time.sleep(0.01)
+            finally:
+                runner.shutdown()
+                database.close()
+            self.assertEqual(done, [1])
+            self.assertEqual(titles, ["Beta Teacher"])
+
+    def test_incremental_search_runner_streams_every_page(self):
+        try:
+            from PySide6.QtWidgets import QApplication
+            from src.ui.search_worker import IncrementalSearchRunner
+        except ImportError:
+            self.skipTest("PySide6 is not installed")
+        from src.controllers.main_controller import MainController
+        from src.models.database import Database
+
+        app = QApplication.instance() or QApplication([])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database = Database(str(Path(tmp_dir) / "education.db"))
+            with database.get_connection() as conn:
+                for number in range(7):
+                    conn.execute("INSERT INTO teachers (full_name) VALUES (?)", (f"Alpha Teacher {number}",))
+            controller = MainController(database)
+            statements = []
+            service = controller.search_service
+            branch_cursor = service._branch_cursor
+            service._branch_cursor = lambda *args: statements.append(args[2]) or branch_cursor(*args)
+            runner = IncrementalSearchRunner(controller, page_size=3, batch_size=2)
+            titles = []
+            batches = []
+            done = []
+            runner.results_ready.connect(lambda entries: batches.append(len(entries)))
+            runner.results_ready.connect(lambda entries: titles.extend(result.title for result, _ in entries))
+            runner.finished.connect(done.append)
+            try:
+                runner.run_now("alpha")
+                deadline = time.monotonic() + 5
+                while not done and time.monotonic() < deadline:
+                    app.processEvents()
+                    time.sleep(0.01)
+            finally:
+                runner.shutdown()
+                database.close()
+            self.assertEqual(done, [7])
+            self.assertEqual(len(statements), 1)
+            self.assertEqual(batches, [2, 1, 2, 1, 1])
+            self.assertEqual(sorted(titles), [f"Alpha Teacher {number}" for number in range(7)])
+
+    def test_program_tree_model_fetches_children_lazily(self):
+        try:
+            from src.ui.program_tree_model import ProgramTreeModel
+        except ImportError:
+            self.skipTest("PySide6 is not installed")
+
+        children = {
+            ("program", 1): [(10, "Discipline")],
+            ("discipline", 10): [(20, "Topic A"), (21, "Topic B")],
+            ("topic", 20): [(30, "Lesson")],
+            ("topic", 21): [(31, "Shared lesson")],
+            ("lesson", 30): [],
+            ("lesson", 31): [(40, "Question")],
+        }
+        calls = []
+
+        def fetch(entity_type, entity_id):
+            calls.append((entity_type, entity_id))
+            return children[(entity_type, entity_id)]
+
+        model = ProgramTreeModel(fetch, lambda entity_type: entity_type.title())
+        model.load_program(1)
+        self.assertTrue(model.canFetchMore(model.index(-1, 0)))
+        model.fetchMore(model.index(-1, 0))
+        self.assertEqual(model.rowCount(), 1)
+        discipline = model.index(0, 0)
+        self.assertEqual(model.data(discipline), "Discipline")
+        self.assertEqual(model.data(model.index(0, 1)), "Discipline")
+        self.assertTrue(model.hasChildren(discipline))
+        self.assertEqual(model.rowCount(discipline), 0)
+        self.assertEqual(calls, [("program", 1)])
+
+        # The topic step is missing, so the lesson is looked up among descendants.
+        index = model.find_index([("discipline", 10), ("lesson", 31), ("question", 40)])
+        self.assertEqual(model.entity(index), ("question", 40))
+        self.assertEqual(model.entity(model.parent(index)), ("lesson", 31))
+        self.assertEqual(model.entity(model.parent(model.parent(index))), ("topic", 21))
+        self.assertFalse(model.find_index([("question", 99)]).isValid())
+        self.assertEqual(len(calls), len(set(calls)))
+
+    def test_main_window_expands_disciplines_and_topics_on_load(self):
+        try:
+            from PySide6.QtWidgets import QApplication, QTreeView
+            from src.ui.main_window import MainWindow
+            from src.ui.program_tree_model import ProgramTreeModel
+        except ImportError:
+            self.skipTest("PySide6 is not installed")
+
+        from src.controllers.main_controller import MainController
+        from src.models.database import Database
+
+        app = QApplication.instance() or QApplication([])
+        database = Database(":memory:")
+        with database.get_connection() as conn:
+            conn.execute("INSERT INTO educational_programs (id, name) VALUES (1, 'Program')")
+            conn.execute("INSERT INTO disciplines (id, name) VALUES (10, 'Discipline')")
+            conn.execute("INSERT INTO program_disciplines (program_id, discipline_id, order_index) VALUES (1, 10, 1)")
+            for topic_id in (20, 21):
+                conn.execute("INSERT INTO topics (id, title) VALUES (?, ?)", (topic_id, f"Topic {topic_id}"))
+                conn.execute(
+                    "INSERT INTO discipline_topics (discipline_id, topic_id, order_index) VALUES (10, ?, ?)",
+                    (topic_id, topic_id),
+                )
+            for lesson_id, topic_id in ((30, 20), (31, 21)):
+                conn.execute("INSERT INTO lessons (id, title) VALUES (?, ?)", (lesson_id, f"Lesson {lesson_id}"))
+                conn.execute(
+                    "INSERT INTO topic_lessons (topic_id, lesson_id, order_index) VALUES (?, ?, 1)",
+                    (topic_id, lesson_id),
+                )
+            conn.execute("INSERT INTO questions (id, content) VALUES (40, 'Question')")
+            conn.execute("INSERT INTO lesson_questions (lesson_id, question_id, order_index) VALUES (30, 40, 1)")
+        controller = MainController(database)
+        fetched = []
+
+        def fetch(entity_type, entity_id):
+            fetched.append((entity_type, entity_id))
+            return controller.get_tree_children(entity_type, entity_id)
+
+        class Dummy:
+            _load_program_structure = MainWindow._load_program_structure
+
+            def __init__(self):
+                self.controller = controller
+                self.tree_model = ProgramTreeModel(fetch, lambda entity_type: entity_type.title())
+                self.content_tree = QTreeView()
+                self.content_tree.setModel(self.tree_model)
+                self.last_discipline_id = None
+
+            def _sync_tree_columns(self):
+                pass
+
+        dummy = Dummy()
+        dummy._load_program_structure(1)
+        app.processEvents()
+        model = dummy.tree_model
+        discipline = model.index(0, 0)
+        topic = model.index(0, 0, discipline)
+        lesson = model.index(0, 0, topic)
+        self.assertEqual(model.entity(discipline), ("discipline", 10))
+        self.assertTrue(dummy.content_tree.isExpanded(discipline))
+        self.assertEqual(model.entity(topic), ("topic", 20))
+        self.assertTrue(dummy.content_tree.isExpanded(topic))
+        self.assertEqual(model.entity(lesson), ("lesson", 30))
+        self.assertFalse(dummy.content_tree.isExpanded(lesson))
+        self.assertTrue(model.hasChildren(lesson))
+        # The lesson without questions shows no expand arrow.
+        self.assertFalse(model.hasChildren(model.index(0, 0, model.index(1, 0, discipline))))
+        self.assertEqual(fetched, [])
+        self.assertFalse(model.find_index([("question", 41)]).isValid())
+        self.assertEqual(fetched, [("lesson", 30)])
+
+    def test_import_dialog_parses_loaded_docx_like_batch_import(self):
+        try:
+            from docx import Document
+            from PySide6.QtWidgets import QApplication, QFileDialog
+            from src.ui.dialogs import ImportCurriculumDialog
+        except ImportError:
+            self.skipTest("PySide6 or python-docx is not installed")
+        from unittest import mock
+        from src.controllers.admin_controller import AdminController
+        from src.models.database import Database
+        from src.services.import_service import parse_curriculum_file
+
+        app = QApplication.instance() or QApplication([])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "Program - Discipline.docx"
+            doc = Document()
+            table = doc.add_table(rows=2, cols=2)
+            table.cell(0, 0).text = "Назва теми"
+            table.cell(0, 1).text = "Заняття"
+            table.cell(1, 0).text = "Тема 1. Основи"
+            lesson = table.cell(1, 1)
+            lesson.text = "Заняття 1. Лекція"
+            lesson.add_paragraph("1. Q1")
+            lesson.add_paragraph("2. Q2")
+            doc.save(path)
+
+            dialog = ImportCurriculumDialog(AdminController(Database(":memory:")))
+            with mock.patch.object(QFileDialog, "getOpenFileName", return_value=(str(path), "")):
+                dialog._load_file()
+            topics = dialog._parse_input()
+
+            self.assertTrue(dialog.input_text.isReadOnly())
+            self.assertEqual(topics, parse_curriculum_file(str(path)))
+            self.assertEqual([q.text for q in topics[0].lessons[0].questions], ["1. Q1", "2. Q2"])
+            app.processEvents()
+
+    def test_admin_structure_tree_patches_items_from_change_events(self):
+        try:
+            from PySide6.QtWidgets import QApplication, QTreeWidget
+            from src.ui.admin_dialog_structure_mixin import AdminDialogStructureMixin
+        except ImportError:
+            self.skipTest("PySide6 is not installed")
+        from src.controllers.admin_controller import AdminController
+        from src.models.database import Database
+        from src.models.entities import Discipline, EducationalProgram, Lesson, Question, Topic
+
+        app = QApplication.instance() or QApplication([])
+
+        class Dummy(AdminDialogStructureMixin):
+            def __init__(self, controller):
+                self.controller = controller
+                self.structure_tree = QTreeWidget()
+
+            def _on_structure_selection_changed(self):
+                pass
+
+        controller = AdminController(Database(":memory:"))
+        program = controller.add_program(EducationalProgram(name="Program"))
+        discipline = controller.add_discipline(Discipline(name="Discipline"))
+        controller.add_discipline_to_program(program.id, discipline.id, 1)
+        topic = controller.add_topic(Topic(title="Topic"))
+        controller.add_topic_to_discipline(discipline.id, topic.id, 1)
+        lesson = controller.add_lesson(Lesson(title="Lesson"))
+        controller.add_lesson_to_topic(topic.id, lesson.id, 1)
+        first = controller.add_question(Question(content="First", order_index=1))
+        controller.add_question_to_lesson(lesson.id, first.id, 1)
+
+        dummy = Dummy(controller)
+        dummy._refresh_structure_tree()
+        index = dummy._structure_item_index
+        program_item = index[("program", program.id)][0]
+        lesson_item = index[("lesson", lesson.id)][0]
+        lesson_item.setExpanded(True)
+
+        first.content = "First (edited)"
+        controller.update_question(first)
+        second = controller.add_question(Question(content="Second", order_index=2))
+        controller.add_question_to_lesson(lesson.id, second.id, 2)
+        fetched = []
+        original = controller.get_lesson_questions
+        controller.get_lesson_questions = lambda lesson_id: fetched.append(lesson_id) or original(lesson_id)
+        dummy._apply_structure_changes()
+
+        self.assertIs(index[("program", program.id)][0], program_item)
+        self.assertEqual(fetched, [lesson.id])
+        self.assertEqual(
+            [lesson_item.child(i).text(0) for i in range(lesson_item.childCount())],
+            ["First (edited)", "Second"],
+        )
+        self.assertTrue(lesson_item.isExpanded())
+
+        controller.update_lesson_question_order(lesson.id, second.id, 0)
+        second.order_index = 0
+        controller.update_question(second)
+        dummy._apply_structure_changes()
+        self.assertEqual(lesson_item.child(0).text(0), "Second")
+        self.assertTrue(lesson_item.isExpanded())
+
+        controller.delete_discipline(discipline.id)
+        dummy._apply_structure_changes()
+        self.assertEqual(program_item.childCount(), 0)
+        self.assertNotIn(("question", first.id), index)
+
+        dummy._select_structure_entity("program", program.id)
+        self.assertIs(dummy.structure_tree.currentItem(), program_item)
+        app.processEvents()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.models.schema import FTS_TABLE_OPTIONS  # noqa: E402
+
+
+ALPHABET = "абвгґдеєжзиіїйклмнопрстуфхцчшщьюя"
+QUERY = "SELECT rowid FROM questions_fts WHERE questions_fts MATCH ? ORDER BY bm25(questions_fts) LIMIT 50"
+PREFIX_LENGTHS = (2, 3, 4)
+
+
+def build_rows(count: int, vocabulary: int, rng: random.Random) -> tuple[list[str], list[tuple[str, str]]]:
+    words = ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(3, 11))) for _ in range(vocabulary)]
+    rows = [(" ".join(rng.choices(words, k=25)), " ".join(rng.choices(words, k=10))) for _ in range(count)]
+    return words, rows
+
+
+def build_index(rows: list[tuple[str, str]], options: str) -> tuple[sqlite3.Connection, float]:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE questions (id INTEGER PRIMARY KEY, content TEXT, answer TEXT)")
+    conn.executemany("INSERT INTO questions (content, answer) VALUES (?, ?)", rows)
+    suffix = f", {options}" if options else ""
+    conn.execute(
+        "CREATE VIRTUAL TABLE questions_fts USING fts5(content, answer, "
+        f"content='questions', content_rowid='id'{suffix})"
+    )
+    started = time.perf_counter()
+    conn.execute("INSERT INTO questions_fts(questions_fts) VALUES ('rebuild')")
+    return conn, time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare FTS5 prefix queries with and without prefix indexes.")
+    parser.add_argument("--rows", type=int, default=60_000, help="number of synthetic questions")
+    parser.add_argument("--vocabulary", type=int, default=20_000, help="number of distinct words")
+    parser.add_argument("--queries", type=int, default=40, help="prefixes timed per prefix length")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words, rows = build_rows(args.rows, args.vocabulary, rng)
+    prefixes = {}
+    for length in PREFIX_LENGTHS:
+        candidates = sorted({word[:length] for word in words if len(word) >= length})
+        prefixes[length] = rng.sample(candidates, min(args.queries, len(candidates)))
+
+    for label, options in (("without prefix index", ""), ("with FTS_TABLE_OPTIONS", FTS_TABLE_OPTIONS)):
+        conn, rebuild = build_index(rows, options)
+        timings = []
+        for length, terms in prefixes.items():
+            started = time.perf_counter()
+            for term in terms:
+                conn.execute(QUERY, (f"{term}*",)).fetchall()
+            elapsed_ms = 1000 * (time.perf_counter() - started) / len(terms)
+            timings.append(f"{length}-char {elapsed_ms:.2f} ms")
+        conn.close()
+        print(f"{label}: rebuild {rebuild:.2f} s, " + ", ".join(timings))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())